@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark candlestick rendering in MidnightMomentumVisualizer
+
+Renders synthetic hourly OHLC random walks with the per-candle loop the
+visualizer used before (one ax.plot wick and one Rectangle body per candle)
+and with create_candlestick_chart (one LineCollection for the wicks, one
+PolyCollection for the bodies). Reports build time (adding the artists),
+draw time (Agg canvas draw), artists created and peak Python memory
+(tracemalloc, measured in a separate untimed pass).
+
+The per-candle loop is skipped above --legacy-max candles, since it takes
+minutes at 100k candles.
+
+Examples:
+  python3 benchmarks/benchmark_candlestick_render.py
+  python3 benchmarks/benchmark_candlestick_render.py --sizes 1000 10000 100000 --legacy-max 100000
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.dates as mdates
+import matplotlib.pyplot as plt
+from matplotlib.patches import Rectangle
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'visualizers'))
+from midnightMomentum_visualization import MidnightMomentumVisualizer
+
+
+def synthetic_ohlc(n_candles, seed=0):
+    """Hourly random-walk bars; about 2% of candles are dojis"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_candles)))
+    open_ = np.r_[100.0, close[:-1]] * np.exp(rng.normal(0, 0.003, n_candles))
+    doji = rng.random(n_candles) < 0.02
+    open_[doji] = close[doji]
+    spread = np.abs(rng.normal(0, 0.008, n_candles)) * close
+    return pd.DataFrame({
+        'datetime': pd.date_range('1990-01-01', periods=n_candles, freq='h'),
+        'open': open_,
+        'high': np.maximum(open_, close) + spread,
+        'low': np.minimum(open_, close) - spread,
+        'close': close,
+    })
+
+
+def legacy_candlesticks(df, ax):
+    """The per-candle loop create_candlestick_chart used before"""
+    if len(df) > 1:
+        time_diff = (df['datetime'].iloc[1] - df['datetime'].iloc[0]).total_seconds() / 86400
+    else:
+        time_diff = 1.0
+    candle_width = time_diff * 0.8
+
+    for i, row in df.iterrows():
+        date = mdates.date2num(row['datetime'])
+        open_price, high_price, low_price, close_price = row['open'], row['high'], row['low'], row['close']
+        if close_price >= open_price:
+            color, body_bottom, body_top = 'green', open_price, close_price
+        else:
+            color, body_bottom, body_top = 'red', close_price, open_price
+        ax.plot([date, date], [low_price, high_price], color='black', linewidth=0.8, alpha=0.8)
+        body_height = abs(close_price - open_price)
+        if body_height > 0:
+            ax.add_patch(Rectangle((date - candle_width / 2, body_bottom), candle_width, body_height,
+                                   facecolor=color, edgecolor='black', alpha=0.8, linewidth=0.5))
+        else:
+            ax.plot([date - candle_width / 2, date + candle_width / 2], [close_price, close_price],
+                    color='black', linewidth=1)
+    return ax
+
+
+def render(df, draw_candles, trace_memory=False):
+    """Build and draw one candlestick axes; returns (build s, draw s, artists, peak MB or None)"""
+    fig, ax = plt.subplots(figsize=(15, 6), dpi=100)
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    draw_candles(df, ax)
+    built = time.perf_counter()
+    fig.canvas.draw()
+    drawn = time.perf_counter()
+    peak = None
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+    artists = len(ax.lines) + len(ax.patches) + len(ax.collections)
+    plt.close(fig)
+    return built - start, drawn - built, artists, peak
+
+
+def collection_candlesticks(df, ax):
+    visualizer = MidnightMomentumVisualizer.__new__(MidnightMomentumVisualizer)
+    visualizer.df = df
+    return visualizer.create_candlestick_chart(ax)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark candlestick rendering (per-candle artists vs collections)")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000], help='Candle counts')
+    parser.add_argument('--legacy-max', type=int, default=10000, help='Largest size rendered with the per-candle loop')
+    args = parser.parse_args()
+
+    print(f"{'candles':>8} {'mode':<12} {'build':>9} {'draw':>9} {'total':>9} {'artists':>9} {'peak mem':>10}")
+    for size in args.sizes:
+        df = synthetic_ohlc(size)
+        modes = [('collections', collection_candlesticks)]
+        if size <= args.legacy_max:
+            modes.insert(0, ('per-candle', legacy_candlesticks))
+        for name, draw_candles in modes:
+            # Timed without tracemalloc, which slows allocation-heavy code several times over
+            build, draw, artists, _ = render(df, draw_candles)
+            peak = render(df, draw_candles, trace_memory=True)[3]
+            print(f"{size:>8} {name:<12} {build:>8.2f}s {draw:>8.2f}s {build + draw:>8.2f}s {artists:>9} {peak:>8.1f}MB")
+        if size > args.legacy_max:
+            print(f"{size:>8} {'per-candle':<12} {'skipped (--legacy-max)':>29}")
+
+
+if __name__ == "__main__":
+    main()
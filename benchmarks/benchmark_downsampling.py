@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark downsampled rendering of the visualizer's time-series panels
+
+Builds a synthetic minute-bar backtest frame (OHLC, thresholds, breaches,
+overnight gaps, equity) and renders create_simple_chart (price, gap and
+equity panels) to PNG with downsampling off, with the min/max envelope and
+with LTTB. Also checks that each downsampled panel kept the extremes: the
+lowest threshold, the largest gaps, the deepest drawdown trough and the
+overall candle high/low.
+
+Examples:
+  python3 benchmarks/benchmark_downsampling.py
+  python3 benchmarks/benchmark_downsampling.py --rows 50000 500000 --dpi 300
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'visualizers'))
+from midnightMomentum_visualization import MidnightMomentumVisualizer
+
+
+def synthetic_backtest(n_rows, seed=0):
+    """Minute bars with the columns create_simple_chart plots"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.0008, n_rows)))
+    open_ = np.r_[100.0, close[:-1]]
+    spread = np.abs(rng.normal(0, 0.0005, n_rows)) * close
+    low = np.minimum(open_, close) - spread
+    gap = rng.normal(0, 0.004, n_rows)
+    threshold = np.r_[np.nan, close[:-1]] * (1 - 0.01)
+    pnl = np.where(rng.random(n_rows) < 0.001, rng.normal(5, 40, n_rows), np.nan)
+    return pd.DataFrame({
+        'datetime': pd.date_range('2015-01-02 09:30', periods=n_rows, freq='min'),
+        'open': open_,
+        'high': np.maximum(open_, close) + spread,
+        'low': low,
+        'close': close,
+        'threshold_95': threshold,
+        'below_threshold_95': (low <= threshold).astype(int),
+        'trade_signal': np.where(rng.random(n_rows) < 0.001, 'ENTRY_LONG', ''),
+        'overnight_gap': gap,
+        'high_above_prev_close': (rng.random(n_rows) < 0.5).astype(int),
+        'pnl': pnl,
+        'current_equity': 25000 + np.nancumsum(np.nan_to_num(pnl)),
+    })
+
+
+def visualizer_for(df, downsample):
+    visualizer = MidnightMomentumVisualizer.__new__(MidnightMomentumVisualizer)
+    visualizer.df = df
+    visualizer.symbol = 'SYNTH'
+    visualizer.downsample = downsample
+    visualizer.render_dpi = None
+    return visualizer
+
+
+def plotted_extremes(fig):
+    """(min, max) of every line's y data and of the candle wicks on each axes of the figure"""
+    extremes = []
+    for ax in fig.axes:
+        ys = [np.asarray(line.get_ydata(), dtype=float) for line in ax.get_lines() if len(line.get_ydata()) > 2]
+        ys += [np.concatenate(collection.get_segments())[:, 1] for collection in ax.collections
+               if isinstance(collection, LineCollection) and collection.get_segments()]
+        extremes.append([(np.nanmin(y), np.nanmax(y)) for y in ys])
+    return extremes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark downsampled rendering of the visualizer panels")
+    parser.add_argument('--rows', type=int, nargs='+', default=[50000, 200000], help='Rows in the synthetic frame')
+    parser.add_argument('--dpi', type=int, default=100, help='Output DPI')
+    args = parser.parse_args()
+
+    output = os.path.join(tempfile.mkdtemp(), 'chart.png')
+    print(f"{'rows':>9} {'mode':<8} {'render':>9} {'points/line':>12}  extremes")
+    for n_rows in args.rows:
+        df = synthetic_backtest(n_rows)
+        reference = None
+        for mode in (None, 'minmax', 'lttb'):
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                fig = visualizer_for(df, mode).create_simple_chart(save_path=output, dpi=args.dpi)
+            elapsed = time.perf_counter() - start
+            points = max(len(line.get_ydata()) for ax in fig.axes for line in ax.get_lines())
+            extremes = plotted_extremes(fig)
+            plt.close(fig)
+            if reference is None:
+                reference = extremes
+            kept = np.allclose(np.array(sum(extremes, []), dtype=float), np.array(sum(reference, []), dtype=float))
+            print(f"{n_rows:>9} {mode or 'off':<8} {elapsed:>8.2f}s {points:>12,}  {'kept' if kept else 'LOST'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark fill confirmation against the local mock order endpoint
+
+Places a basket of limit orders on handlers/mock_broker.py while a background
+"market" thread fills them in random slices (some partially first). The fills
+are then confirmed in two ways:
+  per-order  - get_order_status for every open order each interval
+  tracker    - FillTracker, one batched get_all_orders(status=WORKING) poll
+               per interval (plus one resolve call when orders leave WORKING)
+and the script reports the API calls, the time until every fill was confirmed
+and the transition events seen. It also checks the journal against the broker.
+
+Examples:
+  python3 benchmarks/benchmark_fill_tracker.py
+  python3 benchmarks/benchmark_fill_tracker.py --orders 500 --interval 0.1
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'handlers'))
+import http_client
+from mock_broker import MockBroker
+from benchmark_order_batch import use_mock_credentials
+
+
+def fill_in_slices(broker, order_ids, step, slice_fraction, seed, stop):
+    """Fill random slices of the open orders every step seconds, half of them partially first"""
+    rng = random.Random(seed)
+    open_ids = list(order_ids)
+    while open_ids and not stop.is_set():
+        time.sleep(step)
+        for order_id in rng.sample(open_ids, max(1, int(len(open_ids) * slice_fraction))):
+            order = broker.orders[order_id]
+            partial = order['filledQuantity'] == 0 and rng.random() < 0.5
+            broker.fill_order(order_id, quantity=order['remainingQuantity'] // 2 if partial else None, price=99.5)
+        open_ids = [order_id for order_id in open_ids if broker.orders[order_id]['status'] != 'FILLED']
+
+
+def confirm_per_order(handler, order_ids, interval):
+    pending = set(order_ids)
+    while pending:
+        for order_id in list(pending):
+            if handler.get_order_status(order_id).get('status') == 'FILLED':
+                pending.discard(order_id)
+        if pending:
+            time.sleep(interval)
+
+
+def run(mode, args):
+    from order_handler import OrderHandler
+    from fill_tracker import FillTracker
+
+    with MockBroker() as broker:
+        http_client.configure(base_url=broker.base_url)
+        handler = OrderHandler()
+        orders = [{'order_type': 'limit', 'action_type': 'BUY', 'symbol': f'SYM{i:03d}', 'shares': 10,
+                   'limit_price': 99.5} for i in range(args.orders)]
+        order_ids = [result['order_id'] for result in handler.place_orders_batch(orders)]
+        baseline = dict(broker.request_counts)
+
+        stop = threading.Event()
+        market = threading.Thread(target=fill_in_slices, args=(broker, order_ids, args.interval, 0.1, args.seed, stop))
+        events = []
+        start = time.perf_counter()
+        market.start()
+        if mode == 'per-order':
+            confirm_per_order(handler, order_ids, args.interval)
+        else:
+            tracker = FillTracker(handler, interval=args.interval, on_transition=events.append).start()
+            confirmed = tracker.wait_for(order_ids, timeout=60)
+            tracker.stop()
+            assert confirmed, "tracker timed out"
+        elapsed = time.perf_counter() - start
+        stop.set()
+        market.join()
+
+        calls = sum(broker.request_counts.get(key, 0) - baseline.get(key, 0) for key in ('get_order', 'list_orders'))
+        journal = handler.get_order_history_df()
+        consistent = (mode == 'per-order' or
+                      all(journal['status'] == 'FILLED') and all(journal['filled_quantity'] == 10))
+    return elapsed, calls, len(events), consistent
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fill confirmation against a mock order endpoint")
+    parser.add_argument('--orders', type=int, default=200, help='Orders in the basket')
+    parser.add_argument('--interval', type=float, default=0.05, help='Poll / fill interval (seconds)')
+    parser.add_argument('--seed', type=int, default=7, help='Seed for the fill schedule')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    use_mock_credentials()
+
+    print(f"{'mode':<10} {'confirmed in':>13} {'API calls':>10} {'events':>8}  journal")
+    for mode in ('per-order', 'tracker'):
+        elapsed, calls, events, consistent = run(mode, args)
+        print(f"{mode:<10} {elapsed:>12.2f}s {calls:>10} {events:>8}  {'ok' if consistent else 'MISMATCH'}")
+
+    http_client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark pooled vs per-call HTTP connections against a local stub server
+
+Starts a keep-alive stub that answers pricehistory GETs and order POSTs, then
+compares a fresh requests.get/post per call (new connection every time)
+with the shared pooled session in handlers/http_client.py.
+
+A local plain-HTTP stub only measures the saved TCP handshake and connection
+setup; against the real API the saved TLS handshake makes the gap larger.
+
+Examples:
+  python3 benchmarks/benchmark_http_pool.py
+  python3 benchmarks/benchmark_http_pool.py --requests 500
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import requests
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'handlers'))
+import http_client
+
+CANDLES = json.dumps({
+    'empty': False,
+    'candles': [{'datetime': 1700000000000 + i * 300000, 'open': 1.0, 'high': 1.0,
+                 'low': 1.0, 'close': 1.0, 'volume': 100} for i in range(78)]
+}).encode()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Minimal keep-alive stub for the pricehistory and orders endpoints"""
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def _reply(self, status, body=b'', headers=None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._reply(200, CANDLES, {'Content-Type': 'application/json'})
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self._reply(201, headers={'Location': f'{self.path}/12345'})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def time_calls(send, n_requests):
+    """Per-call latency in milliseconds"""
+    latencies = np.empty(n_requests)
+    for i in range(n_requests):
+        start = time.perf_counter()
+        response = send()
+        response.content
+        latencies[i] = (time.perf_counter() - start) * 1000
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pooled vs per-call HTTP connections")
+    parser.add_argument('--requests', type=int, default=200, help='Requests per scenario')
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    http_client.configure(base_url=f'http://127.0.0.1:{server.server_port}')
+
+    bars_url = f'{http_client.API_BASE_URL}/marketdata/v1/pricehistory?symbol=AAPL'
+    orders_url = f'{http_client.API_BASE_URL}/trader/v1/accounts/HASH/orders'
+    order = {'orderType': 'MARKET', 'orderLegCollection': [{'instruction': 'BUY', 'quantity': 1}]}
+
+    scenarios = [
+        ('bar fetch', lambda: requests.get(bars_url, timeout=10), lambda: http_client.get(bars_url)),
+        ('order post', lambda: requests.post(orders_url, json=order, timeout=10),
+         lambda: http_client.post(orders_url, json=order)),
+    ]
+
+    print(f"{'scenario':<12} {'per-call p50':>14} {'pooled p50':>12} {'saved/call':>12}")
+    for name, fresh, pooled in scenarios:
+        fresh_ms = time_calls(fresh, args.requests)
+        pooled_ms = time_calls(pooled, args.requests)
+        saved = np.median(fresh_ms) - np.median(pooled_ms)
+        print(f"{name:<12} {np.median(fresh_ms):>12.3f}ms {np.median(pooled_ms):>10.3f}ms {saved:>10.3f}ms")
+
+    server.shutdown()
+    http_client.close()
+
+
+if __name__ == "__main__":
+    main()
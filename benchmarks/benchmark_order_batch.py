@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark batch order submission against the local mock order endpoint
+
+Starts handlers/mock_broker.py with a fixed per-request latency, then submits
+the same basket of orders with a sequential loop over the place_* methods
+and with OrderHandler.place_orders_batch. It also places one bracket order
+and checks the TRIGGER/OCO payload the broker received.
+
+Placeholder API keys and a token file are written to a temporary working
+directory before connection_manager is imported, so no Schwab credentials
+are needed.
+
+Examples:
+  python3 benchmarks/benchmark_order_batch.py
+  python3 benchmarks/benchmark_order_batch.py --orders 200 --latency 0.05 --workers 16
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'handlers'))
+import http_client
+from mock_broker import MockBroker
+
+
+def use_mock_credentials():
+    """Run from a temporary directory holding placeholder keys and a fresh token"""
+    os.chdir(tempfile.mkdtemp())
+    with open('YOUR_FILE_PATH.json', 'w') as f:
+        json.dump({'APP_KEY': 'mock', 'APP_SECRET': 'mock'}, f)
+
+    import connection_manager
+    connection_manager.save_tokens({'access_token': 'mock', 'refresh_token': 'mock', 'expires_in': 3600})
+
+
+def basket(n_orders):
+    """Mixed basket of entry orders across order types"""
+    kinds = [
+        {'order_type': 'market', 'action_type': 'BUY', 'shares': 10},
+        {'order_type': 'limit', 'action_type': 'BUY', 'shares': 10, 'limit_price': 99.5},
+        {'order_type': 'stop', 'action_type': 'SELL', 'shares': 10, 'stop_price': 95.0},
+        {'order_type': 'bracket', 'action_type': 'BUY', 'shares': 10, 'target_price': 101.0, 'stop_price': 97.0},
+    ]
+    return [dict(kinds[i % len(kinds)], symbol=f'SYM{i:03d}') for i in range(n_orders)]
+
+
+def run_sequential(handler, orders):
+    results = []
+    for spec in orders:
+        spec = dict(spec)
+        method = getattr(handler, {'market': 'place_market_order', 'limit': 'place_limit_order',
+                                   'stop': 'place_stop_order', 'bracket': 'place_bracket_order'}[spec.pop('order_type')])
+        start = time.perf_counter()
+        result = method(**spec)
+        results.append(dict(result, latency_ms=(time.perf_counter() - start) * 1000))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batch order submission against a mock order endpoint")
+    parser.add_argument('--orders', type=int, default=100, help='Orders in the basket')
+    parser.add_argument('--latency', type=float, default=0.02, help='Mock broker latency per request (seconds)')
+    parser.add_argument('--workers', type=int, default=8, help='Concurrent orders in place_orders_batch')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    use_mock_credentials()
+    from order_handler import OrderHandler
+
+    with MockBroker(latency=args.latency) as broker:
+        http_client.configure(base_url=broker.base_url)
+        handler = OrderHandler()
+        orders = basket(args.orders)
+
+        print(f"{'mode':<12} {'wall':>9} {'orders/s':>10} {'p50 latency':>13} {'ok':>6}")
+        for name, run in (('sequential', lambda: run_sequential(handler, orders)),
+                          ('batch', lambda: handler.place_orders_batch(orders, max_workers=args.workers))):
+            start = time.perf_counter()
+            results = run()
+            elapsed = time.perf_counter() - start
+            latencies = np.array([result['latency_ms'] for result in results])
+            ok = sum(result['status'] == 'submitted' for result in results)
+            print(f"{name:<12} {elapsed:>8.2f}s {len(results) / elapsed:>10.1f} {np.median(latencies):>11.1f}ms {ok:>6}")
+
+        result = handler.place_bracket_order('BUY', 'AAPL', 10, target_price=101.0, stop_price=97.0, entry_price=99.0)
+        order = broker.orders[result['order_id']]
+        oco = order['childOrderStrategies'][0]
+        print(f"\nBracket order {result['order_id']}: {order['orderStrategyType']} {order['orderType']} entry -> "
+              f"{oco['orderStrategyType']} [{', '.join(child['orderType'] for child in oco['childOrderStrategies'])}]")
+
+    http_client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark order payload construction per order type
+
+Compares, per order type, the time to go from the place_* arguments to the
+encoded request body in three ways:
+  inline    - the payload dict literal the place_* methods used to build, then
+              json.dumps (what requests does with json=)
+  payload   - OrderTemplate.payload() then json.dumps
+  body      - OrderTemplate.body(), filling the pre-encoded skeleton directly
+Every template body is also checked to decode to the same payload as the
+inline dict. order_handler is imported with the placeholder credentials from
+benchmark_order_batch.py.
+
+Examples:
+  python3 benchmarks/benchmark_order_payload.py
+  python3 benchmarks/benchmark_order_payload.py --number 200000
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'handlers'))
+from benchmark_order_batch import use_mock_credentials
+
+
+def inline_payload(order_type, action_type, symbol, shares, prices):
+    """Payload as the place_* methods built it before the templates"""
+    legs = [{"instruction": action_type, "quantity": shares,
+             "instrument": {"symbol": symbol, "assetType": "EQUITY"}}]
+    valid_actions = ["BUY", "SELL", "SELL_SHORT", "BUY_TO_COVER"]
+    if action_type not in valid_actions or shares <= 0:
+        raise ValueError(action_type)
+    if order_type == "market":
+        return {"orderType": "MARKET", "session": "NORMAL", "duration": "DAY",
+                "orderStrategyType": "SINGLE", "orderLegCollection": legs}
+    if order_type == "limit":
+        return {"orderType": "LIMIT", "session": "SEAMLESS", "price": str(prices["limit_price"]),
+                "duration": "GOOD_TILL_CANCEL", "orderStrategyType": "SINGLE", "orderLegCollection": legs}
+    if order_type == "stop":
+        return {"orderType": "STOP", "session": "NORMAL", "stopPrice": str(prices["stop_price"]),
+                "duration": "DAY", "orderStrategyType": "SINGLE", "orderLegCollection": legs}
+    if order_type == "stop_limit":
+        return {"orderType": "STOP_LIMIT", "session": "NORMAL", "price": str(prices["limit_price"]),
+                "stopPrice": str(prices["stop_price"]), "duration": "DAY",
+                "orderStrategyType": "SINGLE", "orderLegCollection": legs}
+    return {"orderType": "TRAILING_STOP", "session": "NORMAL", "stopPriceLinkBasis": "BID",
+            "stopPriceLinkType": "VALUE", "stopPriceOffset": prices["stop_price_offset"],
+            "duration": "DAY", "orderStrategyType": "SINGLE", "orderLegCollection": legs}
+
+
+CASES = {
+    "market": {"current_price": 101.25},
+    "limit": {"limit_price": 99.5},
+    "stop": {"stop_price": 95.0},
+    "stop_limit": {"stop_price": 95.0, "limit_price": 94.5},
+    "trailing_stop": {"stop_price_offset": 1.5},
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark order payload construction per order type")
+    parser.add_argument('--number', type=int, default=100000, help='Payloads built per measurement')
+    parser.add_argument('--repeat', type=int, default=5, help='Measurements per mode (best is reported)')
+    args = parser.parse_args()
+
+    use_mock_credentials()
+    from order_handler import ORDER_TEMPLATES
+
+    print(f"{'order type':<14} {'inline':>10} {'payload':>10} {'body':>10} {'speedup':>9}  match")
+    for order_type, prices in CASES.items():
+        template = ORDER_TEMPLATES[order_type]
+        call = ("BUY", "AAPL", 10, prices)
+
+        def inline():
+            return json.dumps(inline_payload(order_type, *call)).encode()
+
+        def payload():
+            template.validate("BUY", 10, prices)
+            return json.dumps(template.payload(*call)).encode()
+
+        def body():
+            template.validate("BUY", 10, prices)
+            return template.body(*call)
+
+        match = json.loads(body()) == json.loads(inline()) == json.loads(payload())
+        timings = {name: min(timeit.repeat(fn, number=args.number, repeat=args.repeat)) / args.number * 1e6
+                   for name, fn in (('inline', inline), ('payload', payload), ('body', body))}
+        print(f"{order_type:<14} {timings['inline']:>8.2f}us {timings['payload']:>8.2f}us "
+              f"{timings['body']:>8.2f}us {timings['inline'] / timings['body']:>8.1f}x  {'yes' if match else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark end-to-end order throughput on the in-process paper broker
+
+Replays historical_data/*.csv through handlers/paper_broker.py. After every
+bar a simple strategy places a mixed basket of orders around the close
+(market, limit, stop, stop-limit, trailing stop) and cancels or replaces
+the orders still working from the previous bar. The script reports orders,
+fills and API calls per second. With --stream the bars go through the
+replay server and StreamIngestionService instead of being read directly.
+
+Examples:
+  python3 benchmarks/benchmark_paper_broker.py
+  python3 benchmarks/benchmark_paper_broker.py --orders-per-bar 20 --slippage-bps 5 --participation 0.001
+  python3 benchmarks/benchmark_paper_broker.py --stream
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'handlers'))
+from order_journal import ORDER_JOURNAL_CAPACITY
+from paper_broker import PaperBroker
+from replay_server import DEFAULT_REPLAY_GLOB, ReplayServer, load_replay_bars
+from stream_ingestion import StreamIngestionService
+
+
+class BasketStrategy:
+    """Places orders_per_bar orders after each bar and manages the previous bar's leftovers"""
+
+    def __init__(self, orders_per_bar, shares):
+        self.orders_per_bar = orders_per_bar
+        self.shares = shares
+        self.api_calls = 0
+        self.orders = 0
+        self._open = {}
+
+    def on_bar(self, broker, bar):
+        symbol, close = bar['symbol'], bar['close']
+
+        # Leftovers from the previous bar: replace every other one, cancel the rest
+        for i, order_id in enumerate(self._open.pop(symbol, [])):
+            if i % 2:
+                broker.replace_order(order_id, {
+                    "orderType": "LIMIT", "session": "NORMAL", "duration": "DAY", "orderStrategyType": "SINGLE",
+                    "price": str(round(close * 0.99, 2)),
+                    "orderLegCollection": [{"instruction": "BUY", "quantity": self.shares,
+                                            "instrument": {"symbol": symbol, "assetType": "EQUITY"}}]
+                })
+            else:
+                broker.cancel_order(order_id)
+            self.api_calls += 1
+
+        placed = []
+        for i in range(self.orders_per_bar):
+            kind = i % 5
+            if kind == 0:
+                result = broker.place_market_order('BUY', symbol, self.shares)
+            elif kind == 1:
+                result = broker.place_limit_order('BUY', symbol, self.shares, round(close * 0.995, 2))
+            elif kind == 2:
+                result = broker.place_stop_order('SELL', symbol, self.shares, round(close * 0.98, 2))
+            elif kind == 3:
+                result = broker.place_stop_limit_order('BUY', symbol, self.shares, stop_price=round(close * 1.01, 2),
+                                                       limit_price=round(close * 1.015, 2))
+            else:
+                result = broker.place_trailing_stop_order('SELL', symbol, self.shares, round(close * 0.01, 2))
+            self.api_calls += 1
+            self.orders += 1
+            if result['status'] == 'submitted':
+                placed.append(result['order_id'])
+        self._open[symbol] = placed
+
+
+async def replay_stream(bars, broker, strategy):
+    server = await ReplayServer(bars, speed=0, port=0).start()
+
+    def on_bar(state, bar):
+        broker.on_stream_bar(state, bar)
+        strategy.on_bar(broker, bar)
+
+    service = StreamIngestionService(sorted(bars['symbol'].unique()), port=server.port, on_bar=on_bar)
+    await service.run(reconnect=False)
+    await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark end-to-end order throughput on the paper broker")
+    parser.add_argument('--files', type=str, default=DEFAULT_REPLAY_GLOB, help='Glob of CSV files to replay')
+    parser.add_argument('--orders-per-bar', type=int, default=10, help='Orders placed after each bar')
+    parser.add_argument('--shares', type=int, default=100, help='Shares per order')
+    parser.add_argument('--latency-ms', type=float, default=0, help='Simulated order entry latency (ms)')
+    parser.add_argument('--slippage-bps', type=float, default=2.0, help='Adverse slippage on market/stop fills (bps)')
+    parser.add_argument('--participation', type=float, default=None, help='Max fraction of bar volume per order')
+    parser.add_argument('--journal-capacity', type=int, default=ORDER_JOURNAL_CAPACITY,
+                        help='Orders kept in memory by the order journal')
+    parser.add_argument('--stream', action='store_true', help='Feed bars through the replay server')
+    args = parser.parse_args()
+
+    try:
+        bars = load_replay_bars(args.files)
+    except FileNotFoundError as e:
+        parser.error(str(e))
+
+    broker = PaperBroker(latency_ms=args.latency_ms, slippage_bps=args.slippage_bps,
+                         participation=args.participation, journal_capacity=args.journal_capacity)
+    strategy = BasketStrategy(args.orders_per_bar, args.shares)
+
+    start = time.perf_counter()
+    if args.stream:
+        asyncio.run(replay_stream(bars, broker, strategy))
+    else:
+        broker.replay(bars, on_bar=strategy.on_bar)
+    elapsed = time.perf_counter() - start
+
+    # Nothing built a DataFrame view during the run; the unviewed rows must still be capped
+    unviewed = len(broker.order_history._pending)
+    bounded = len(broker.order_history) <= args.journal_capacity and unviewed <= args.journal_capacity
+    statuses = broker.get_order_history_df()['status'].value_counts()
+    print(f"bars:       {broker.bars_processed:,} ({bars['symbol'].nunique()} symbols, "
+          f"{'stream' if args.stream else 'direct'})")
+    print(f"orders:     {strategy.orders:,} in {elapsed:.2f}s ({strategy.orders / elapsed:,.0f} orders/s)")
+    print(f"API calls:  {strategy.api_calls:,} ({strategy.api_calls / elapsed:,.0f} calls/s)")
+    print(f"fills:      {broker.fills:,} executions")
+    print(f"journal:    last {len(broker.order_history):,} orders: {', '.join(f'{status} {count}' for status, count in statuses.items())}")
+    print(f"memory:     {unviewed:,} rows awaiting the DataFrame view (capacity {args.journal_capacity:,}): "
+          f"{'bounded' if bounded else 'UNBOUNDED'}")
+    print(f"positions:  {sum(abs(shares) for shares in broker.positions.values()):,} shares open, "
+          f"cash ${broker.cash:,.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark the shared performance metrics engine on a parameter sweep
+
+Builds a synthetic sweep (one equity curve per parameter set, e.g. profit
+targets x position sizes) and computes the summary metrics three ways: the
+per-curve pandas aggregation the visualizer used before, performance_metrics
+called once per curve, and performance_metrics on the whole (n_curves,
+n_bars) array in one call. Also checks that the three agree on trades, win
+rate, profit factor and max drawdown.
+
+Examples:
+  python3 benchmarks/benchmark_performance_metrics.py
+  python3 benchmarks/benchmark_performance_metrics.py --curves 10 100 --bars 100000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from performance_metrics import performance_metrics
+
+COMPARED = ('total_trades', 'win_rate', 'profit_factor', 'max_drawdown')
+
+
+def synthetic_sweep(n_curves, n_bars, initial_capital=25000.0, seed=0):
+    """Per-bar PnL (NaN off trade exits), equity and open-position mask, one row per curve"""
+    rng = np.random.default_rng(seed)
+    exits = rng.random((n_curves, n_bars)) < 0.02
+    edge = np.linspace(-5, 15, n_curves)[:, None]
+    pnl = np.where(exits, rng.normal(edge, 60, (n_curves, n_bars)), np.nan)
+    equity = initial_capital + np.cumsum(np.nan_to_num(pnl), axis=1)
+    in_position = rng.random((n_curves, n_bars)) < 0.6
+    return pnl, equity, in_position
+
+
+def pandas_metrics(pnl, equity):
+    """The trade filter and aggregation the visualizer ran per curve"""
+    df = pd.DataFrame({'pnl': pnl, 'current_equity': equity})
+    trades = df[df['pnl'].notna() & (df['pnl'] != 0)]
+    gross_profit = trades[trades['pnl'] > 0]['pnl'].sum()
+    gross_loss = abs(trades[trades['pnl'] < 0]['pnl'].sum())
+    equity_curve = df['current_equity'].dropna()
+    if len(trades) == 0:
+        return {'total_trades': 0, 'win_rate': 0, 'profit_factor': float('nan'),
+                'max_drawdown': (equity_curve - equity_curve.expanding().max()).min()}
+    return {
+        'total_trades': len(trades),
+        'win_rate': len(trades[trades['pnl'] > 0]) / len(trades) * 100,
+        'profit_factor': gross_profit / gross_loss if gross_loss != 0 else float('inf'),
+        'max_drawdown': (equity_curve - equity_curve.expanding().max()).min(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the vectorized performance metrics on a parameter sweep")
+    parser.add_argument('--curves', type=int, nargs='+', default=[100, 1000, 10000], help='Equity curves in the sweep')
+    parser.add_argument('--bars', type=int, default=1000, help='Bars per equity curve')
+    args = parser.parse_args()
+
+    print(f"{'curves':>7} {'bars':>8} {'pandas loop':>12} {'numpy loop':>11} {'numpy 2-D':>10} {'speedup':>8}  match")
+    for n_curves in args.curves:
+        pnl, equity, in_position = synthetic_sweep(n_curves, args.bars)
+
+        start = time.perf_counter()
+        reference = [pandas_metrics(pnl[i], equity[i]) for i in range(n_curves)]
+        pandas_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        per_curve = [performance_metrics(pnl[i], equity[i], in_position[i]) for i in range(n_curves)]
+        loop_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        sweep = performance_metrics(pnl, equity, in_position)
+        sweep_elapsed = time.perf_counter() - start
+
+        match = all(
+            np.allclose([row[key] for row in reference], sweep[key], equal_nan=True)
+            and np.allclose([row[key] for row in per_curve], sweep[key], equal_nan=True)
+            for key in COMPARED
+        )
+        print(f"{n_curves:>7} {args.bars:>8} {pandas_elapsed:>11.3f}s {loop_elapsed:>10.3f}s "
+              f"{sweep_elapsed:>9.3f}s {pandas_elapsed / sweep_elapsed:>7.0f}x  {'ok' if match else 'MISMATCH'}")
+
+
+if __name__ == "__main__":
+    main()
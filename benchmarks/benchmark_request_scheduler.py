@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Benchmark the request scheduler against a local stub that injects 429s
+
+The stub enforces a fixed-window limit on the pricehistory endpoint and
+answers 429 with Retry-After (time until the window resets) once the
+window is used up. Quote requests are never throttled. The same
+mixed workload runs two ways:
+
+- blocking: a thread pool where each request sleeps through Retry-After
+  in place (the old get_hist_bars behaviour)
+- scheduler: handlers/request_scheduler.py, which requeues the throttled
+  request and keeps sending other work
+
+The report shows total wall time, quote completion times (how much
+throttling elsewhere delays unrelated requests), the number of 429s each
+mode provoked and the scheduler metrics.
+
+Examples:
+  python3 benchmarks/benchmark_request_scheduler.py
+  python3 benchmarks/benchmark_request_scheduler.py --requests 200 --limit 20
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'handlers'))
+import http_client
+from request_scheduler import RequestScheduler
+
+BODY = json.dumps({'empty': False, 'candles': []}).encode()
+
+
+def make_stub(limit, window):
+    """Stub server class allowing `limit` pricehistory requests per `window` seconds"""
+    state = {'window_start': time.monotonic(), 'count': 0, 'throttled': 0}
+    lock = threading.Lock()
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def _reply(self, status, body=b'', headers=None):
+            self.send_response(status)
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if 'pricehistory' in self.path:
+                with lock:
+                    now = time.monotonic()
+                    if now - state['window_start'] >= window:
+                        state['window_start'], state['count'] = now, 0
+                    state['count'] += 1
+                    retry_after = state['window_start'] + window - now
+                    throttled = state['count'] > limit
+                    state['throttled'] += throttled
+                if throttled:
+                    self._reply(429, headers={'Retry-After': f'{retry_after:.3f}'})
+                    return
+            self._reply(200, BODY, {'Content-Type': 'application/json'})
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler, state
+
+
+def workload(n_requests):
+    """Alternating (endpoint, url) pairs"""
+    bars_url = f'{http_client.API_BASE_URL}/marketdata/v1/pricehistory?symbol=AAPL'
+    quotes_url = f'{http_client.API_BASE_URL}/marketdata/v1/quotes?symbols=AAPL'
+    return [('pricehistory', bars_url) if i % 2 == 0 else ('quotes', quotes_url) for i in range(n_requests)]
+
+
+def run_blocking(jobs, workers):
+    """Sleep through Retry-After inside the request, holding the worker"""
+    start = time.perf_counter()
+
+    def send(url):
+        while True:
+            response = http_client.get(url)
+            if response.status_code != 429:
+                return time.perf_counter() - start
+            time.sleep(float(response.headers.get('Retry-After', 1)))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [(endpoint, executor.submit(send, url)) for endpoint, url in jobs]
+        return [(endpoint, future.result()) for endpoint, future in futures], None
+
+
+def run_scheduler(jobs, workers):
+    """Requeue throttled requests and keep serving the queue"""
+    scheduler = RequestScheduler(workers=workers)
+    start = time.perf_counter()
+    latencies = {}
+
+    def record(index):
+        return lambda future: latencies.__setitem__(index, time.perf_counter() - start)
+
+    futures = []
+    for index, (endpoint, url) in enumerate(jobs):
+        future = scheduler.submit(endpoint, http_client.get, url)
+        future.add_done_callback(record(index))
+        futures.append(future)
+    for future in futures:
+        future.result()
+
+    metrics = scheduler.metrics()
+    scheduler.close()
+    return [(endpoint, latencies[index]) for index, (endpoint, _) in enumerate(jobs)], metrics
+
+
+def summarize(name, results, elapsed, throttled):
+    """Wall time, quote completion times since start, and 429s provoked"""
+    quotes = np.array([done for endpoint, done in results if endpoint == 'quotes']) * 1000
+    print(f"{name:<10} {elapsed:>8.2f}s {np.median(quotes):>12.1f}ms {quotes.max():>12.1f}ms {throttled:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the request scheduler against injected 429s")
+    parser.add_argument('--requests', type=int, default=100, help='Total requests (half pricehistory, half quotes)')
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent requests')
+    parser.add_argument('--limit', type=int, default=10, help='pricehistory requests allowed per window')
+    parser.add_argument('--window', type=float, default=0.5, help='Stub rate-limit window in seconds')
+    args = parser.parse_args()
+
+    stub, stub_state = make_stub(args.limit, args.window)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), stub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    http_client.configure(base_url=f'http://127.0.0.1:{server.server_port}')
+    jobs = workload(args.requests)
+
+    print(f"{'mode':<10} {'wall':>9} {'quote p50':>14} {'quote max':>14} {'429s':>8}")
+
+    for name, run in (('blocking', run_blocking), ('scheduler', run_scheduler)):
+        time.sleep(args.window)  # start each mode with a fresh stub window
+        throttled_before = stub_state['throttled']
+        start = time.perf_counter()
+        results, metrics = run(jobs, args.workers)
+        summarize(name, results, time.perf_counter() - start, stub_state['throttled'] - throttled_before)
+
+    print("\nScheduler metrics:")
+    for key, value in metrics.items():
+        print(f"  {key}: {value}")
+
+    server.shutdown()
+    http_client.close()
+
+
+if __name__ == "__main__":
+    main()
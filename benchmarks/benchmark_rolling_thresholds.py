@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark and parity-check the rolling threshold engine
+
+Compares apply_sample_thresholds (one pass through SampleRollingQuantileEngine)
+with the original per-row implementation, which recomputed every quantile
+from result.iloc[:i] for each bar. The sample_threshold_{conf} and
+sample_signal_{conf} columns must match for every confidence level; the
+script exits non-zero on any mismatch. The rolling-window mode is checked
+the same way against a per-row quantile of the last `window` gaps.
+
+Examples:
+  python3 benchmarks/benchmark_rolling_thresholds.py
+  python3 benchmarks/benchmark_rolling_thresholds.py --days 1000 5000 20000 --legacy-max-days 5000
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import sample_midnight_momentum_strategy as strategy
+
+
+def legacy_apply_sample_thresholds(analyzer, df: pd.DataFrame) -> pd.DataFrame:
+    """The original per-row loop, kept here as the parity baseline"""
+    result = df.copy()
+    for conf_level in analyzer.config.confidence_levels:
+        conf_pct = int(conf_level * 100)
+        result[f'sample_threshold_{conf_pct}'] = np.nan
+        result[f'sample_signal_{conf_pct}'] = 0
+
+    min_periods = 30
+    for i in range(min_periods, len(result)):
+        thresholds = analyzer.calculate_sample_thresholds(result.iloc[:i])
+        prev_close = result.iloc[i]['prev_close']
+        current_low = result.iloc[i]['low']
+
+        if pd.notna(prev_close) and pd.notna(current_low):
+            for conf_level in analyzer.config.confidence_levels:
+                conf_pct = int(conf_level * 100)
+                threshold_key = f'sample_threshold_{conf_pct}'
+                if threshold_key in thresholds:
+                    threshold_price = prev_close * (1 - thresholds[threshold_key] / 100)
+                    result.iloc[i, result.columns.get_loc(threshold_key)] = threshold_price
+                    if current_low <= threshold_price:
+                        result.iloc[i, result.columns.get_loc(f'sample_signal_{conf_pct}')] = 1
+
+    return result
+
+
+def legacy_window_thresholds(analyzer, df: pd.DataFrame, window: int, min_periods: int = 30):
+    """Per-row quantile of the last `window` gaps (NaNs skipped)"""
+    gaps = df['overnight_gap'].to_numpy(dtype=float)
+    expected = {f'sample_threshold_{int(c * 100)}': np.full(len(df), np.nan)
+                for c in analyzer.config.confidence_levels}
+    for i in range(min_periods, len(df)):
+        history = gaps[max(0, i - window):i]
+        history = history[~np.isnan(history)]
+        if len(history) >= analyzer.config.min_sample_size:
+            for conf_level in analyzer.config.confidence_levels:
+                threshold = abs(np.quantile(history, 1 - conf_level)) * 100
+                expected[f'sample_threshold_{int(conf_level * 100)}'][i] = max(threshold, 0.5)
+    return expected
+
+
+def columns_match(expected: pd.DataFrame, actual: pd.DataFrame, confidence_levels) -> bool:
+    for conf_level in confidence_levels:
+        conf_pct = int(conf_level * 100)
+        if not np.allclose(expected[f'sample_threshold_{conf_pct}'].to_numpy(dtype=float),
+                           actual[f'sample_threshold_{conf_pct}'].to_numpy(dtype=float), equal_nan=True):
+            return False
+        if not np.array_equal(expected[f'sample_signal_{conf_pct}'].to_numpy(),
+                              actual[f'sample_signal_{conf_pct}'].to_numpy()):
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark and parity-check the rolling threshold engine")
+    parser.add_argument('--days', type=int, nargs='+', default=[500, 2000, 10000],
+                        help='Calendar days of synthetic daily bars')
+    parser.add_argument('--legacy-max-days', type=int, default=2000,
+                        help='Largest history to run through the per-row loop')
+    parser.add_argument('--window', type=int, default=120, help='Rolling window for the window-mode check')
+    args = parser.parse_args()
+
+    strategy.logger.setLevel(logging.WARNING)
+    analyzer = strategy.SampleStatisticalAnalyzer(strategy.SampleAnalysisConfig())
+    levels = analyzer.config.confidence_levels
+    data_handler = strategy.SampleDataHandler()
+    failures = 0
+
+    print(f"{'days':>7} {'rows':>7} {'per-row':>10} {'engine':>10} {'speedup':>8}  expanding  window")
+    for days in args.days:
+        df = analyzer.calculate_basic_metrics(data_handler.fetch_sample_data('SYNTH', days=days))
+
+        start = time.perf_counter()
+        actual = analyzer.apply_sample_thresholds(df)
+        engine_elapsed = time.perf_counter() - start
+
+        legacy_elapsed = None
+        expanding = '-'
+        if days <= args.legacy_max_days:
+            start = time.perf_counter()
+            expected = legacy_apply_sample_thresholds(analyzer, df)
+            legacy_elapsed = time.perf_counter() - start
+            expanding = 'ok' if columns_match(expected, actual, levels) else 'MISMATCH'
+
+        window = analyzer.calculate_rolling_thresholds(df, window=args.window)
+        expected_window = legacy_window_thresholds(analyzer, df, args.window)
+        window_ok = all(np.allclose(expected_window[key], window[key], equal_nan=True) for key in window)
+        failures += (expanding == 'MISMATCH') + (not window_ok)
+
+        legacy_cell = f"{legacy_elapsed * 1000:>8.1f}ms" if legacy_elapsed is not None else f"{'-':>10}"
+        speedup = f"{legacy_elapsed / engine_elapsed:>7.0f}x" if legacy_elapsed is not None else f"{'-':>8}"
+        print(f"{days:>7} {len(df):>7} {legacy_cell} {engine_elapsed * 1000:>8.1f}ms {speedup}  "
+              f"{expanding:<9}  {'ok' if window_ok else 'MISMATCH'}")
+
+    if failures:
+        sys.exit(f"{failures} parity check(s) failed")
+
+
+if __name__ == "__main__":
+    main()
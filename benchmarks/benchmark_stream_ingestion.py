@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Load-test the streaming ingestion service against the local replay server
+
+Replays historical_data/*.csv at full speed to several concurrent clients
+and reports message throughput. It also checks that every intraday breach
+was detected, by comparing against a vectorized low <= threshold count over
+the same bars.
+
+Examples:
+  python3 benchmarks/benchmark_stream_ingestion.py
+  python3 benchmarks/benchmark_stream_ingestion.py --clients 16 --threshold 95=2.0
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'handlers'))
+from replay_server import DEFAULT_REPLAY_GLOB, ReplayServer, load_replay_bars
+from stream_ingestion import StreamIngestionService, _parse_threshold
+
+
+def expected_breaches(bars, threshold_pcts):
+    """Bars whose low trades through prev_close * (1 - pct / 100), per threshold"""
+    total = 0
+    for _, group in bars.groupby('symbol'):
+        prev_close = group['close'].shift(1).to_numpy()
+        low = group['low'].to_numpy()
+        for pct in threshold_pcts.values():
+            total += int(np.sum(low <= prev_close * (1 - pct / 100)))
+    return total
+
+
+async def run(bars, clients, threshold_pcts):
+    server = await ReplayServer(bars, speed=0, port=0).start()
+    symbols = sorted(bars['symbol'].unique())
+    services = [StreamIngestionService(symbols, port=server.port, thresholds=threshold_pcts)
+                for _ in range(clients)]
+
+    start = time.perf_counter()
+    await asyncio.gather(*(service.run(reconnect=False) for service in services))
+    elapsed = time.perf_counter() - start
+    await server.close()
+    return services, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test streaming ingestion with the replay server")
+    parser.add_argument('--files', type=str, default=DEFAULT_REPLAY_GLOB, help='Glob of CSV files to replay')
+    parser.add_argument('--clients', type=int, default=4, help='Concurrent subscribers')
+    parser.add_argument('--threshold', type=_parse_threshold, action='append', default=[],
+                        help='Threshold as LABEL=PCT (repeatable, default 68=0.8 and 95=2.0)')
+    args = parser.parse_args()
+
+    threshold_pcts = dict(args.threshold) or {68: 0.8, 95: 2.0}
+    try:
+        bars = load_replay_bars(args.files)
+    except FileNotFoundError as e:
+        parser.error(str(e))
+    services, elapsed = asyncio.run(run(bars, args.clients, threshold_pcts))
+
+    messages = sum(service.messages for service in services)
+    expected = expected_breaches(bars, threshold_pcts)
+    detected = [service.breaches for service in services]
+
+    print(f"bars replayed:    {len(bars)} ({bars['symbol'].nunique()} symbols)")
+    print(f"clients:          {args.clients}")
+    print(f"messages:         {messages:,} in {elapsed:.2f}s ({messages / elapsed:,.0f} msg/s)")
+    print(f"breaches/client:  {detected[0]} (expected {expected}, "
+          f"{'all match' if all(count == expected for count in detected) else 'MISMATCH'})")
+
+
+if __name__ == "__main__":
+    main()
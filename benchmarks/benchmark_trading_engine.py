@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Benchmark the sample position state machine
+
+Compares the legacy per-row pandas loop with the array-based state machine
+(pure-Python loop, pure-NumPy trade jumping and the Numba kernel) at several
+history lengths, and checks that they agree. Up to --legacy-max-bars the
+sample_signal/sample_position/sample_pnl/sample_equity columns of
+generate_sample_signals (NumPy and Numba paths) must match the legacy loop
+exactly; longer histories, too slow for the legacy loop, check both paths
+against the pure-Python state machine instead. The script exits non-zero on
+any mismatch.
+
+Examples:
+  python3 benchmarks/benchmark_trading_engine.py
+  python3 benchmarks/benchmark_trading_engine.py --bars 1000 100000 1000000 --legacy-max-bars 10000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import sample_midnight_momentum_strategy as strategy
+
+
+def make_bars(n_bars: int, seed: int = 42) -> pd.DataFrame:
+    """Random-walk bars with a sparse sample_signal_95 column"""
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.cumprod(1 + rng.normal(0.0002, 0.01, n_bars))
+    high = close * (1 + np.abs(rng.normal(0, 0.006, n_bars)))
+    return pd.DataFrame({
+        'datetime': pd.date_range('2000-01-01', periods=n_bars, freq='5min'),
+        'high': high,
+        'close': close,
+        'sample_signal_95': (rng.random(n_bars) < 0.05).astype(int)
+    })
+
+
+def legacy_generate_sample_signals(df: pd.DataFrame, initial_capital: float = 10000.0) -> pd.DataFrame:
+    """The original iloc row loop, kept here as the benchmark baseline"""
+    result = df.copy()
+    result['sample_signal'] = None
+    result['sample_position'] = None
+    result['sample_pnl'] = np.nan
+    result['sample_equity'] = initial_capital
+    
+    current_equity = initial_capital
+    position = None
+    
+    for i in range(len(result)):
+        current_row = result.iloc[i]
+        if position is None:
+            if current_row.get('sample_signal_95', 0) == 1:
+                position = {'entry_price': current_row['close'], 'shares': 100}
+                result.iloc[i, result.columns.get_loc('sample_signal')] = 'ENTRY'
+                result.iloc[i, result.columns.get_loc('sample_position')] = 'OPEN'
+        else:
+            current_price = current_row['high']
+            entry_price = position['entry_price']
+            if current_price >= entry_price * 1.01:
+                pnl = (current_price - entry_price) * position['shares']
+                current_equity += pnl
+                result.iloc[i, result.columns.get_loc('sample_signal')] = 'EXIT'
+                result.iloc[i, result.columns.get_loc('sample_position')] = 'CLOSED'
+                result.iloc[i, result.columns.get_loc('sample_pnl')] = pnl
+                position = None
+            else:
+                result.iloc[i, result.columns.get_loc('sample_position')] = 'OPEN'
+        result.iloc[i, result.columns.get_loc('sample_equity')] = current_equity
+    
+    return result
+
+
+OUTPUT_COLUMNS = ('sample_signal', 'sample_position', 'sample_pnl', 'sample_equity')
+
+
+def frames_match(expected: pd.DataFrame, actual: pd.DataFrame) -> bool:
+    """Labels equal and PnL/equity equal (NaN where no trade closed)"""
+    for column in OUTPUT_COLUMNS:
+        left = expected[column].to_numpy()
+        right = actual[column].to_numpy()
+        if column in ('sample_pnl', 'sample_equity'):
+            if not np.allclose(left.astype(float), right.astype(float), rtol=0, atol=1e-9, equal_nan=True):
+                return False
+        elif not np.array_equal(left.astype(object), right.astype(object)):
+            return False
+    return True
+
+
+def arrays_match(expected, actual) -> bool:
+    """(signal_codes, position_codes, pnl) tuples are identical"""
+    return (np.array_equal(expected[0], actual[0]) and np.array_equal(expected[1], actual[1])
+            and np.allclose(expected[2], actual[2], rtol=0, atol=1e-9, equal_nan=True))
+
+
+def time_call(func, *args, repeat: int = 3) -> float:
+    """Best wall-clock time of several calls, in seconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the sample position state machine")
+    parser.add_argument('--bars', type=int, nargs='+', default=[1_000, 100_000, 1_000_000],
+                       help='History lengths to benchmark')
+    parser.add_argument('--legacy-max-bars', type=int, default=10_000,
+                       help='Largest history to run through the legacy iloc loop')
+    args = parser.parse_args()
+    
+    engine = strategy.SampleTradingEngine()
+    numpy_engine = strategy.SampleTradingEngine(use_jit=False)
+    jit_available = strategy._position_state_machine_jit is not None
+    
+    if jit_available:
+        # Compile outside the timed region
+        strategy.run_position_state_machine(np.zeros(2, dtype=bool), np.ones(2), np.ones(2))
+    
+    print(f"{'bars':>10} {'legacy':>10} {'python':>10} {'numpy':>10} {'numba':>10} {'engine':>10}  parity")
+    failures = 0
+    
+    for n_bars in args.bars:
+        df = make_bars(n_bars)
+        arrays = (df['sample_signal_95'].to_numpy() == 1, df['high'].to_numpy(), df['close'].to_numpy())
+        
+        legacy = time_call(legacy_generate_sample_signals, df, repeat=1) if n_bars <= args.legacy_max_bars else None
+        python_loop = time_call(strategy._position_state_machine_loop, *arrays, 1.01, 100, repeat=1)
+        numpy_path = time_call(lambda: strategy.run_position_state_machine(*arrays, use_jit=False))
+        numba_path = time_call(lambda: strategy.run_position_state_machine(*arrays)) if jit_available else None
+        full_engine = time_call(engine.generate_sample_signals, df)
+        
+        if legacy is not None:
+            reference = 'legacy'
+            expected = legacy_generate_sample_signals(df)
+            matches = [frames_match(expected, numpy_engine.generate_sample_signals(df))]
+            if jit_available:
+                matches.append(frames_match(expected, engine.generate_sample_signals(df)))
+        else:
+            reference = 'python'
+            expected = strategy._position_state_machine_loop(*arrays, 1.01, 100)
+            matches = [arrays_match(expected, strategy.run_position_state_machine(*arrays, use_jit=False))]
+            if jit_available:
+                matches.append(arrays_match(expected, strategy.run_position_state_machine(*arrays)))
+        parity = f"ok ({reference})" if all(matches) else f"MISMATCH ({reference})"
+        failures += not all(matches)
+        
+        cells = [legacy, python_loop, numpy_path, numba_path, full_engine]
+        print(f"{n_bars:>10,} " + ' '.join(f"{c * 1000:>8.2f}ms" if c is not None else f"{'-':>10}" for c in cells)
+              + f"  {parity}")
+    
+    if failures:
+        sys.exit(f"{failures} parity check(s) failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Local Parquet bar store for historical price data.
+
+Bars are stored per (symbol, frequency) and partitioned by UTC year, one
+Parquet file per partition, with the raw epoch-millisecond `datetime` as the
+row key. A small coverage file records which time ranges have already been
+requested from the API (including weekends and holidays that returned no
+bars), so callers only fetch the ranges that are still missing.
+
+Requires pyarrow (or another pandas Parquet engine).
+"""
+
+import os
+import json
+import time
+import pandas as pd
+from typing import Dict, List, Tuple
+
+BAR_COLUMNS = ["datetime", "open", "high", "low", "close", "volume"]
+MS_PER_DAY = 24 * 60 * 60 * 1000
+
+
+class BarStore:
+    def __init__(self, root_dir="historical_data/bar_store", settle_ms=MS_PER_DAY):
+        """
+        Initialize the bar store.
+
+        Args:
+            root_dir (str): Directory holding the Parquet partitions.
+            settle_ms (int): Bars newer than this are never marked as covered,
+                so the still-forming session is re-fetched on the next request.
+        """
+        self.root_dir = root_dir
+        self.settle_ms = settle_ms
+
+    def _series_dir(self, symbol, frequency):
+        return os.path.join(self.root_dir, symbol.upper(), frequency)
+
+    def _partition_path(self, symbol, frequency, year):
+        return os.path.join(self._series_dir(symbol, frequency), f"{year}.parquet")
+
+    def _coverage_path(self, symbol, frequency):
+        return os.path.join(self._series_dir(symbol, frequency), "coverage.json")
+
+    @staticmethod
+    def _year_of(epoch_ms):
+        return pd.Timestamp(int(epoch_ms), unit="ms").year
+
+    @staticmethod
+    def partition_years(start_ms, end_ms) -> List[int]:
+        """Partition years overlapping the inclusive range [start_ms, end_ms]."""
+        return list(range(BarStore._year_of(start_ms), BarStore._year_of(end_ms) + 1))
+
+    @staticmethod
+    def split_partitions(bars: pd.DataFrame) -> Dict[int, pd.DataFrame]:
+        """Bars grouped by partition year."""
+        years = pd.to_datetime(bars["datetime"], unit="ms").dt.year
+        return {int(year): group for year, group in bars.groupby(years.values)}
+
+    def read(self, symbol, frequency, start_ms=None, end_ms=None) -> pd.DataFrame:
+        """
+        Read cached bars for a symbol and frequency.
+
+        Args:
+            symbol (str): The stock symbol.
+            frequency (str): Frequency key, e.g. "minute5" or "daily1".
+            start_ms (int): Inclusive start in epoch milliseconds.
+            end_ms (int): Inclusive end in epoch milliseconds.
+
+        Returns:
+            pd.DataFrame: Bars sorted by datetime (epoch ms), possibly empty.
+        """
+        series_dir = self._series_dir(symbol, frequency)
+        if not os.path.isdir(series_dir):
+            return pd.DataFrame(columns=BAR_COLUMNS)
+
+        years = sorted(int(name.split(".")[0]) for name in os.listdir(series_dir) if name.endswith(".parquet"))
+        if start_ms is not None:
+            years = [year for year in years if year >= self._year_of(start_ms)]
+        if end_ms is not None:
+            years = [year for year in years if year <= self._year_of(end_ms)]
+
+        frames = [pd.read_parquet(self._partition_path(symbol, frequency, year)) for year in years]
+        if not frames:
+            return pd.DataFrame(columns=BAR_COLUMNS)
+
+        bars = pd.concat(frames, ignore_index=True)
+        mask = pd.Series(True, index=bars.index)
+        if start_ms is not None:
+            mask &= bars["datetime"] >= start_ms
+        if end_ms is not None:
+            mask &= bars["datetime"] <= end_ms
+        return bars[mask].reset_index(drop=True)
+
+    def write(self, symbol, frequency, bars: pd.DataFrame):
+        """
+        Merge bars into the store, replacing any bars with the same datetime.
+
+        Each touched partition is read and rewritten once per call, so callers
+        filling a long range should collect a partition's bars and write them
+        together rather than one small chunk at a time.
+
+        Args:
+            symbol (str): The stock symbol.
+            frequency (str): Frequency key.
+            bars (pd.DataFrame): Bars with an epoch-ms `datetime` column.
+        """
+        if bars is None or bars.empty:
+            return
+
+        bars = bars[BAR_COLUMNS].astype({"datetime": "int64"})
+        os.makedirs(self._series_dir(symbol, frequency), exist_ok=True)
+        for year, new_bars in self.split_partitions(bars).items():
+            path = self._partition_path(symbol, frequency, year)
+            if os.path.exists(path):
+                new_bars = pd.concat([pd.read_parquet(path), new_bars], ignore_index=True)
+            merged = (new_bars.drop_duplicates("datetime", keep="last")
+                      .sort_values("datetime")
+                      .reset_index(drop=True))
+
+            # Write to a temporary file first so readers never see a partial partition
+            tmp_path = f"{path}.tmp"
+            merged.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+
+    def _load_coverage(self, symbol, frequency) -> List[List[int]]:
+        path = self._coverage_path(symbol, frequency)
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                return json.load(f)
+        return []
+
+    def mark_covered(self, symbol, frequency, start_ms, end_ms):
+        """
+        Record that [start_ms, end_ms] has been fetched from the API.
+
+        The range is clipped to exclude the last `settle_ms`, then merged with
+        existing coverage.
+        """
+        end_ms = min(int(end_ms), int(time.time() * 1000) - self.settle_ms)
+        if end_ms < start_ms:
+            return
+
+        intervals = sorted(self._load_coverage(symbol, frequency) + [[int(start_ms), end_ms]])
+        merged = [intervals[0]]
+        for start, end in intervals[1:]:
+            if start <= merged[-1][1] + 1:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+
+        os.makedirs(self._series_dir(symbol, frequency), exist_ok=True)
+        with open(self._coverage_path(symbol, frequency), "w") as f:
+            json.dump(merged, f)
+
+    def missing_ranges(self, symbol, frequency, start_ms, end_ms) -> List[Tuple[int, int]]:
+        """
+        Sub-ranges of [start_ms, end_ms] that are not yet covered.
+
+        Returns:
+            list: Inclusive (start_ms, end_ms) tuples in ascending order.
+        """
+        missing = []
+        cursor = int(start_ms)
+        for start, end in self._load_coverage(symbol, frequency):
+            if end < cursor:
+                continue
+            if start > end_ms:
+                break
+            if start > cursor:
+                missing.append((cursor, start - 1))
+            cursor = max(cursor, end + 1)
+        if cursor <= end_ms:
+            missing.append((cursor, int(end_ms)))
+        return missing
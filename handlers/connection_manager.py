@@ -6,8 +6,12 @@ import webbrowser
 import json
 import urllib.parse
 import os
+import sys
+import threading
 from datetime import timedelta, datetime
 import time
+sys.path.append(os.path.dirname(__file__))
+import http_client
 
 # Load API credentials from external file
 def load_api_keys():
@@ -27,11 +31,35 @@ APP_KEY, APP_SECRET = load_api_keys()
 # Configuration
 REDIRECT_URI = "https://127.0.0.1"
 AUTH_URL = f"https://api.schwabapi.com/v1/oauth/authorize?response_type=code&client_id={APP_KEY}&redirect_uri={REDIRECT_URI}&scope=readonly"
-TOKEN_URL = "https://api.schwabapi.com/v1/oauth/token"
+TOKEN_PATH = "/v1/oauth/token"
+
+
+def token_url():
+    """Token endpoint under the shared client's current API base URL."""
+    return f"{http_client.API_BASE_URL}{TOKEN_PATH}"
+
 
 # Path to save tokens - Update this path for your system
 TOKEN_FILE = "cs_tokens.json"
 
+# Process-level token cache. TOKEN_FILE is only re-read when its mtime changes,
+# and its mtime is checked at most once per TOKEN_FILE_CHECK_INTERVAL seconds.
+TOKEN_FILE_CHECK_INTERVAL = 1.0
+_token_cache = None
+_token_cache_mtime = None
+_token_cache_checked_at = 0.0
+_token_cache_lock = threading.Lock()
+
+# Serializes refreshes so concurrent callers share a single refresh
+_refresh_lock = threading.Lock()
+_refresh_generation = 0
+
+def _set_token_cache(tokens, mtime):
+    global _token_cache, _token_cache_mtime, _token_cache_checked_at
+    _token_cache = tokens
+    _token_cache_mtime = mtime
+    _token_cache_checked_at = time.monotonic()
+
 def save_tokens(tokens):
     # Calculate and save the expiration time as a string
     expires_at = datetime.now() + timedelta(seconds=int(tokens['expires_in']))
@@ -39,13 +67,29 @@ def save_tokens(tokens):
     
     with open(TOKEN_FILE, 'w') as f:
         json.dump(tokens, f)
+    
+    with _token_cache_lock:
+        _set_token_cache(tokens, os.stat(TOKEN_FILE).st_mtime_ns)
 
 
 def load_tokens():
-    if os.path.exists(TOKEN_FILE):
-        with open(TOKEN_FILE, 'r') as f:
-            return json.load(f)
-    return None
+    """Return the cached tokens, re-reading TOKEN_FILE only if it has changed."""
+    with _token_cache_lock:
+        if _token_cache_mtime is not None and time.monotonic() - _token_cache_checked_at < TOKEN_FILE_CHECK_INTERVAL:
+            return _token_cache
+        
+        try:
+            mtime = os.stat(TOKEN_FILE).st_mtime_ns
+        except FileNotFoundError:
+            _set_token_cache(None, None)
+            return None
+        
+        if mtime != _token_cache_mtime:
+            with open(TOKEN_FILE, 'r') as f:
+                _set_token_cache(json.load(f), mtime)
+        else:
+            _set_token_cache(_token_cache, mtime)
+        return _token_cache
 
 def get_authorization_code():
     print("Manual authentication required. Go to the following URL to authenticate:")
@@ -79,7 +123,7 @@ def get_tokens(code):
         "redirect_uri": REDIRECT_URI
     }
     
-    token_response = requests.post(TOKEN_URL, headers=headers, data=payload)
+    token_response = http_client.post(token_url(), headers=headers, data=payload)
     if token_response.status_code == 200:
         tokens = token_response.json()
         save_tokens(tokens)
@@ -104,7 +148,7 @@ def refresh_tokens(refresh_token):
         "refresh_token": refresh_token
     }
 
-    refresh_response = requests.post(TOKEN_URL, headers=headers, data=payload)
+    refresh_response = http_client.post(token_url(), headers=headers, data=payload)
     
     if refresh_response.status_code == 200:
         new_tokens = refresh_response.json()
@@ -117,9 +161,47 @@ def refresh_tokens(refresh_token):
         return None
 
 
-# Modify ensure_valid_tokens to check expiration time
-def ensure_valid_tokens():
-    tokens = load_tokens()
+def _tokens_are_fresh(tokens):
+    """True if the access token is valid for more than the 2 minute buffer."""
+    try:
+        expires_at = datetime.fromisoformat(tokens['expires_at'])
+    except (TypeError, KeyError, ValueError):
+        return False
+    return datetime.now() < expires_at - timedelta(minutes=2)
+
+
+def ensure_valid_tokens(refresh=False):
+    """
+    Return valid tokens, refreshing them if they are about to expire.
+
+    Served from the in-memory cache on the hot path. When a refresh is needed,
+    concurrent callers wait for a single refresh instead of each calling
+    the token endpoint.
+
+    Args:
+        refresh (bool): Force a refresh (e.g. after a 401), unless another
+            caller already refreshed while this one was waiting.
+    """
+    global _refresh_generation
+    
+    generation = _refresh_generation
+    if not refresh:
+        tokens = load_tokens()
+        if tokens and _tokens_are_fresh(tokens):
+            return tokens
+    
+    with _refresh_lock:
+        tokens = load_tokens()
+        if tokens and _tokens_are_fresh(tokens) and (not refresh or _refresh_generation != generation):
+            return tokens  # Another caller refreshed while we were waiting
+        
+        new_tokens = _refresh_or_reauthenticate(tokens, force=refresh)
+        _refresh_generation += 1
+        return new_tokens
+
+
+def _refresh_or_reauthenticate(tokens, force=False):
+    """Refresh expiring (or, with force, any) tokens; fall back to manual re-authentication."""
     if tokens:
         expires_at = tokens.get('expires_at')
         
@@ -137,7 +219,7 @@ def ensure_valid_tokens():
         if tokens:
             refresh_token = tokens.get("refresh_token")
             # Check if access token is expired or about to expire (within a buffer, e.g., 2 minutes)
-            if datetime.now() >= expires_at - timedelta(minutes=2):
+            if force or datetime.now() >= expires_at - timedelta(minutes=2):
                 print("Access token is about to expire or has expired, attempting to refresh...")
                 new_tokens = refresh_tokens(refresh_token)
                 if new_tokens:
@@ -154,7 +236,7 @@ def ensure_valid_tokens():
 
 
 def get_account_numbers(access_token):
-    url = "https://api.schwabapi.com/trader/v1/accounts/accountNumbers"
+    url = f"{http_client.API_BASE_URL}/trader/v1/accounts/accountNumbers"
     headers = {
         "Authorization": f"Bearer {access_token}",
         "Accept": "application/json"
@@ -162,7 +244,7 @@ def get_account_numbers(access_token):
     retries = 5
     for attempt in range(retries):
         try:
-            response = requests.get(url, headers=headers, timeout=10)  # 10 seconds timeout
+            response = http_client.get(url, headers=headers, timeout=10)  # 10 seconds timeout
             response.raise_for_status()  # Raise error for bad status codes
             return response.json()
         except requests.exceptions.ReadTimeout:
@@ -175,13 +257,13 @@ def get_account_numbers(access_token):
 
 def get_account_details(access_token, account_number, field):
     #print(f"DEBUG : Fetching account details for account {account_number}...")
-    url = f"https://api.schwabapi.com/trader/v1/accounts/{account_number}?fields={field}"
+    url = f"{http_client.API_BASE_URL}/trader/v1/accounts/{account_number}?fields={field}"
 
     headers = {
         "Authorization": f"Bearer {access_token}",
         "Accept": "application/json"
     }
-    response = requests.get(url, headers=headers)
+    response = http_client.get(url, headers=headers)
     if response.status_code == 200:
         return response.json()
     elif response.status_code == 429:
@@ -194,7 +276,7 @@ def get_account_details(access_token, account_number, field):
 
 def get_positions(access_token, account_number):
     """Get current positions for the specified account"""
-    url = f"https://api.schwabapi.com/trader/v1/accounts/{account_number}/positions"
+    url = f"{http_client.API_BASE_URL}/trader/v1/accounts/{account_number}/positions"
     
     headers = {
         "Authorization": f"Bearer {access_token}",
@@ -204,7 +286,7 @@ def get_positions(access_token, account_number):
     retries = 3
     for attempt in range(retries):
         try:
-            response = requests.get(url, headers=headers, timeout=10)
+            response = http_client.get(url, headers=headers, timeout=10)
             if response.status_code == 200:
                 positions = response.json()
                 # Format the positions data
@@ -245,13 +327,13 @@ def get_all_positions():
         access_token = tokens['access_token']
         
         # Get accounts with positions
-        url = "https://api.schwabapi.com/trader/v1/accounts?fields=positions"
+        url = f"{http_client.API_BASE_URL}/trader/v1/accounts?fields=positions"
         headers = {
             "Authorization": f"Bearer {access_token}",
             "Accept": "application/json"
         }
         
-        response = requests.get(url, headers=headers)
+        response = http_client.get(url, headers=headers)
         if response.status_code != 200:
             print(f"Failed to get accounts. Status Code: {response.status_code}")
             print(f"Response: {response.text}")
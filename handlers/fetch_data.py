@@ -1,28 +1,50 @@
 #!/usr/bin/env python3
 """
-Script to fetch 10 years of daily data for a stock symbol and save as CSV
+Script to fetch 10 years of daily data for one or more stock symbols and save as CSV
+
+A single ticker is fetched synchronously. Several tickers (or a watchlist
+file) are fetched concurrently under a bounded asyncio semaphore, with every
+API request passing through a shared token-bucket rate limiter, and written
+to one consolidated CSV.
 """
 
 import os
 import sys
+import asyncio
 import argparse
 import pandas as pd
 from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from historical_data_handler import HistoricalDataHandler
+from bar_store import BarStore
+from rate_limiter import TokenBucket, SCHWAB_REQUESTS_PER_SECOND
 import time
 
-def fetch_and_save_10_year_data(symbol):
+# Same wall-clock format as HistoricalDataHandler.convert_timestamp
+CSV_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+def create_data_handler(cache_dir="historical_data/bar_store", rate=SCHWAB_REQUESTS_PER_SECOND):
     """
-    Fetch 10 years of daily data for the specified symbol and save as CSV
+    Create a HistoricalDataHandler backed by the local bar store and rate limiter
     
     Args:
-        symbol (str): Stock symbol to fetch data for
+        cache_dir (str): Local bar store directory (None to always hit the API)
+        rate (float): Maximum API requests per second
     """
-    print(f"Fetching 10 years of daily data for {symbol}...")
-    
-    # Initialize the historical data handler
-    data_handler = HistoricalDataHandler()
+    bar_store = BarStore(cache_dir) if cache_dir else None
+    return HistoricalDataHandler(bar_store=bar_store, rate_limiter=TokenBucket(rate=rate))
+
+def fetch_10_year_frame(symbol, data_handler):
+    """
+    Fetch 10 years of 5-minute bars for a symbol as a DataFrame
     
+    Args:
+        symbol (str): Stock symbol to fetch data for
+        data_handler (HistoricalDataHandler): Handler used for the request
+        
+    Returns:
+        DataFrame with symbol and OHLCV columns, or None if no data was received
+    """
     # Calculate dates for 10 years of data
     end_date = datetime.now()
     start_date = end_date - timedelta(days=10*365)  # Approximately 10 years
@@ -31,37 +53,123 @@ def fetch_and_save_10_year_data(symbol):
     start_date_ms = int(start_date.timestamp() * 1000)
     end_date_ms = int(end_date.timestamp() * 1000)
     
+    data = data_handler.fetch_historical_data(
+        symbol=symbol,
+        periodType="day",
+        period=1,
+        frequencyType="minute", 
+        freq=5,
+        startDate=start_date_ms,
+        endDate=end_date_ms,
+        needExtendedHoursData=False,  # Regular hours only for daily data
+        as_frame=True,
+        tz="local"
+    )
+    
+    if not data or data['candles'].empty:
+        return None
+    
+    df = data['candles']
+    df['symbol'] = symbol
+    df = df[['symbol', 'datetime', 'open', 'high', 'low', 'close', 'volume']]
+    return df.sort_values('datetime')
+
+async def fetch_symbols_async(symbols, data_handler, concurrency=4):
+    """
+    Fetch several symbols concurrently
+    
+    At most `concurrency` symbols are in flight at once; the handler's rate
+    limiter paces the underlying API requests across all of them.
+    
+    Args:
+        symbols (list): Stock symbols to fetch
+        data_handler (HistoricalDataHandler): Shared handler (pooled session, cache, limiter)
+        concurrency (int): Maximum symbols fetched at the same time
+        
+    Returns:
+        dict: symbol -> DataFrame (None for symbols that failed or returned no data)
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def fetch_one(symbol):
+        async with semaphore:
+            try:
+                return symbol, await asyncio.to_thread(fetch_10_year_frame, symbol, data_handler)
+            except Exception as e:
+                print(f"Error fetching data for {symbol}: {str(e)}")
+                return symbol, None
+    
+    results = await asyncio.gather(*(fetch_one(symbol) for symbol in symbols))
+    return dict(results)
+
+def fetch_and_save_universe(symbols, cache_dir="historical_data/bar_store", concurrency=4,
+                            rate=SCHWAB_REQUESTS_PER_SECOND):
+    """
+    Fetch 10 years of data for several symbols and save one consolidated CSV
+    
+    Returns:
+        str: Path of the consolidated CSV, or None if nothing was fetched
+    """
+    print(f"Fetching 10 years of data for {len(symbols)} symbols "
+          f"(concurrency={concurrency}, rate={rate}/s)...")
+    
+    data_handler = create_data_handler(cache_dir, rate)
+    start = time.perf_counter()
+    frames = asyncio.run(fetch_symbols_async(symbols, data_handler, concurrency))
+    elapsed = time.perf_counter() - start
+    
+    for symbol, df in frames.items():
+        print(f"  {symbol}: {len(df) if df is not None else 0} records")
+    
+    fetched = [df for df in frames.values() if df is not None]
+    if not fetched:
+        return None
+    
+    os.makedirs('historical_data', exist_ok=True)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    filename = f"historical_data/universe_10_year_data_{timestamp}.csv"
+    pd.concat(fetched, ignore_index=True).to_csv(filename, index=False, date_format=CSV_DATE_FORMAT)
+    
+    print(f"\nFetched {len(fetched)}/{len(symbols)} symbols in {elapsed:.1f}s")
+    print(f"Data successfully saved to: {filename}")
+    return filename
+
+def load_watchlist(path):
+    """Read symbols from a watchlist file (one per line or comma separated, # comments)"""
+    symbols = []
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.split('#')[0]
+            symbols.extend(part.strip().upper() for part in line.split(',') if part.strip())
+    return symbols
+
+def fetch_and_save_10_year_data(symbol, cache_dir="historical_data/bar_store", rate=SCHWAB_REQUESTS_PER_SECOND):
+    """
+    Fetch 10 years of daily data for the specified symbol and save as CSV
+    
+    Args:
+        symbol (str): Stock symbol to fetch data for
+        cache_dir (str): Local bar store directory (None to always hit the API)
+        rate (float): Maximum API requests per second
+    """
+    print(f"Fetching 10 years of daily data for {symbol}...")
+    
+    # Initialize the historical data handler, served from the local bar store when enabled
+    data_handler = create_data_handler(cache_dir, rate=rate)
+    
+    # Calculate dates for 10 years of data
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=10*365)  # Approximately 10 years
+    
     print(f"Date range: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
     
     try:
         # Fetch historical data
-        # Using year period type with 10 years, daily frequency
-        data = data_handler.fetch_historical_data(
-            symbol=symbol,
-            periodType="day",
-            period=1,
-            frequencyType="minute", 
-            freq=5,
-            startDate=start_date_ms,
-            endDate=end_date_ms,
-            needExtendedHoursData=False  # Regular hours only for daily data
-        )
+        df = fetch_10_year_frame(symbol, data_handler)
         
-        if not data or not data.get('candles'):
+        if df is None:
             print(f"No data received for {symbol}")
             return None
-            
-        # Convert to DataFrame
-        df = pd.DataFrame(data['candles'])
-        
-        # Add symbol column
-        df['symbol'] = symbol
-        
-        # Reorder columns
-        df = df[['symbol', 'datetime', 'open', 'high', 'low', 'close', 'volume']]
-        
-        # Sort by datetime
-        df = df.sort_values('datetime')
         
         # Create output directory if it doesn't exist
         os.makedirs('historical_data', exist_ok=True)
@@ -71,7 +179,7 @@ def fetch_and_save_10_year_data(symbol):
         filename = f"historical_data/{symbol}_10_year_daily_data_{timestamp}.csv"
         
         # Save to CSV
-        df.to_csv(filename, index=False)
+        df.to_csv(filename, index=False, date_format=CSV_DATE_FORMAT)
         
         print(f"\nData successfully saved to: {filename}")
         print(f"Total records: {len(df)}")
@@ -109,27 +217,74 @@ Examples:
   python fetch_10_year_daily_data.py AAPL
   python fetch_10_year_daily_data.py NVDA
   python fetch_10_year_daily_data.py TSLA
+  python fetch_10_year_daily_data.py AAPL NVDA TSLA --concurrency 4
+  python fetch_10_year_daily_data.py --watchlist watchlist.txt --rate 2
         """
     )
     
     parser.add_argument(
-        'ticker',
+        'tickers',
+        type=str,
+        nargs='*',
+        help='Stock ticker symbols to fetch data for (e.g., AAPL, NVDA, TSLA)'
+    )
+    
+    parser.add_argument(
+        '--watchlist',
+        type=str,
+        help='File with ticker symbols (one per line or comma separated)'
+    )
+    
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=4,
+        help='Maximum symbols fetched at the same time (default: 4)'
+    )
+    
+    parser.add_argument(
+        '--rate',
+        type=float,
+        default=SCHWAB_REQUESTS_PER_SECOND,
+        help=f'Maximum API requests per second (default: {SCHWAB_REQUESTS_PER_SECOND})'
+    )
+    
+    parser.add_argument(
+        '--cache-dir',
         type=str,
-        help='Stock ticker symbol to fetch data for (e.g., AAPL, NVDA, TSLA)'
+        default='historical_data/bar_store',
+        help='Local bar store directory (default: historical_data/bar_store)'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Bypass the local bar store and fetch the full range from the API'
     )
     
     # Parse arguments
     args = parser.parse_args()
     
-    # Convert ticker to uppercase for consistency
-    ticker = args.ticker.upper()
+    # Convert tickers to uppercase for consistency, keeping first-seen order
+    tickers = [ticker.upper() for ticker in args.tickers]
+    if args.watchlist:
+        tickers.extend(load_watchlist(args.watchlist))
+    tickers = list(dict.fromkeys(tickers))
+    if not tickers:
+        parser.error("provide at least one ticker or --watchlist")
+    
+    cache_dir = None if args.no_cache else args.cache_dir
     
     print("=" * 60)
     print("10-Year Daily Data Fetcher")
     print("=" * 60)
     
-    # Fetch data for the specified ticker
-    result = fetch_and_save_10_year_data(ticker)
+    # Fetch data for the specified tickers
+    if len(tickers) == 1:
+        result = fetch_and_save_10_year_data(tickers[0], cache_dir=cache_dir, rate=args.rate)
+    else:
+        result = fetch_and_save_universe(tickers, cache_dir=cache_dir,
+                                         concurrency=args.concurrency, rate=args.rate)
     
     if result:
         print(f"\n✅ Successfully saved 10-year daily data to: {result}")
@@ -0,0 +1,219 @@
+#fill_tracker.py
+
+"""
+Event-driven fill tracking for orders in the OrderHandler journal.
+
+Instead of polling get_order_status once per order, FillTracker watches every
+open order in the journal with one batched get_all_orders(status="WORKING")
+request per interval. Orders that drop out of the WORKING list are resolved
+with a single unfiltered get_all_orders request, so confirming N fills costs
+at most two API calls per interval, whatever N is. Every status or filled
+quantity change is written back to the journal and pushed to a callback
+and/or an asyncio queue. A push feed (e.g. account activity streaming) can
+feed the same transitions through handle_order_update().
+
+Usage:
+    tracker = FillTracker(order_handler, interval=1.0, on_transition=print)
+    tracker.start()
+    ...
+    tracker.wait_for(order_ids, timeout=30)
+    tracker.stop()
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+TERMINAL_STATUSES = frozenset({"FILLED", "CANCELED", "REJECTED", "EXPIRED", "REPLACED"})
+DEFAULT_POLL_INTERVAL = 1.0
+
+# Margin around the entered-time window sent with get_all_orders
+_ENTERED_TIME_MARGIN = timedelta(minutes=5)
+
+
+def _api_time(moment: datetime) -> str:
+    """Format a (naive local or aware) datetime as the API's UTC ISO timestamp."""
+    return moment.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+class FillTracker:
+    def __init__(self, order_handler, interval=DEFAULT_POLL_INTERVAL,
+                 on_transition: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 queue: Optional[asyncio.Queue] = None, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """
+        Initialize the fill tracker.
+
+        Args:
+            order_handler: OrderHandler whose journal (order_history) lists the
+                orders to watch and receives the status updates.
+            interval (float): Seconds between polls.
+            on_transition (callable): Called with each transition event (see
+                handle_order_update) from the polling thread.
+            queue (asyncio.Queue): Queue transition events are also put on.
+            loop (asyncio.AbstractEventLoop): Loop owning the queue (defaults to
+                the running loop when start() is called, if any).
+        """
+        self.order_handler = order_handler
+        self.journal = order_handler.order_history
+        self.interval = interval
+        self.on_transition = on_transition
+        self.queue = queue
+        self.loop = loop
+
+        self.polls = 0
+        self.api_calls = 0
+        self.transitions = 0
+
+        self._changed = threading.Condition()
+        self._stop = threading.Event()
+        self._thread = None
+        self.logger = logging.getLogger(__name__)
+
+    def open_orders(self) -> List[Dict[str, Any]]:
+        return self.journal.open_orders(TERMINAL_STATUSES)
+
+    def _get_orders(self, opened: List[Dict[str, Any]], status=None) -> Optional[List[Dict[str, Any]]]:
+        timestamps = [record['timestamp'] for record in opened if isinstance(record.get('timestamp'), datetime)]
+        earliest = min(timestamps) if timestamps else datetime.now()
+        self.api_calls += 1
+        orders = self.order_handler.get_all_orders(
+            from_entered_time=_api_time(earliest - _ENTERED_TIME_MARGIN),
+            to_entered_time=_api_time(datetime.now() + _ENTERED_TIME_MARGIN),
+            status=status
+        )
+        if isinstance(orders, dict):
+            self.logger.error(f"Fill tracker poll failed: {orders.get('error', orders)}")
+            return None
+        return orders
+
+    def poll_once(self) -> List[Dict[str, Any]]:
+        """
+        Poll the broker once and apply every state change of the open orders.
+
+        Returns:
+            list: Transition events emitted by this poll.
+        """
+        opened = self.open_orders()
+        if not opened:
+            return []
+        self.polls += 1
+
+        working = self._get_orders(opened, status="WORKING")
+        if working is None:
+            return []
+        working = {str(order.get('orderId')): order for order in working}
+
+        events = []
+        departed = []
+        for record in opened:
+            order = working.get(str(record['order_id']))
+            if order is None:
+                departed.append(record)
+            else:
+                events.extend(self._apply(record, order))
+
+        # Orders that left WORKING (filled, canceled, or never became WORKING) are resolved in one call
+        if departed:
+            orders = self._get_orders(departed)
+            if orders is not None:
+                by_id = {str(order.get('orderId')): order for order in orders}
+                for record in departed:
+                    order = by_id.get(str(record['order_id']))
+                    if order is not None:
+                        events.extend(self._apply(record, order))
+        return events
+
+    def handle_order_update(self, order: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Apply an order update in Schwab order format from a push feed.
+
+        Returns:
+            list: The transition event, if the update changed the order.
+        """
+        record = self.journal.get(order.get('orderId'))
+        if record is None:
+            return []
+        return self._apply(record, order)
+
+    def _apply(self, record: Dict[str, Any], order: Dict[str, Any]) -> List[Dict[str, Any]]:
+        status = order.get('status')
+        filled = order.get('filledQuantity')
+        previous_status = record.get('status')
+        previous_filled = record.get('filled_quantity')
+        if status == previous_status and filled == previous_filled:
+            return []
+
+        self.journal.update(record['order_id'], status=status, filled_quantity=filled,
+                            remaining_quantity=order.get('remainingQuantity'))
+        event = {
+            'order_id': str(record['order_id']),
+            'symbol': record.get('symbol'),
+            'previous_status': previous_status,
+            'status': status,
+            'filled_quantity': filled,
+            'remaining_quantity': order.get('remainingQuantity'),
+            'timestamp': datetime.now(),
+            'order': order
+        }
+        self._emit(event)
+        return [event]
+
+    def _emit(self, event):
+        self.transitions += 1
+        if self.on_transition is not None:
+            try:
+                self.on_transition(event)
+            except Exception as e:
+                self.logger.error(f"Fill tracker callback failed: {str(e)}")
+        if self.queue is not None:
+            if self.loop is not None:
+                self.loop.call_soon_threadsafe(self.queue.put_nowait, event)
+            else:
+                self.queue.put_nowait(event)
+        with self._changed:
+            self._changed.notify_all()
+
+    def start(self):
+        """Start polling on a background thread."""
+        if self.queue is not None and self.loop is None:
+            try:
+                self.loop = asyncio.get_running_loop()
+            except RuntimeError:
+                pass
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="fill-tracker", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.poll_once()
+            except Exception as e:
+                self.logger.error(f"Fill tracker poll failed: {str(e)}")
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def wait_for(self, order_ids: Iterable[str], statuses=TERMINAL_STATUSES, timeout=None) -> bool:
+        """
+        Block until every order has reached one of the given statuses.
+
+        Returns:
+            bool: False if the timeout expired first.
+        """
+        order_ids = [str(order_id) for order_id in order_ids]
+
+        def done():
+            return all((self.journal.get(order_id) or {}).get('status') in statuses for order_id in order_ids)
+
+        with self._changed:
+            return self._changed.wait_for(done, timeout=timeout)
@@ -1,47 +1,139 @@
 import os
+import sys
 import requests
+import operator
+import numpy as np
 import pandas as pd
+import threading
 import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 from typing import Dict, Any
-from .connection_manager import ensure_valid_tokens
+sys.path.append(os.path.dirname(__file__))
+from connection_manager import ensure_valid_tokens
+from bar_store import BAR_COLUMNS, MS_PER_DAY
+from request_scheduler import RequestScheduler
+import http_client
+
+# Longest range one pricehistory response covers, per frequencyType.
+# Longer ranges are split into windows of this size.
+MAX_CHUNK_DAYS = {
+    "minute": 10,
+}
+DEFAULT_CHUNK_WORKERS = 4
+
+# The quotes endpoint accepts a comma-separated symbol list
+QUOTE_BATCH_SIZE = 500
+QUOTE_TTL_SECONDS = 1.0
+QUOTE_FIELDS = ("lastPrice", "bidPrice", "askPrice", "tradeTime")
+QUOTE_COLUMNS = ["lastPrice", "bidPrice", "askPrice", "lastTradeTime"]
+
+# UTC offsets (and DST transitions) fall on quarter-hour boundaries
+OFFSET_BUCKET_MS = 15 * 60 * 1000
+_CANDLE_DTYPES = {"datetime": np.int64, "open": np.float64, "high": np.float64,
+                  "low": np.float64, "close": np.float64, "volume": np.int64}
+
+
+def _local_datetimes(epoch_ms):
+    """
+    Convert epoch milliseconds to naive local datetime64 values.
+
+    Matches datetime.fromtimestamp(): the UTC offset is looked up once per
+    distinct quarter hour rather than once per bar.
+    """
+    buckets, inverse = np.unique(epoch_ms // OFFSET_BUCKET_MS, return_inverse=True)
+    offsets = np.array([time.localtime(int(bucket) * OFFSET_BUCKET_MS // 1000).tm_gmtoff for bucket in buckets], dtype=np.int64) * 1000
+    return (epoch_ms + offsets[inverse]).astype("datetime64[ms]").astype("datetime64[ns]")
+
+
+def candles_to_frame(candles, tz=None) -> pd.DataFrame:
+    """
+    Decode pricehistory candles into a columnar DataFrame.
+
+    Args:
+        candles (list or pd.DataFrame): Raw candles with epoch-ms `datetime`.
+        tz (str): Timestamp representation. None keeps int64 epoch
+            milliseconds, "local" gives naive local datetime64 (the same
+            wall-clock times as convert_timestamp), any other value is a
+            time zone name for datetime64[ns, tz].
+
+    Returns:
+        pd.DataFrame: Columns datetime, open, high, low, close, volume.
+    """
+    if isinstance(candles, pd.DataFrame):
+        frame = candles[BAR_COLUMNS].reset_index(drop=True)
+    else:
+        try:
+            # One pass per column, no per-bar objects
+            frame = pd.DataFrame({
+                column: np.fromiter(map(operator.itemgetter(column), candles), dtype=dtype, count=len(candles))
+                for column, dtype in _CANDLE_DTYPES.items()
+            })
+        except (KeyError, TypeError):
+            frame = pd.DataFrame(candles, columns=BAR_COLUMNS).astype({"datetime": np.int64})
+
+    if tz == "local":
+        frame["datetime"] = _local_datetimes(frame["datetime"].to_numpy(dtype=np.int64))
+    elif tz is not None:
+        frame["datetime"] = pd.to_datetime(frame["datetime"], unit="ms", utc=True).dt.tz_convert(tz)
+    return frame
+
 
 class HistoricalDataHandler:
-    def __init__(self):
+    def __init__(self, bar_store=None, rate_limiter=None, chunk_workers=DEFAULT_CHUNK_WORKERS, scheduler=None,
+                 quote_ttl=QUOTE_TTL_SECONDS):
         """
         Initialize the HistoricalDataHandler.
+
+        Args:
+            bar_store (BarStore): Optional local bar cache. When set, ranged
+                requests are served from the cache and only missing ranges
+                are fetched from the API.
+            rate_limiter (TokenBucket): Optional limiter applied to every
+                pricehistory request, shared across threads.
+            chunk_workers (int): Maximum concurrent requests when a long
+                range is split into endpoint-sized windows.
+            scheduler (RequestScheduler): Sends requests with rate limiting,
+                Retry-After handling and per-endpoint backoff. A private one
+                using rate_limiter is created if not given.
+            quote_ttl (float): Seconds a quote is served from the cache by get_quotes.
         """
+        self.bar_store = bar_store
+        self.rate_limiter = rate_limiter
+        self.chunk_workers = chunk_workers
+        self.scheduler = scheduler if scheduler is not None else RequestScheduler(rate_limiter=rate_limiter)
+        self.quote_ttl = quote_ttl
+        self._quote_cache = {}  # symbol -> (monotonic fetch time, row of QUOTE_FIELDS)
+        self._quote_lock = threading.Lock()
         # print(f"DEBUG: Initialized HistoricalDataHandler. Instance ID: {id(self)}")
 
-    def get_historical_data(self, symbol, periodType, period, frequencyType, freq, startDate=None, endDate=None, needExtendedHoursData=True):
+    def get_historical_data(self, symbol, periodType, period, frequencyType, freq, startDate=None, endDate=None, needExtendedHoursData=True, as_frame=False, tz=None):
         """Alias for fetch_historical_data for compatibility"""
-        return self.fetch_historical_data(symbol, periodType, period, frequencyType, freq, startDate, endDate, needExtendedHoursData)
+        return self.fetch_historical_data(symbol, periodType, period, frequencyType, freq, startDate, endDate, needExtendedHoursData, as_frame, tz)
 
-    def fetch_historical_data(self, symbol, periodType, period, frequencyType, freq, startDate=None, endDate=None, needExtendedHoursData=True):
+    def fetch_historical_data(self, symbol, periodType, period, frequencyType, freq, startDate=None, endDate=None, needExtendedHoursData=True, as_frame=False, tz=None):
         # print(f"DEBUG: [HistoricalDataHandler] fetch_historical_data called. Instance ID: {id(self)}")
         
-        max_retries = 5  # Number of retries before giving up
-        retry_delay = 2  # Initial retry delay in seconds
+        use_bar_store = self.bar_store is not None and startDate is not None and endDate is not None
 
-        for attempt in range(max_retries):
-            try:
-                data = self.get_hist_bars(symbol, periodType, period, frequencyType, freq, startDate, endDate, needExtendedHoursData)
-                if data:
-                    print(f"H")
-                    return data
-                else:
-                    print("DEBUG: Fetch_historical_data_[HistoricalDataHandler] No data fetched.")
-                    return None
-            except requests.exceptions.RequestException as e:
-                print(f"ERROR: [HistoricalDataHandler] Request failed on attempt {attempt + 1} with error: {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay)
-                    retry_delay *= 2  # Exponential backoff  `                                                  `
-                else:
-                    print("ERROR: [HistoricalDataHandler] Maximum retry attempts reached. Aborting.")
-                    return None
-
-    def get_hist_bars(self, symbol, periodType, period, frequencyType, freq, startDate=None, endDate=None, needExtendedHoursData=True):
+        try:
+            if use_bar_store:
+                data = self.get_cached_hist_bars(symbol, periodType, period, frequencyType, freq, startDate, endDate, needExtendedHoursData, as_frame, tz)
+            else:
+                data = self.get_hist_bars(symbol, periodType, period, frequencyType, freq, startDate, endDate, needExtendedHoursData, as_frame, tz)
+            if data:
+                print(f"H")
+                return data
+            else:
+                print("DEBUG: Fetch_historical_data_[HistoricalDataHandler] No data fetched.")
+                return None
+        except requests.exceptions.RequestException as e:
+            # Throttling and transient failures were already retried with backoff by the scheduler
+            print(f"ERROR: [HistoricalDataHandler] Request failed after retries with error: {e}")
+            return None
+
+    def get_hist_bars(self, symbol, periodType, period, frequencyType, freq, startDate=None, endDate=None, needExtendedHoursData=True, as_frame=False, tz=None):
         """
         Retrieve historical bars from the Schwab API.
 
@@ -54,32 +146,25 @@ class HistoricalDataHandler:
             startDate (str): The start date.
             endDate (str): The end date.
             needExtendedHoursData (bool): Whether to include extended hours data.
+            as_frame (bool): Return candles as a columnar DataFrame (see
+                candles_to_frame) instead of a list of dicts with formatted
+                datetime strings.
+            tz (str): Timestamp representation when as_frame is set.
 
         Returns:
             dict: The historical bar data.
         """
-        tokens = ensure_valid_tokens()
-        access_token = tokens["access_token"]
-
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Accept": "application/json"
-        }
-
-        url = f"https://api.schwabapi.com/marketdata/v1/pricehistory?symbol={symbol}&periodType={periodType}&period={period}&frequencyType={frequencyType}&frequency={freq}&needExtendedHoursData={str(needExtendedHoursData).lower()}"
-
-        if startDate:
-            url += f"&startDate={startDate}"
-        if endDate:
-            url += f"&endDate={endDate}"
-
         try:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()  # Raise an exception for non-200 responses
-
-            data = response.json()
+            data = self._request_price_history_chunked(symbol, periodType, period, frequencyType, freq, startDate, endDate, needExtendedHoursData)
 
             if not data.get("empty", True):
+                if as_frame:
+                    return {
+                        "symbol": symbol,
+                        "candles": candles_to_frame(data["candles"], tz),
+                        "previousClose": data.get("previousClose"),
+                        "previousCloseDate": data.get("previousCloseDate")
+                    }
                 candles = [
                     {
                         "datetime": self.convert_timestamp(bar["datetime"]),
@@ -102,18 +187,221 @@ class HistoricalDataHandler:
                 return None
         except requests.exceptions.HTTPError as http_err:
             print(f"HTTP error occurred: {http_err}")
+            response = http_err.response
             if response.status_code == 401:
                 print("ERROR: Token expired, refreshing tokens.")
                 ensure_valid_tokens(refresh=True)  # Force token refresh
             elif response.status_code == 429:
-                print("ERROR: Rate limit exceeded, retrying after delay.")
-                time.sleep(60)  # Wait for 60 seconds before retrying
+                print("ERROR: Rate limit still exceeded after scheduler retries.")
             else:
                 raise
         except Exception as e:
             print(f"ERROR: Failed to fetch historical data: {e}")
             raise
 
+    def _request_price_history(self, symbol, periodType, period, frequencyType, freq, startDate=None, endDate=None, needExtendedHoursData=True):
+        """
+        Send a pricehistory request and return the decoded JSON response.
+
+        Raises:
+            requests.exceptions.HTTPError: For non-200 responses.
+        """
+        tokens = ensure_valid_tokens()
+        access_token = tokens["access_token"]
+
+        headers = {
+            "Authorization": f"Bearer {access_token}",
+            "Accept": "application/json"
+        }
+
+        url = f"{http_client.API_BASE_URL}/marketdata/v1/pricehistory?symbol={symbol}&periodType={periodType}&period={period}&frequencyType={frequencyType}&frequency={freq}&needExtendedHoursData={str(needExtendedHoursData).lower()}"
+
+        if startDate:
+            url += f"&startDate={startDate}"
+        if endDate:
+            url += f"&endDate={endDate}"
+
+        response = self.scheduler.request("pricehistory", http_client.get, url, headers=headers)
+        response.raise_for_status()  # Raise an exception for non-200 responses
+        return response.json()
+
+    @staticmethod
+    def chunk_ranges(frequencyType, startDate, endDate):
+        """
+        Split [startDate, endDate] into endpoint-sized inclusive windows.
+
+        Args:
+            frequencyType (str): The frequency type, used to look up the window size.
+            startDate (int): Start in epoch milliseconds.
+            endDate (int): End in epoch milliseconds.
+
+        Returns:
+            list: (start_ms, end_ms) tuples in ascending order.
+        """
+        chunk_days = MAX_CHUNK_DAYS.get(frequencyType)
+        if chunk_days is None:
+            return [(int(startDate), int(endDate))]
+
+        chunk_ms = chunk_days * MS_PER_DAY
+        return [(start, min(start + chunk_ms - 1, int(endDate)))
+                for start in range(int(startDate), int(endDate) + 1, chunk_ms)]
+
+    def _iter_price_history_chunks(self, symbol, periodType, period, frequencyType, freq, ranges, needExtendedHoursData=True):
+        """
+        Request several date ranges concurrently.
+
+        At most chunk_workers requests are in flight, and a response is
+        released as soon as it has been yielded, so memory is bounded by the
+        worker count rather than by the number of ranges.
+
+        Yields:
+            tuple: ((start_ms, end_ms), response JSON) in completion order.
+        """
+        if not ranges:
+            return
+        if len(ranges) == 1:
+            range_start, range_end = ranges[0]
+            yield ranges[0], self._request_price_history(symbol, periodType, period, frequencyType, freq, range_start, range_end, needExtendedHoursData)
+            return
+
+        workers = min(self.chunk_workers, len(ranges))
+        pending_ranges = iter(ranges)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {}
+
+            def submit_next():
+                chunk = next(pending_ranges, None)
+                if chunk is not None:
+                    futures[executor.submit(self._request_price_history, symbol, periodType, period, frequencyType, freq, chunk[0], chunk[1], needExtendedHoursData)] = chunk
+
+            for _ in range(workers):
+                submit_next()
+            try:
+                while futures:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        chunk = futures.pop(future)
+                        submit_next()
+                        yield chunk, future.result()
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+    def _request_price_history_chunked(self, symbol, periodType, period, frequencyType, freq, startDate=None, endDate=None, needExtendedHoursData=True):
+        """
+        Send a pricehistory request, splitting long ranges into concurrent chunks.
+
+        Candles are merged as each chunk arrives, keyed by datetime so the
+        duplicates at the chunk seams collapse, and only the merged candles
+        are kept; the result is returned in datetime order. previousClose
+        comes from the earliest chunk. Unlike get_cached_hist_bars this path
+        is not streaming: the whole merged range is held until it returns.
+
+        Returns:
+            dict: A response in the same shape as a single pricehistory call.
+        """
+        if not startDate or not endDate:
+            return self._request_price_history(symbol, periodType, period, frequencyType, freq, startDate, endDate, needExtendedHoursData)
+
+        ranges = self.chunk_ranges(frequencyType, startDate, endDate)
+        if len(ranges) == 1:
+            return self._request_price_history(symbol, periodType, period, frequencyType, freq, startDate, endDate, needExtendedHoursData)
+
+        candles = {}
+        first = {}
+        for chunk, response in self._iter_price_history_chunks(symbol, periodType, period, frequencyType, freq, ranges, needExtendedHoursData):
+            for bar in response.get("candles") or []:
+                candles[bar["datetime"]] = bar
+            if chunk == ranges[0]:
+                first = {key: response.get(key) for key in ("previousClose", "previousCloseDate")}
+
+        return {
+            "symbol": symbol,
+            "empty": not candles,
+            "candles": [candles[key] for key in sorted(candles)],
+            "previousClose": first.get("previousClose"),
+            "previousCloseDate": first.get("previousCloseDate")
+        }
+
+    def get_cached_hist_bars(self, symbol, periodType, period, frequencyType, freq, startDate, endDate, needExtendedHoursData=True, as_frame=False, tz=None):
+        """
+        Retrieve historical bars through the local bar store.
+
+        Only the sub-ranges of [startDate, endDate] missing from the store are
+        requested from the API, split into endpoint-sized windows fetched
+        concurrently. Arriving windows are buffered per year partition and
+        each partition is written once, as soon as every window overlapping
+        it has arrived. Memory holds only the partitions still being filled,
+        and a year file is not rewritten once per window. A window is marked
+        as covered only after all of its bars are on disk.
+
+        Args:
+            startDate (int): Start in epoch milliseconds.
+            endDate (int): End in epoch milliseconds.
+
+        Returns:
+            dict: The historical bar data in the same format as get_hist_bars,
+                or None if no bars are available. previousClose fields are
+                not available from the cache and are None.
+        """
+        frequency_key = f"{frequencyType}{freq}"
+        if needExtendedHoursData:
+            frequency_key += "_ext"
+
+        ranges = [chunk
+                  for range_start, range_end in self.bar_store.missing_ranges(symbol, frequency_key, startDate, endDate)
+                  for chunk in self.chunk_ranges(frequencyType, range_start, range_end)]
+
+        # Writes happen on this thread only, so store partitions and coverage are never written concurrently
+        chunk_years = {chunk: self.bar_store.partition_years(*chunk) for chunk in ranges}
+        outstanding = Counter(year for years in chunk_years.values() for year in years)
+        buffered = {}
+        unwritten = []
+        for chunk, data in self._iter_price_history_chunks(symbol, periodType, period, frequencyType, freq, ranges, needExtendedHoursData):
+            candles = pd.DataFrame(data.get("candles") or [], columns=BAR_COLUMNS)
+            if not candles.empty:
+                for year, year_bars in self.bar_store.split_partitions(candles).items():
+                    buffered.setdefault(year, []).append(year_bars)
+            unwritten.append(chunk)
+
+            for year in chunk_years[chunk]:
+                outstanding[year] -= 1
+                if outstanding[year] == 0 and year in buffered:
+                    self.bar_store.write(symbol, frequency_key, pd.concat(buffered.pop(year), ignore_index=True))
+
+            for done in [c for c in unwritten if all(outstanding[year] == 0 for year in chunk_years[c])]:
+                self.bar_store.mark_covered(symbol, frequency_key, *done)
+                unwritten.remove(done)
+
+        # Bars the API returned outside the requested windows
+        for year, frames in buffered.items():
+            self.bar_store.write(symbol, frequency_key, pd.concat(frames, ignore_index=True))
+
+        bars = self.bar_store.read(symbol, frequency_key, startDate, endDate)
+        if bars.empty:
+            print("DEBUG: Get_cached_hist_bars_[HistoricalDataHandler] No data available.")
+            return None
+
+        if as_frame:
+            return {
+                "symbol": symbol,
+                "candles": candles_to_frame(bars, tz),
+                "previousClose": None,
+                "previousCloseDate": None
+            }
+
+        records = bars.to_dict("records")
+        for record in records:
+            record["datetime"] = self.convert_timestamp(record["datetime"])
+
+        return {
+            "symbol": symbol,
+            "candles": records,
+            "previousClose": None,
+            "previousCloseDate": None
+        }
+
     def convert_timestamp(self, timestamp):
         """
         Convert a timestamp to a formatted datetime string.
@@ -128,11 +416,11 @@ class HistoricalDataHandler:
             return datetime.fromtimestamp(timestamp / 1000).strftime('%Y-%m-%d %H:%M:%S')
         return None
 
-    def fetch_top_movers():
+    def fetch_top_movers(self):
         tokens = ensure_valid_tokens()  # Get the token dictionary
         access_token = tokens["access_token"]  # Retrieve the access token
 
-        url = 'https://api.schwabapi.com/marketdata/v1/movers/%24SPX'
+        url = f'{http_client.API_BASE_URL}/marketdata/v1/movers/%24SPX'
         params = {
             'sort': 'VOLUME',
             'frequency': 5
@@ -143,7 +431,7 @@ class HistoricalDataHandler:
         }
 
         # Make the request
-        response = requests.get(url, headers=headers, params=params)
+        response = http_client.get(url, headers=headers, params=params)
 
         # Check for token expiration and retry if necessary
         if response.status_code == 401:
@@ -151,7 +439,7 @@ class HistoricalDataHandler:
             tokens = ensure_valid_tokens(refresh=True)
             access_token = tokens["access_token"]  # Get new token
             headers['Authorization'] = f'Bearer {access_token}'
-            response = requests.get(url, headers=headers, params=params)  # Retry with refreshed token
+            response = http_client.get(url, headers=headers, params=params)  # Retry with refreshed token
 
         # Handle the response
         if response.status_code == 200:
@@ -160,15 +448,103 @@ class HistoricalDataHandler:
             print("Failed to fetch data", response.status_code)
             return []
 
-    # Fetch top movers data
-    top_movers = fetch_top_movers()
+    def fetch_top_movers_filtered(self, max_price=150, limit=5):
+        # Fetch top movers data
+        top_movers = self.fetch_top_movers()
 
-    # Filter for tickers with price < $150, then sort by volume in descending order and get top 5
-    top_movers_filtered = sorted(
-        [mover for mover in top_movers if mover['lastPrice'] < 150], 
-        key=lambda x: x['volume'], 
-        reverse=True
-    )[:5]
+        # Filter for tickers with price < $150, then sort by volume in descending order and get top 5
+        return sorted(
+            [mover for mover in top_movers if mover['lastPrice'] < max_price], 
+            key=lambda x: x['volume'], 
+            reverse=True
+        )[:limit]
+
+    def _get_auth_headers(self):
+        """Get authorization headers for API requests."""
+        tokens = ensure_valid_tokens()
+        return {
+            "Authorization": f"Bearer {tokens['access_token']}",
+            "Accept": "application/json"
+        }
+
+    @staticmethod
+    def _parse_quotes(payload):
+        """
+        Extract (symbol, row) pairs from a quotes response.
+
+        Handles the keyed response ({"AAPL": {"quote": {...}}, ...}) as well as
+        a flat {"quotes": [...]} list.
+        """
+        if isinstance(payload.get("quotes"), list):
+            entries = ((quote.get("symbol"), quote) for quote in payload["quotes"])
+        else:
+            entries = ((symbol, entry.get("quote", entry)) for symbol, entry in payload.items() if isinstance(entry, dict))
+
+        for symbol, quote in entries:
+            if symbol:
+                yield symbol, tuple(quote.get(field) for field in QUOTE_FIELDS)
+
+    def get_quotes(self, symbols, max_age=None) -> pd.DataFrame:
+        """
+        Get real-time quotes for many symbols
+
+        Symbols without a cached quote younger than `max_age` are fetched in
+        batches of QUOTE_BATCH_SIZE, one request per batch, sent concurrently
+        through the scheduler.
+
+        Parameters:
+            symbols: Iterable of stock symbols
+            max_age: Seconds a cached quote stays valid (default: self.quote_ttl)
+
+        Returns:
+            DataFrame indexed by symbol with lastPrice, bidPrice, askPrice and
+            lastTradeTime columns (NaN for symbols with no quote younger than
+            `max_age`, including those whose batch request failed)
+        """
+        symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        max_age = self.quote_ttl if max_age is None else max_age
+        now = time.monotonic()
+
+        with self._quote_lock:
+            stale = [symbol for symbol in symbols
+                     if symbol not in self._quote_cache or now - self._quote_cache[symbol][0] > max_age]
+
+        batches = [stale[i:i + QUOTE_BATCH_SIZE] for i in range(0, len(stale), QUOTE_BATCH_SIZE)]
+        if batches:
+            url = f"{http_client.API_BASE_URL}/marketdata/v1/quotes"
+            headers = self._get_auth_headers()
+            futures = [
+                self.scheduler.submit("quotes", http_client.get, url, headers=headers,
+                                      params={"symbols": ",".join(batch), "fields": "quote"})
+                for batch in batches
+            ]
+
+            for batch, future in zip(batches, futures):
+                try:
+                    response = future.result()
+                    if response.status_code != 200:
+                        print(f"Failed to retrieve quotes for {len(batch)} symbols: {response.status_code}, {response.text}")
+                        continue
+                    rows = dict(self._parse_quotes(response.json()))
+                except Exception as e:
+                    print(f"Error retrieving quotes for {len(batch)} symbols: {str(e)}")
+                    continue
+
+                fetched_at = time.monotonic()
+                with self._quote_lock:
+                    for symbol, row in rows.items():
+                        self._quote_cache[symbol.upper()] = (fetched_at, row)
+
+        # A failed batch leaves its symbols' old entries in place; never serve
+        # those as if fresh, report them as missing instead
+        missing = (None,) * len(QUOTE_FIELDS)
+        with self._quote_lock:
+            rows = [self._quote_cache[symbol][1]
+                    if symbol in self._quote_cache and now - self._quote_cache[symbol][0] <= max_age else missing
+                    for symbol in symbols]
+
+        quotes = pd.DataFrame(rows, index=pd.Index(symbols, name="symbol"), columns=QUOTE_COLUMNS)
+        return quotes.astype({"lastPrice": float, "bidPrice": float, "askPrice": float, "lastTradeTime": "Int64"})
 
     def get_quote(self, symbol: str) -> Dict[str, Any]:
         
@@ -181,31 +557,15 @@ class HistoricalDataHandler:
         Returns:
             Dictionary containing quote information
         """
-        url = f"https://api.schwabapi.com/marketdata/v1/quotes?symbols={symbol}"
-        headers = self._get_auth_headers()
-        
-        try:
-            response = requests.get(url, headers=headers)
-            
-            if response.status_code == 200:
-                quote_data = response.json()
-                
-                if 'quotes' in quote_data and quote_data['quotes']:
-                    quote = quote_data['quotes'][0]
-                    return {
-                        "symbol": quote.get('symbol'),
-                        "lastPrice": quote.get('lastPrice'),
-                        "askPrice": quote.get('askPrice'),
-                        "bidPrice": quote.get('bidPrice'),
-                        "lastTradeTime": quote.get('tradeTime')
-                    }
-                else:
-                    return {"error": "No quote data found"}
-            else:
-                error_message = f"Failed to retrieve quote: {response.status_code}, {response.text}"
-                print(error_message)
-                return {"error": error_message}
-        except Exception as e:
-            error_message = f"Error retrieving quote: {str(e)}"
-            print(error_message)
-            return {"error": error_message}
+        quotes = self.get_quotes([symbol])
+        if quotes[["lastPrice", "bidPrice", "askPrice"]].isna().all(axis=None):
+            return {"error": "No quote data found"}
+
+        quote = quotes.reset_index().to_dict("records")[0]
+        return {
+            "symbol": quote["symbol"],
+            "lastPrice": quote["lastPrice"],
+            "askPrice": quote["askPrice"],
+            "bidPrice": quote["bidPrice"],
+            "lastTradeTime": quote["lastTradeTime"]
+        }
@@ -0,0 +1,98 @@
+#http_client.py
+
+"""
+Shared pooled HTTP client for the Schwab API handlers.
+
+All handlers send requests through one requests.Session so TCP/TLS
+connections are kept alive and reused instead of being re-established for
+every call. Every request gets a default timeout unless the caller passes one.
+
+API_BASE_URL can be pointed at a local stub server (or set through the
+SCHWAB_API_BASE_URL environment variable) for testing and benchmarking.
+"""
+
+import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+API_BASE_URL = os.environ.get("SCHWAB_API_BASE_URL", "https://api.schwabapi.com")
+
+DEFAULT_POOL_SIZE = 20
+DEFAULT_TIMEOUT = (5, 30)  # (connect, read) seconds
+
+_session = None
+_session_lock = threading.Lock()
+_pool_size = DEFAULT_POOL_SIZE
+_timeout = DEFAULT_TIMEOUT
+
+
+def _build_session(pool_size):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def configure(pool_size=None, timeout=None, base_url=None):
+    """
+    Configure the shared client. Rebuilds the session if the pool size changes.
+
+    Args:
+        pool_size (int): Maximum pooled connections per host.
+        timeout (float or tuple): Default timeout, seconds or (connect, read).
+        base_url (str): API base URL, e.g. a local stub server.
+    """
+    global _session, _pool_size, _timeout, API_BASE_URL
+    with _session_lock:
+        if timeout is not None:
+            _timeout = timeout
+        if base_url is not None:
+            API_BASE_URL = base_url.rstrip("/")
+        if pool_size is not None and pool_size != _pool_size:
+            _pool_size = pool_size
+            if _session is not None:
+                _session.close()
+                _session = None
+
+
+def get_session():
+    """Return the process-wide pooled session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session(_pool_size)
+    return _session
+
+
+def close():
+    """Close all pooled connections."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def request(method, url, **kwargs):
+    """Send a request through the pooled session with the default timeout."""
+    kwargs.setdefault("timeout", _timeout)
+    return get_session().request(method, url, **kwargs)
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
+
+
+def put(url, **kwargs):
+    return request("PUT", url, **kwargs)
+
+
+def delete(url, **kwargs):
+    return request("DELETE", url, **kwargs)
@@ -0,0 +1,212 @@
+#mock_broker.py
+
+"""
+Local mock of the Schwab trader order endpoints for tests and benchmarks.
+
+Serves the subset of the trader API that OrderHandler uses:
+    GET    /trader/v1/accounts/accountNumbers
+    POST   /trader/v1/accounts/{hash}/orders            -> 201 + Location
+    GET    /trader/v1/accounts/{hash}/orders[?status=]   -> list of orders
+    GET    /trader/v1/accounts/{hash}/orders/{id}
+    PUT    /trader/v1/accounts/{hash}/orders/{id}
+    DELETE /trader/v1/accounts/{hash}/orders/{id}
+
+Orders are kept in memory and start WORKING. Tests move them along with
+fill_order() / set_status(), or let fill_after_polls fill them after a
+number of order-list polls. Point http_client at it with
+http_client.configure(base_url=broker.base_url).
+"""
+
+import itertools
+import json
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+MOCK_ACCOUNT_HASH = "MOCKHASH"
+MOCK_ACCOUNT_NUMBER = "12345678"
+
+_ORDERS_PATH = re.compile(r"^/trader/v1/accounts/([^/]+)/orders(?:/(\d+))?$")
+
+
+def _order_quantity(payload):
+    legs = payload.get("orderLegCollection") or []
+    return sum(leg.get("quantity", 0) for leg in legs)
+
+
+class MockBroker:
+    def __init__(self, latency=0.0, fill_after_polls=None, host="127.0.0.1", port=0):
+        """
+        Initialize the mock broker.
+
+        Args:
+            latency (float): Seconds added to every response.
+            fill_after_polls (int): Fill WORKING orders after this many order
+                list requests (None = only fill through fill_order()).
+            host (str): Interface to listen on.
+            port (int): Port to listen on (0 picks a free port).
+        """
+        self.latency = latency
+        self.fill_after_polls = fill_after_polls
+        self.orders = {}
+        self.request_counts = {}
+        self._ids = itertools.count(1000)
+        self._lock = threading.Lock()
+        self._list_polls = 0
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def set_status(self, order_id, status):
+        with self._lock:
+            self.orders[str(order_id)]["status"] = status
+
+    def fill_order(self, order_id, quantity=None, price=None):
+        """Fill an order (partially if quantity is less than what remains)."""
+        with self._lock:
+            order = self.orders[str(order_id)]
+            remaining = order["remainingQuantity"]
+            filled = remaining if quantity is None else min(quantity, remaining)
+            order["filledQuantity"] += filled
+            order["remainingQuantity"] -= filled
+            if price is not None:
+                order["price"] = price
+            order["status"] = "FILLED" if order["remainingQuantity"] == 0 else "WORKING"
+            order["closeTime"] = datetime.now(timezone.utc).isoformat() if order["status"] == "FILLED" else None
+
+    def _count(self, key):
+        with self._lock:
+            self.request_counts[key] = self.request_counts.get(key, 0) + 1
+
+    def _create_order(self, account_hash, payload):
+        order_id = str(next(self._ids))
+        quantity = _order_quantity(payload)
+        order = dict(payload)
+        order.update({
+            "orderId": int(order_id),
+            "accountNumber": account_hash,
+            "status": "WORKING",
+            "quantity": quantity,
+            "filledQuantity": 0,
+            "remainingQuantity": quantity,
+            "enteredTime": datetime.now(timezone.utc).isoformat(),
+            "closeTime": None,
+        })
+        with self._lock:
+            self.orders[order_id] = order
+        return order_id
+
+    def _list_orders(self, status):
+        with self._lock:
+            self._list_polls += 1
+            if self.fill_after_polls is not None and self._list_polls % self.fill_after_polls == 0:
+                for order in self.orders.values():
+                    if order["status"] == "WORKING":
+                        order["filledQuantity"] += order["remainingQuantity"]
+                        order["remainingQuantity"] = 0
+                        order["status"] = "FILLED"
+                        order["closeTime"] = datetime.now(timezone.utc).isoformat()
+            return [dict(order) for order in self.orders.values() if status is None or order["status"] == status]
+
+    def _handler_class(self):
+        broker = self
+
+        class MockBrokerHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def _reply(self, status, body=None, headers=None):
+                if broker.latency:
+                    time.sleep(broker.latency)
+                data = json.dumps(body).encode() if body is not None else b""
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                if body is not None:
+                    self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _read_json(self):
+                length = int(self.headers.get("Content-Length", 0))
+                return json.loads(self.rfile.read(length) or b"{}")
+
+            def _route(self):
+                path, _, query = self.path.partition("?")
+                params = dict(part.split("=", 1) for part in query.split("&") if "=" in part)
+                return path, params, _ORDERS_PATH.match(path)
+
+            def do_GET(self):
+                path, params, match = self._route()
+                if path == "/trader/v1/accounts/accountNumbers":
+                    broker._count("accountNumbers")
+                    self._reply(200, [{"accountNumber": MOCK_ACCOUNT_NUMBER, "hashValue": MOCK_ACCOUNT_HASH}])
+                elif match and match.group(2):
+                    broker._count("get_order")
+                    order = broker.orders.get(match.group(2))
+                    if order:
+                        self._reply(200, order)
+                    else:
+                        self._reply(404, {"message": "Order not found"})
+                elif match:
+                    broker._count("list_orders")
+                    self._reply(200, broker._list_orders(params.get("status")))
+                else:
+                    self._reply(404, {"message": "Not found"})
+
+            def do_POST(self):
+                path, _, match = self._route()
+                payload = self._read_json()
+                if not match or match.group(2):
+                    self._reply(404, {"message": "Not found"})
+                    return
+                broker._count("place_order")
+                order_id = broker._create_order(match.group(1), payload)
+                self._reply(201, headers={"Location": f"{path}/{order_id}"})
+
+            def do_PUT(self):
+                _, _, match = self._route()
+                payload = self._read_json()
+                if not match or match.group(2) not in broker.orders:
+                    self._reply(404, {"message": "Order not found"})
+                    return
+                broker._count("replace_order")
+                broker.set_status(match.group(2), "REPLACED")
+                order_id = broker._create_order(match.group(1), payload)
+                self._reply(201, headers={"Location": f"/trader/v1/accounts/{match.group(1)}/orders/{order_id}"})
+
+            def do_DELETE(self):
+                _, _, match = self._route()
+                if not match or match.group(2) not in broker.orders:
+                    self._reply(404, {"message": "Order not found"})
+                    return
+                broker._count("cancel_order")
+                broker.set_status(match.group(2), "CANCELED")
+                self._reply(200)
+
+            def log_message(self, format, *args):
+                pass
+
+        return MockBrokerHandler
@@ -9,13 +9,33 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Tuple, Union, Any
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import logging
 import requests
 import json
 import sys
 import os
+import time
 sys.path.append(os.path.dirname(__file__))
 import connection_manager
+import http_client
+from order_journal import OrderJournal, ORDER_JOURNAL_CAPACITY
+from order_templates import ORDER_ACTIONS, ORDER_TEMPLATES, OrderTemplate, validate_quantities
+
+# Closing instruction for each position-opening instruction
+EXIT_INSTRUCTIONS = {"BUY": "SELL", "SELL_SHORT": "BUY_TO_COVER"}
+
+# Order spec "order_type" -> OrderHandler method used by place_orders_batch
+BATCH_ORDER_METHODS = {
+    "market": "place_market_order",
+    "limit": "place_limit_order",
+    "stop": "place_stop_order",
+    "stop_limit": "place_stop_limit_order",
+    "trailing_stop": "place_trailing_stop_order",
+    "oco": "place_oco_order",
+    "bracket": "place_bracket_order",
+}
+DEFAULT_BATCH_WORKERS = 8
 
 class OrderHandler:
     """
@@ -24,11 +44,16 @@ class OrderHandler:
     Makes actual API requests to Charles Schwab.
     """
     
-    def __init__(self):
+    def __init__(self, journal_capacity: int = ORDER_JOURNAL_CAPACITY, journal_path: str = None):
         """
         Initialize the order handler with Schwab API integration.
+        
+        Args:
+            journal_capacity: Submitted orders kept in memory by the order journal
+            journal_path: SQLite file the order journal writes every order to
+                (None keeps the journal in memory only)
         """
-        self.order_history = []
+        self.order_history = OrderJournal(capacity=journal_capacity, spill_path=journal_path)
         
         # Get valid tokens and account info using connection manager
         self.tokens = connection_manager.ensure_valid_tokens()
@@ -50,6 +75,8 @@ class OrderHandler:
 
     def _get_auth_headers(self):
         """Get authorization headers for API requests."""
+        # Served from the in-memory token cache, so this is cheap per request
+        self.tokens = connection_manager.ensure_valid_tokens()
         return {
             "Authorization": f"Bearer {self.tokens['access_token']}",
             "Accept": "application/json"
@@ -67,10 +94,10 @@ class OrderHandler:
         
         if not self.account_number:
             # Get accounts linked to the user
-            accounts_url = "https://api.schwabapi.com/trader/v1/accounts"
+            accounts_url = f"{http_client.API_BASE_URL}/trader/v1/accounts"
             headers = self._get_auth_headers()
             
-            response = requests.get(accounts_url, headers=headers)
+            response = http_client.get(accounts_url, headers=headers)
             
             if response.status_code == 200:
                 accounts = response.json()
@@ -85,10 +112,10 @@ class OrderHandler:
                 return {}
         
         # Get account details
-        account_url = f"https://api.schwabapi.com/trader/v1/accounts/{self.account_number}"
+        account_url = f"{http_client.API_BASE_URL}/trader/v1/accounts/{self.account_number}"
         headers = self._get_auth_headers()
         
-        response = requests.get(account_url, headers=headers, 
+        response = http_client.get(account_url, headers=headers, 
                               params={"fields": "positions"})
         
         if response.status_code == 200:
@@ -114,110 +141,7 @@ class OrderHandler:
         Returns:
             Order execution result
         """
-        if timestamp is None:
-            timestamp = datetime.now()
-            
-        # Validate action type
-        valid_actions = ["BUY", "SELL", "SELL_SHORT", "BUY_TO_COVER"]
-        if action_type not in valid_actions:
-            return {
-                'status': 'rejected',
-                'reason': f'Invalid action type: {action_type}. Must be one of {valid_actions}',
-                'timestamp': timestamp
-            }
-        
-        self.logger.info(f"Attempting to place {action_type} market order for {shares} shares of {symbol}")
-        
-        try:
-            if shares <= 0:
-                return {
-                    'status': 'rejected',
-                    'reason': 'Invalid share quantity',
-                    'timestamp': timestamp
-                }
-            
-            # Create order payload for Schwab API - aligned with API documentation
-            order_payload = {
-                "orderType": "MARKET",
-                "session": "NORMAL",
-                "duration": "DAY",
-                "orderStrategyType": "SINGLE",
-                "orderLegCollection": [
-                    {
-                        "instruction": action_type,
-                        "quantity": shares,
-                        "instrument": {
-                            "symbol": symbol,
-                            "assetType": "EQUITY"
-                        }
-                    }
-                ]
-            }
-            
-            # Make API request to Schwab
-            url = f"https://api.schwabapi.com/trader/v1/accounts/{self.account_number}/orders"
-            headers = {
-                "Authorization": f"Bearer {self.tokens['access_token']}",
-                "Content-Type": "application/json",
-                "Accept": "application/json"
-            }
-            
-            response = requests.post(url, json=order_payload, headers=headers)
-            
-            if response.status_code in [200, 201]:
-                order_id = response.headers.get('Location', '').split('/')[-1]
-                
-                # Calculate dollar amount if price provided
-                if current_price is not None:
-                    dollar_amount = shares * current_price
-                    price_info = f" at ${current_price:.2f}"
-                else:
-                    dollar_amount = None
-                    price_info = " at market price"
-                
-                # Record successful order
-                order_record = {
-                    'timestamp': timestamp,
-                    'symbol': symbol,
-                    'action_type': action_type,
-                    'order_type': 'market',
-                    'shares': shares,
-                    'price': current_price,
-                    'dollar_amount': dollar_amount,
-                    'order_id': order_id,
-                    'status': 'submitted'
-                }
-                
-                self.order_history.append(order_record)
-                
-                self.logger.info(f"{action_type} market order submitted: {shares} shares of {symbol}{price_info}, Order ID: {order_id}")
-                
-                return {
-                    'status': 'submitted',
-                    'symbol': symbol,
-                    'action_type': action_type,
-                    'shares': shares,
-                    'fill_price': current_price,
-                    'dollar_amount': dollar_amount,
-                    'order_id': order_id,
-                    'timestamp': timestamp
-                }
-            else:
-                error_msg = f"Failed to place order: {response.status_code} - {response.text}"
-                self.logger.error(error_msg)
-                return {
-                    'status': 'rejected',
-                    'reason': error_msg,
-                    'timestamp': timestamp
-                }
-            
-        except Exception as e:
-            self.logger.error(f"Error executing {action_type} market order: {str(e)}")
-            return {
-                'status': 'error',
-                'reason': str(e),
-                'timestamp': timestamp
-            }
+        return self._place_order("market", action_type, symbol, shares, timestamp, current_price=current_price)
     
     def place_limit_order(self, action_type: str, symbol: str, shares: int,
                          limit_price: float, timestamp: datetime = None) -> Dict:
@@ -234,127 +158,27 @@ class OrderHandler:
         Returns:
             Order placement result
         """
-        if timestamp is None:
-            timestamp = datetime.now()
-            
-        # Validate action type
-        valid_actions = ["BUY", "SELL", "SELL_SHORT", "BUY_TO_COVER"]
-        if action_type not in valid_actions:
-            return {
-                'status': 'rejected',
-                'reason': f'Invalid action type: {action_type}. Must be one of {valid_actions}',
-                'timestamp': timestamp
-            }
-        
-        self.logger.info(f"Attempting to place {action_type} limit order for {shares} shares of {symbol} @ ${limit_price:.2f}")
-        
-        try:
-            if shares <= 0:
-                return {
-                    'status': 'rejected',
-                    'reason': 'Invalid share quantity',
-                    'timestamp': timestamp
-                }
-            
-            # Create order payload for Schwab API - aligned with API documentation
-            order_payload = {
-                "orderType": "LIMIT",
-                "session": "SEAMLESS",  # SEAMLESS for after hours
-                "price": str(limit_price),  # Price must be a string in API
-                "duration": "GOOD_TILL_CANCEL",  # GTC keeps the order active until filled or cancelled
-                "orderStrategyType": "SINGLE",
-                "orderLegCollection": [
-                    {
-                        "instruction": action_type,
-                        "quantity": shares,
-                        "instrument": {
-                            "symbol": symbol,
-                            "assetType": "EQUITY"
-                        }
-                    }
-                ]
-            }
-            
-            # Make API request to Schwab
-            url = f"https://api.schwabapi.com/trader/v1/accounts/{self.account_number}/orders"
-            headers = {
-                "Authorization": f"Bearer {self.tokens['access_token']}",
-                "Content-Type": "application/json",
-                "Accept": "application/json"
-            }
-            
-            response = requests.post(url, json=order_payload, headers=headers)
-            
-            if response.status_code in [200, 201]:
-                order_id = response.headers.get('Location', '').split('/')[-1]
-                
-                # Calculate dollar amount
-                dollar_amount = shares * limit_price
-                
-                # Record successful order
-                order_record = {
-                    'timestamp': timestamp,
-                    'symbol': symbol,
-                    'action_type': action_type,
-                    'order_type': 'limit',
-                    'shares': shares,
-                    'limit_price': limit_price,
-                    'dollar_amount': dollar_amount,
-                    'order_id': order_id,
-                    'status': 'submitted'
-                }
-                
-                self.order_history.append(order_record)
-                
-                self.logger.info(f"{action_type} limit order submitted: {shares} shares of {symbol} at ${limit_price:.2f}, Order ID: {order_id}")
-                
-                return {
-                    'status': 'submitted',
-                    'symbol': symbol,
-                    'action_type': action_type,
-                    'order_type': 'limit',
-                    'shares': shares,
-                    'limit_price': limit_price,
-                    'dollar_amount': dollar_amount,
-                    'order_id': order_id,
-                    'timestamp': timestamp
-                }
-            else:
-                error_msg = f"Failed to place limit order: {response.status_code} - {response.text}"
-                self.logger.error(error_msg)
-                return {
-                    'status': 'rejected',
-                    'reason': error_msg,
-                    'timestamp': timestamp
-                }
-            
-        except Exception as e:
-            self.logger.error(f"Error placing {action_type} limit order: {str(e)}")
-            return {
-                'status': 'error',
-                'reason': str(e),
-                'timestamp': timestamp
-            }
+        return self._place_order("limit", action_type, symbol, shares, timestamp, limit_price=limit_price)
     
     def buy_market(self, symbol: str, shares: float = None,
                    timestamp: datetime = None) -> Dict:
         """Convenience method for BUY market orders."""
-        return self.place_market_order("BUY", symbol, shares, timestamp)
+        return self.place_market_order("BUY", symbol, shares, timestamp=timestamp)
     
     def sell_market(self, symbol: str, shares: float = None,
                     timestamp: datetime = None) -> Dict:
         """Convenience method for SELL market orders."""
-        return self.place_market_order("SELL", symbol, shares,timestamp)
+        return self.place_market_order("SELL", symbol, shares, timestamp=timestamp)
     
     def sell_short_market(self, symbol: str, shares:float = None,
                          timestamp: datetime = None) -> Dict:
         """Convenience method for SELL_SHORT market orders."""
-        return self.place_market_order("SELL_SHORT", symbol, shares, timestamp)
+        return self.place_market_order("SELL_SHORT", symbol, shares, timestamp=timestamp)
     
     def buy_to_cover_market(self, symbol: str, shares: float = None,
                            timestamp: datetime = None) -> Dict:
         """Convenience method for BUY_TO_COVER market orders."""
-        return self.place_market_order("BUY_TO_COVER", symbol, shares, timestamp)
+        return self.place_market_order("BUY_TO_COVER", symbol, shares, timestamp=timestamp)
     
     def buy_limit(self, symbol: str, shares: int, limit_price: float,
                   timestamp: datetime = None) -> Dict:
@@ -388,117 +212,175 @@ class OrderHandler:
             stop_price: Stop price for the order
             timestamp: Order timestamp
             
+        Returns:
+            Order placement result
+        """
+        return self._place_order("stop", action_type, symbol, shares, timestamp, stop_price=stop_price)
+    
+    def place_stop_limit_order(self, action_type: str, symbol: str, shares: int,
+                              stop_price: float, limit_price: float, timestamp: datetime = None) -> Dict:
+        """
+        Place a stop-limit order using Schwab API.
+        
+        Args:
+            action_type: Order action ("BUY", "SELL", "SELL_SHORT", "BUY_TO_COVER")
+            symbol: Stock symbol
+            shares: Number of shares
+            stop_price: Stop price for the order
+            limit_price: Limit price for the order
+            timestamp: Order timestamp
+            
+        Returns:
+            Order placement result
+        """
+        return self._place_order("stop_limit", action_type, symbol, shares, timestamp,
+                                 stop_price=stop_price, limit_price=limit_price)
+    
+    def place_trailing_stop_order(self, action_type: str, symbol: str, shares: int,
+                                 stop_price_offset: float, timestamp: datetime = None) -> Dict:
+        """
+        Place a trailing stop order using Schwab API.
+        
+        Args:
+            action_type: Order action ("BUY", "SELL", "SELL_SHORT", "BUY_TO_COVER")
+            symbol: Stock symbol
+            shares: Number of shares
+            stop_price_offset: Dollar amount for trailing stop offset
+            timestamp: Order timestamp
+            
+        Returns:
+            Order placement result
+        """
+        return self._place_order("trailing_stop", action_type, symbol, shares, timestamp,
+                                 stop_price_offset=stop_price_offset)
+    
+    def _place_order(self, order_type: str, action_type: str, symbol: str, shares: int,
+                     timestamp: datetime = None, **prices) -> Dict:
+        """
+        Validate, build and submit a single-leg order from its template.
+        
+        Args:
+            order_type: Key of ORDER_TEMPLATES
+            action_type: Order action ("BUY", "SELL", "SELL_SHORT", "BUY_TO_COVER")
+            symbol: Stock symbol
+            shares: Number of shares
+            timestamp: Order timestamp
+            **prices: Price arguments of the template (e.g. limit_price)
+            
         Returns:
             Order placement result
         """
         if timestamp is None:
             timestamp = datetime.now()
-            
-        # Validate action type
-        valid_actions = ["BUY", "SELL", "SELL_SHORT", "BUY_TO_COVER"]
-        if action_type not in valid_actions:
+        
+        template = ORDER_TEMPLATES[order_type]
+        reason = template.validate(action_type, shares, prices)
+        if reason is not None:
             return {
                 'status': 'rejected',
-                'reason': f'Invalid action type: {action_type}. Must be one of {valid_actions}',
+                'reason': reason,
                 'timestamp': timestamp
             }
         
-        self.logger.info(f"Attempting to place {action_type} stop order for {shares} shares of {symbol} @ ${stop_price:.2f}")
+        description = f"{action_type} {template.label} order for {shares} shares of {symbol}{template.describe(prices)}"
+        self.logger.info(f"Attempting to place {description}")
         
         try:
-            if shares <= 0:
-                return {
-                    'status': 'rejected',
-                    'reason': 'Invalid share quantity',
-                    'timestamp': timestamp
-                }
-            
-            # Create order payload for Schwab API - aligned with API documentation
-            order_payload = {
-                "orderType": "STOP",
-                "session": "NORMAL",
-                "stopPrice": str(stop_price),  # Stop price must be a string in API
-                "duration": "DAY",
-                "orderStrategyType": "SINGLE",
-                "orderLegCollection": [
-                    {
-                        "instruction": action_type,
-                        "quantity": shares,
-                        "instrument": {
-                            "symbol": symbol,
-                            "assetType": "EQUITY"
-                        }
-                    }
-                ]
-            }
-            
-            # Make API request to Schwab
-            url = f"https://api.schwabapi.com/trader/v1/accounts/{self.account_number}/orders"
-            headers = {
-                "Authorization": f"Bearer {self.tokens['access_token']}",
-                "Content-Type": "application/json",
-                "Accept": "application/json"
-            }
-            
-            response = requests.post(url, json=order_payload, headers=headers)
-            
-            if response.status_code in [200, 201]:
-                order_id = response.headers.get('Location', '').split('/')[-1]
-                
-                # Record successful order
-                order_record = {
-                    'timestamp': timestamp,
-                    'symbol': symbol,
-                    'action_type': action_type,
-                    'order_type': 'stop',
-                    'shares': shares,
-                    'stop_price': stop_price,
-                    'order_id': order_id,
-                    'status': 'submitted'
-                }
-                
-                self.order_history.append(order_record)
-                
-                self.logger.info(f"{action_type} stop order submitted: {shares} shares of {symbol} at ${stop_price:.2f}, Order ID: {order_id}")
-                
-                return {
-                    'status': 'submitted',
-                    'symbol': symbol,
-                    'action_type': action_type,
-                    'order_type': 'stop',
-                    'shares': shares,
-                    'stop_price': stop_price,
-                    'order_id': order_id,
-                    'timestamp': timestamp
-                }
-            else:
-                error_msg = f"Failed to place stop order: {response.status_code} - {response.text}"
-                self.logger.error(error_msg)
-                return {
-                    'status': 'rejected',
-                    'reason': error_msg,
-                    'timestamp': timestamp
-                }
-            
+            return self._submit_order(template.body(action_type, symbol, shares, prices),
+                                      template.record(action_type, symbol, shares, prices),
+                                      description, timestamp)
         except Exception as e:
-            self.logger.error(f"Error placing {action_type} stop order: {str(e)}")
+            self.logger.error(f"Error placing {action_type} {template.label} order: {str(e)}")
             return {
                 'status': 'error',
                 'reason': str(e),
                 'timestamp': timestamp
             }
     
-    def place_stop_limit_order(self, action_type: str, symbol: str, shares: int,
-                              stop_price: float, limit_price: float, timestamp: datetime = None) -> Dict:
+    def _submit_order(self, order_payload: Dict[str, Any], order_record: Dict[str, Any],
+                      description: str, timestamp: datetime) -> Dict:
         """
-        Place a stop-limit order using Schwab API.
+        POST an order payload, record it in the order history and build the result.
+
+        Args:
+            order_payload: Order in Schwab API format, as a dict or pre-encoded JSON bytes
+            order_record: Order fields for the history and result (order_id and
+                status are added)
+            description: Human-readable order description for logs
+            timestamp: Order timestamp
+            
+        Returns:
+            Order placement result including the request latency
+        """
+        url = f"{http_client.API_BASE_URL}/trader/v1/accounts/{self.account_number}/orders"
+        headers = self._get_auth_headers()
+        headers["Content-Type"] = "application/json"
+        body = {"data": order_payload} if isinstance(order_payload, bytes) else {"json": order_payload}
+        
+        start = time.perf_counter()
+        response = http_client.post(url, headers=headers, **body)
+        latency_ms = (time.perf_counter() - start) * 1000
+        
+        if response.status_code in [200, 201]:
+            order_id = response.headers.get('Location', '').split('/')[-1]
+            order_record = dict(order_record, timestamp=timestamp, order_id=order_id, status='submitted')
+            self.order_history.append(order_record)
+            
+            self.logger.info(f"{description} submitted, Order ID: {order_id}")
+            return dict(order_record, latency_ms=latency_ms)
+        
+        error_msg = f"Failed to place {order_record['order_type']} order: {response.status_code} - {response.text}"
+        self.logger.error(error_msg)
+        return {
+            'status': 'rejected',
+            'reason': error_msg,
+            'latency_ms': latency_ms,
+            'timestamp': timestamp
+        }
+    
+    @staticmethod
+    def _exit_leg_strategy(order_type: str, instruction: str, symbol: str, shares: int,
+                           price_field: str, price: float) -> Dict[str, Any]:
+        """Single-leg GTC exit order used inside OCO and bracket orders"""
+        return {
+            "orderType": order_type,
+            "session": "NORMAL",
+            price_field: str(price),
+            "duration": "GOOD_TILL_CANCEL",
+            "orderStrategyType": "SINGLE",
+            "orderLegCollection": [
+                {
+                    "instruction": instruction,
+                    "quantity": shares,
+                    "instrument": {
+                        "symbol": symbol,
+                        "assetType": "EQUITY"
+                    }
+                }
+            ]
+        }
+    
+    def _oco_payload(self, exit_action: str, symbol: str, shares: int,
+                     target_price: float, stop_price: float) -> Dict[str, Any]:
+        return {
+            "orderStrategyType": "OCO",
+            "childOrderStrategies": [
+                self._exit_leg_strategy("LIMIT", exit_action, symbol, shares, "price", target_price),
+                self._exit_leg_strategy("STOP", exit_action, symbol, shares, "stopPrice", stop_price)
+            ]
+        }
+    
+    def place_oco_order(self, action_type: str, symbol: str, shares: int, target_price: float,
+                        stop_price: float, timestamp: datetime = None) -> Dict:
+        """
+        Place a one-cancels-other exit: a limit at the target and a stop at the stop price.
         
         Args:
-            action_type: Order action ("BUY", "SELL", "SELL_SHORT", "BUY_TO_COVER")
+            action_type: Exit action ("SELL" for longs, "BUY_TO_COVER" for shorts)
             symbol: Stock symbol
             shares: Number of shares
-            stop_price: Stop price for the order
-            limit_price: Limit price for the order
+            target_price: Limit price of the profit-taking leg
+            stop_price: Stop price of the protective leg
             timestamp: Order timestamp
             
         Returns:
@@ -506,114 +388,55 @@ class OrderHandler:
         """
         if timestamp is None:
             timestamp = datetime.now()
-            
-        # Validate action type
-        valid_actions = ["BUY", "SELL", "SELL_SHORT", "BUY_TO_COVER"]
-        if action_type not in valid_actions:
+        
+        if action_type not in EXIT_INSTRUCTIONS.values():
             return {
                 'status': 'rejected',
-                'reason': f'Invalid action type: {action_type}. Must be one of {valid_actions}',
+                'reason': f'Invalid OCO action type: {action_type}. Must be one of {list(EXIT_INSTRUCTIONS.values())}',
+                'timestamp': timestamp
+            }
+        reason = validate_quantities(shares, {'target_price': target_price, 'stop_price': stop_price})
+        if reason:
+            return {'status': 'rejected', 'reason': reason, 'timestamp': timestamp}
+        if (action_type == "SELL") != (target_price > stop_price):
+            return {
+                'status': 'rejected',
+                'reason': f'Target ${target_price:.2f} and stop ${stop_price:.2f} are on the wrong sides for {action_type}',
                 'timestamp': timestamp
             }
-        
-        self.logger.info(f"Attempting to place {action_type} stop-limit order for {shares} shares of {symbol} stop @ ${stop_price:.2f}, limit @ ${limit_price:.2f}")
         
         try:
-            if shares <= 0:
-                return {
-                    'status': 'rejected',
-                    'reason': 'Invalid share quantity',
-                    'timestamp': timestamp
-                }
-            
-            # Create order payload for Schwab API - aligned with API documentation
-            order_payload = {
-                "orderType": "STOP_LIMIT",
-                "session": "NORMAL",
-                "price": str(limit_price),  # Limit price must be a string in API
-                "stopPrice": str(stop_price),  # Stop price must be a string in API
-                "duration": "DAY",
-                "orderStrategyType": "SINGLE",
-                "orderLegCollection": [
-                    {
-                        "instruction": action_type,
-                        "quantity": shares,
-                        "instrument": {
-                            "symbol": symbol,
-                            "assetType": "EQUITY"
-                        }
-                    }
-                ]
-            }
-            
-            # Make API request to Schwab
-            url = f"https://api.schwabapi.com/trader/v1/accounts/{self.account_number}/orders"
-            headers = {
-                "Authorization": f"Bearer {self.tokens['access_token']}",
-                "Content-Type": "application/json",
-                "Accept": "application/json"
-            }
-            
-            response = requests.post(url, json=order_payload, headers=headers)
-            
-            if response.status_code in [200, 201]:
-                order_id = response.headers.get('Location', '').split('/')[-1]
-                
-                # Record successful order
-                order_record = {
-                    'timestamp': timestamp,
-                    'symbol': symbol,
-                    'action_type': action_type,
-                    'order_type': 'stop_limit',
-                    'shares': shares,
-                    'stop_price': stop_price,
-                    'limit_price': limit_price,
-                    'order_id': order_id,
-                    'status': 'submitted'
-                }
-                
-                self.order_history.append(order_record)
-                
-                self.logger.info(f"{action_type} stop-limit order submitted: {shares} shares of {symbol} stop @ ${stop_price:.2f}, limit @ ${limit_price:.2f}, Order ID: {order_id}")
-                
-                return {
-                    'status': 'submitted',
+            return self._submit_order(
+                self._oco_payload(action_type, symbol, shares, target_price, stop_price),
+                {
                     'symbol': symbol,
                     'action_type': action_type,
-                    'order_type': 'stop_limit',
+                    'order_type': 'oco',
                     'shares': shares,
-                    'stop_price': stop_price,
-                    'limit_price': limit_price,
-                    'order_id': order_id,
-                    'timestamp': timestamp
-                }
-            else:
-                error_msg = f"Failed to place stop-limit order: {response.status_code} - {response.text}"
-                self.logger.error(error_msg)
-                return {
-                    'status': 'rejected',
-                    'reason': error_msg,
-                    'timestamp': timestamp
-                }
-            
+                    'limit_price': target_price,
+                    'stop_price': stop_price
+                },
+                f"{action_type} OCO order: {shares} shares of {symbol} target @ ${target_price:.2f}, stop @ ${stop_price:.2f}",
+                timestamp
+            )
         except Exception as e:
-            self.logger.error(f"Error placing {action_type} stop-limit order: {str(e)}")
-            return {
-                'status': 'error',
-                'reason': str(e),
-                'timestamp': timestamp
-            }
+            self.logger.error(f"Error placing {action_type} OCO order: {str(e)}")
+            return {'status': 'error', 'reason': str(e), 'timestamp': timestamp}
     
-    def place_trailing_stop_order(self, action_type: str, symbol: str, shares: int,
-                                 stop_price_offset: float, timestamp: datetime = None) -> Dict:
+    def place_bracket_order(self, action_type: str, symbol: str, shares: int, target_price: float,
+                            stop_price: float, entry_price: float = None, timestamp: datetime = None) -> Dict:
         """
-        Place a trailing stop order using Schwab API.
+        Place an entry with an attached OCO exit (target limit + protective stop) in one request.
+        
+        Uses a TRIGGER strategy: the OCO exit becomes active once the entry fills.
         
         Args:
-            action_type: Order action ("BUY", "SELL", "SELL_SHORT", "BUY_TO_COVER")
+            action_type: Entry action ("BUY" or "SELL_SHORT")
             symbol: Stock symbol
             shares: Number of shares
-            stop_price_offset: Dollar amount for trailing stop offset
+            target_price: Limit price of the profit-taking exit
+            stop_price: Stop price of the protective exit
+            entry_price: Limit price for the entry (None for a market entry)
             timestamp: Order timestamp
             
         Returns:
@@ -621,114 +444,130 @@ class OrderHandler:
         """
         if timestamp is None:
             timestamp = datetime.now()
-            
-        # Validate action type
-        valid_actions = ["BUY", "SELL", "SELL_SHORT", "BUY_TO_COVER"]
-        if action_type not in valid_actions:
+        
+        if action_type not in EXIT_INSTRUCTIONS:
             return {
                 'status': 'rejected',
-                'reason': f'Invalid action type: {action_type}. Must be one of {valid_actions}',
+                'reason': f'Invalid bracket action type: {action_type}. Must be one of {list(EXIT_INSTRUCTIONS)}',
+                'timestamp': timestamp
+            }
+        prices = {'target_price': target_price, 'stop_price': stop_price}
+        if entry_price is not None:
+            prices['entry_price'] = entry_price
+        reason = validate_quantities(shares, prices)
+        if reason:
+            return {'status': 'rejected', 'reason': reason, 'timestamp': timestamp}
+        
+        exit_action = EXIT_INSTRUCTIONS[action_type]
+        reference = entry_price if entry_price is not None else (stop_price + target_price) / 2
+        if action_type == "BUY":
+            bracketed = stop_price < reference < target_price
+        else:
+            bracketed = target_price < reference < stop_price
+        if not bracketed:
+            return {
+                'status': 'rejected',
+                'reason': f'Target ${target_price:.2f} and stop ${stop_price:.2f} must bracket the entry for {action_type}',
                 'timestamp': timestamp
             }
         
-        self.logger.info(f"Attempting to place {action_type} trailing stop order for {shares} shares of {symbol} with ${stop_price_offset:.2f} offset")
-        
-        try:
-            if shares <= 0:
-                return {
-                    'status': 'rejected',
-                    'reason': 'Invalid share quantity',
-                    'timestamp': timestamp
-                }
-            
-            # Create order payload for Schwab API - aligned with API documentation
-            order_payload = {
-                "orderType": "TRAILING_STOP",
-                "session": "NORMAL",
-                "stopPriceLinkBasis": "BID",
-                "stopPriceLinkType": "VALUE",
-                "stopPriceOffset": stop_price_offset,
-                "duration": "DAY",
-                "orderStrategyType": "SINGLE",
-                "orderLegCollection": [
-                    {
-                        "instruction": action_type,
-                        "quantity": shares,
-                        "instrument": {
-                            "symbol": symbol,
-                            "assetType": "EQUITY"
-                        }
+        order_payload = {
+            "orderType": "MARKET" if entry_price is None else "LIMIT",
+            "session": "NORMAL",
+            "duration": "DAY",
+            "orderStrategyType": "TRIGGER",
+            "orderLegCollection": [
+                {
+                    "instruction": action_type,
+                    "quantity": shares,
+                    "instrument": {
+                        "symbol": symbol,
+                        "assetType": "EQUITY"
                     }
-                ]
-            }
-            
-            # Make API request to Schwab
-            url = f"https://api.schwabapi.com/trader/v1/accounts/{self.account_number}/orders"
-            headers = {
-                "Authorization": f"Bearer {self.tokens['access_token']}",
-                "Content-Type": "application/json",
-                "Accept": "application/json"
-            }
-            
-            response = requests.post(url, json=order_payload, headers=headers)
-            
-            if response.status_code in [200, 201]:
-                order_id = response.headers.get('Location', '').split('/')[-1]
-                
-                # Record successful order
-                order_record = {
-                    'timestamp': timestamp,
-                    'symbol': symbol,
-                    'action_type': action_type,
-                    'order_type': 'trailing_stop',
-                    'shares': shares,
-                    'stop_price_offset': stop_price_offset,
-                    'order_id': order_id,
-                    'status': 'submitted'
                 }
-                
-                self.order_history.append(order_record)
-                
-                self.logger.info(f"{action_type} trailing stop order submitted: {shares} shares of {symbol} with ${stop_price_offset:.2f} offset, Order ID: {order_id}")
-                
-                return {
-                    'status': 'submitted',
+            ],
+            "childOrderStrategies": [
+                self._oco_payload(exit_action, symbol, shares, target_price, stop_price)
+            ]
+        }
+        if entry_price is not None:
+            order_payload["price"] = str(entry_price)
+        
+        entry_info = "market" if entry_price is None else f"${entry_price:.2f}"
+        try:
+            return self._submit_order(
+                order_payload,
+                {
                     'symbol': symbol,
                     'action_type': action_type,
-                    'order_type': 'trailing_stop',
+                    'order_type': 'bracket',
                     'shares': shares,
-                    'stop_price_offset': stop_price_offset,
-                    'order_id': order_id,
-                    'timestamp': timestamp
-                }
-            else:
-                error_msg = f"Failed to place trailing stop order: {response.status_code} - {response.text}"
-                self.logger.error(error_msg)
-                return {
+                    'entry_price': entry_price,
+                    'limit_price': target_price,
+                    'stop_price': stop_price
+                },
+                f"{action_type} bracket order: {shares} shares of {symbol} entry @ {entry_info}, "
+                f"target @ ${target_price:.2f}, stop @ ${stop_price:.2f}",
+                timestamp
+            )
+        except Exception as e:
+            self.logger.error(f"Error placing {action_type} bracket order: {str(e)}")
+            return {'status': 'error', 'reason': str(e), 'timestamp': timestamp}
+    
+    def place_orders_batch(self, orders: List[Dict[str, Any]],
+                           max_workers: int = DEFAULT_BATCH_WORKERS) -> List[Dict]:
+        """
+        Submit many orders concurrently over the pooled HTTP session.
+        
+        Args:
+            orders: Order specs, each with an "order_type" key (see
+                BATCH_ORDER_METHODS) plus the keyword arguments of the matching
+                place_* method, e.g.
+                {"order_type": "limit", "action_type": "BUY", "symbol": "AAPL",
+                 "shares": 10, "limit_price": 150.0}
+            max_workers: Maximum orders in flight at once
+            
+        Returns:
+            Per-order results in input order, each with latency_ms (time to
+            validate, submit and receive the response for that order)
+        """
+        def submit(spec):
+            spec = dict(spec)
+            order_type = spec.pop("order_type", None)
+            start = time.perf_counter()
+            if order_type not in BATCH_ORDER_METHODS:
+                result = {
                     'status': 'rejected',
-                    'reason': error_msg,
-                    'timestamp': timestamp
+                    'reason': f'Invalid order type: {order_type}. Must be one of {list(BATCH_ORDER_METHODS)}',
+                    'timestamp': datetime.now()
                 }
-            
-        except Exception as e:
-            self.logger.error(f"Error placing {action_type} trailing stop order: {str(e)}")
-            return {
-                'status': 'error',
-                'reason': str(e),
-                'timestamp': timestamp
-            }
+            else:
+                try:
+                    result = getattr(self, BATCH_ORDER_METHODS[order_type])(**spec)
+                except TypeError as e:
+                    result = {'status': 'rejected', 'reason': str(e), 'timestamp': datetime.now()}
+            return dict(result, latency_ms=(time.perf_counter() - start) * 1000)
+        
+        if not orders:
+            return []
+        
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(orders))) as executor:
+            results = list(executor.map(submit, orders))
+        
+        submitted = sum(result['status'] == 'submitted' for result in results)
+        self.logger.info(f"Batch of {len(orders)} orders: {submitted} submitted in "
+                         f"{(time.perf_counter() - start) * 1000:.1f}ms")
+        return results
     
     def get_order_history_df(self) -> pd.DataFrame:
         """
         Get order history as a pandas DataFrame.
         
         Returns:
-            DataFrame with order history
+            DataFrame with the orders held in memory by the order journal
         """
-        if not self.order_history:
-            return pd.DataFrame()
-        
-        return pd.DataFrame(self.order_history)
+        return self.order_history.to_frame()
     
     def get_order_status(self, order_id: str) -> Dict[str, Any]:
         """
@@ -743,11 +582,11 @@ class OrderHandler:
         if not self.account_number:
             return {"error": "No account number available"}
         
-        url = f"https://api.schwabapi.com/trader/v1/accounts/{self.account_number}/orders/{order_id}"
+        url = f"{http_client.API_BASE_URL}/trader/v1/accounts/{self.account_number}/orders/{order_id}"
         headers = self._get_auth_headers()
         
         try:
-            response = requests.get(url, headers=headers)
+            response = http_client.get(url, headers=headers)
             
             if response.status_code == 200:
                 return response.json()
@@ -781,7 +620,7 @@ class OrderHandler:
         if not self.account_number:
             return {"error": "No account number available"}
         
-        url = f"https://api.schwabapi.com/trader/v1/accounts/{self.account_number}/orders"
+        url = f"{http_client.API_BASE_URL}/trader/v1/accounts/{self.account_number}/orders"
         headers = self._get_auth_headers()
         
         params = {"maxResults": max_results}
@@ -793,7 +632,7 @@ class OrderHandler:
             params["status"] = status
         
         try:
-            response = requests.get(url, headers=headers, params=params)
+            response = http_client.get(url, headers=headers, params=params)
             
             if response.status_code == 200:
                 return response.json()
@@ -819,11 +658,11 @@ class OrderHandler:
         if not self.account_number:
             return {"error": "No account number available"}
         
-        url = f"https://api.schwabapi.com/trader/v1/accounts/{self.account_number}/orders/{order_id}"
+        url = f"{http_client.API_BASE_URL}/trader/v1/accounts/{self.account_number}/orders/{order_id}"
         headers = self._get_auth_headers()
         
         try:
-            response = requests.delete(url, headers=headers)
+            response = http_client.delete(url, headers=headers)
             
             if response.status_code == 200:
                 return {"status": "SUCCESS", "message": "Order cancelled successfully"}
@@ -850,15 +689,12 @@ class OrderHandler:
         if not self.account_number:
             return {"error": "No account number available"}
         
-        url = f"https://api.schwabapi.com/trader/v1/accounts/{self.account_number}/orders/{order_id}"
-        headers = {
-            "Authorization": f"Bearer {self.tokens['access_token']}",
-            "Content-Type": "application/json",
-            "Accept": "application/json"
-        }
+        url = f"{http_client.API_BASE_URL}/trader/v1/accounts/{self.account_number}/orders/{order_id}"
+        headers = self._get_auth_headers()
+        headers["Content-Type"] = "application/json"
         
         try:
-            response = requests.put(url, json=new_order_payload, headers=headers)
+            response = http_client.put(url, json=new_order_payload, headers=headers)
             
             if response.status_code in [200, 201]:
                 return {"status": "SUCCESS", "message": "Order replaced successfully"}
@@ -0,0 +1,234 @@
+#order_journal.py
+
+"""
+Bounded, indexed journal of submitted orders.
+
+OrderJournal replaces the plain order_history list in OrderHandler. Records
+are appended in submission order and kept in a fixed-size ring buffer, with
+an order_id index for constant-time lookups and status updates. When a
+spill path is given, every record is also written through to a SQLite
+table, so records evicted from memory (or lost with the process) can still
+be looked up and reloaded. DataFrame views are built incrementally: only
+records appended or updated since the last view are converted.
+"""
+
+import json
+import sqlite3
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+import pandas as pd
+
+ORDER_JOURNAL_CAPACITY = 10000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS orders (
+    seq INTEGER PRIMARY KEY,
+    order_id TEXT,
+    symbol TEXT,
+    status TEXT,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS orders_order_id ON orders (order_id);
+"""
+
+
+def _encode_record(record):
+    return json.dumps(record, default=lambda value: value.isoformat() if isinstance(value, datetime) else str(value))
+
+
+def _decode_record(text):
+    record = json.loads(text)
+    if isinstance(record.get('timestamp'), str):
+        try:
+            record['timestamp'] = datetime.fromisoformat(record['timestamp'])
+        except ValueError:
+            pass
+    return record
+
+
+class OrderJournal:
+    def __init__(self, capacity=ORDER_JOURNAL_CAPACITY, spill_path=None):
+        """
+        Initialize the order journal.
+
+        Args:
+            capacity (int): Records kept in memory; the oldest are evicted first.
+            spill_path (str): SQLite file every record is written through to
+                (None keeps the journal in memory only).
+        """
+        self.capacity = capacity
+        self.spill_path = spill_path
+        self._records = deque()
+        self._index: Dict[str, tuple] = {}
+        self._next_seq = 0
+        self._lock = threading.RLock()
+
+        # Incremental DataFrame view state
+        self._frame = None
+        self._pending = deque()
+        self._dirty: Dict[int, Dict[str, Any]] = {}
+
+        self._db = None
+        if spill_path:
+            self._db = sqlite3.connect(spill_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(_SCHEMA)
+            row = self._db.execute("SELECT MAX(seq) FROM orders").fetchone()
+            self._next_seq = (row[0] + 1) if row[0] is not None else 0
+
+    def __len__(self):
+        return len(self._records)
+
+    def __bool__(self):
+        return bool(self._records)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        with self._lock:
+            return iter([record for _, record in self._records])
+
+    def __contains__(self, order_id):
+        return self.get(order_id) is not None
+
+    def append(self, record: Dict[str, Any]):
+        """Append an order record (kept as the journal's own copy)."""
+        record = dict(record)
+        with self._lock:
+            seq = self._next_seq
+            self._next_seq += 1
+            self._records.append((seq, record))
+            self._pending.append((seq, record))
+            order_id = record.get('order_id')
+            if order_id:
+                self._index[str(order_id)] = (seq, record)
+            if self._db is not None:
+                self._db.execute("INSERT INTO orders (seq, order_id, symbol, status, record) VALUES (?, ?, ?, ?, ?)",
+                                 (seq, order_id, record.get('symbol'), record.get('status'), _encode_record(record)))
+                self._db.commit()
+
+            while len(self._records) > self.capacity:
+                self._evict()
+
+    def _evict(self):
+        seq, record = self._records.popleft()
+        order_id = record.get('order_id')
+        if order_id and self._index.get(str(order_id), (None,))[0] == seq:
+            del self._index[str(order_id)]
+        self._dirty.pop(seq, None)
+        # Pending rows are the newest records, so an evicted one can only be at the front
+        if self._pending and self._pending[0][0] == seq:
+            self._pending.popleft()
+
+    def get(self, order_id) -> Optional[Dict[str, Any]]:
+        """
+        Look up an order record by order_id.
+
+        Records evicted from memory are read back from the spill file.
+
+        Returns:
+            dict: A copy of the record, or None if the order is unknown.
+        """
+        with self._lock:
+            entry = self._index.get(str(order_id))
+            if entry is not None:
+                return dict(entry[1])
+            if self._db is None:
+                return None
+            row = self._db.execute("SELECT record FROM orders WHERE order_id = ? ORDER BY seq DESC LIMIT 1",
+                                   (str(order_id),)).fetchone()
+        return _decode_record(row[0]) if row else None
+
+    def update(self, order_id, **fields) -> bool:
+        """
+        Update fields of an order record (e.g. status after a fill).
+
+        Returns:
+            bool: False if the order is not in memory or the spill file.
+        """
+        with self._lock:
+            entry = self._index.get(str(order_id))
+            if entry is not None:
+                seq, record = entry
+                record.update(fields)
+                self._dirty.setdefault(seq, {}).update(fields)
+            elif self._db is not None:
+                row = self._db.execute("SELECT seq, record FROM orders WHERE order_id = ? ORDER BY seq DESC LIMIT 1",
+                                       (str(order_id),)).fetchone()
+                if row is None:
+                    return False
+                seq, record = row[0], dict(_decode_record(row[1]), **fields)
+            else:
+                return False
+
+            if self._db is not None:
+                self._db.execute("UPDATE orders SET status = ?, record = ? WHERE seq = ?",
+                                 (record.get('status'), _encode_record(record), seq))
+                self._db.commit()
+        return True
+
+    def open_orders(self, terminal_statuses) -> List[Dict[str, Any]]:
+        """In-memory records whose status is not in terminal_statuses, oldest first."""
+        with self._lock:
+            return [dict(record) for _, record in self._index.values() if record.get('status') not in terminal_statuses]
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        DataFrame view of the in-memory records, one row per record.
+
+        The view is cached; each call only converts records appended since
+        the previous call, applies pending field updates and drops rows
+        evicted from the ring buffer.
+        """
+        with self._lock:
+            if not self._records:
+                self._frame, self._pending, self._dirty = None, deque(), {}
+                return pd.DataFrame()
+
+            frame = self._frame
+            if self._pending:
+                new_rows = pd.DataFrame([record for _, record in self._pending],
+                                        index=[seq for seq, _ in self._pending])
+                frame = new_rows if frame is None or frame.empty else pd.concat([frame, new_rows])
+                self._pending = deque()
+
+            first_seq = self._records[0][0]
+            if frame.index[0] < first_seq:
+                frame = frame.loc[first_seq:]
+
+            if self._dirty:
+                frame = frame.copy()
+                for seq, fields in self._dirty.items():
+                    if seq in frame.index:
+                        for column, value in fields.items():
+                            if column not in frame.columns:
+                                frame[column] = None
+                            frame.at[seq, column] = value
+                self._dirty = {}
+
+            self._frame = frame
+        return frame.reset_index(drop=True)
+
+    def load(self, limit=None) -> pd.DataFrame:
+        """
+        Read records back from the spill file, including evicted ones.
+
+        Args:
+            limit (int): Only the most recent records (None reads all).
+        """
+        if self._db is None:
+            return self.to_frame()
+        with self._lock:
+            query = "SELECT record FROM orders ORDER BY seq"
+            if limit:
+                query = f"SELECT record FROM (SELECT seq, record FROM orders ORDER BY seq DESC LIMIT {int(limit)}) ORDER BY seq"
+            rows = self._db.execute(query).fetchall()
+        return pd.DataFrame([_decode_record(row[0]) for row in rows])
+
+    def close(self):
+        if self._db is not None:
+            with self._lock:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,152 @@
+#order_templates.py
+
+"""
+Payload templates for single-leg Schwab equity orders.
+
+Kept apart from order_handler.py (which needs API credentials at import) so
+the paper broker can validate and build orders exactly like OrderHandler.
+"""
+
+import json
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+ORDER_ACTIONS = ["BUY", "SELL", "SELL_SHORT", "BUY_TO_COVER"]
+_ORDER_ACTION_SET = frozenset(ORDER_ACTIONS)
+
+
+def validate_quantities(shares, prices: Dict[str, Any]) -> Optional[str]:
+    """Return the rejection reason for a non-positive share count or a missing,
+    non-finite or non-positive price (keyed by argument name), or None"""
+    if shares is None or shares <= 0:
+        return 'Invalid share quantity'
+    for arg, value in prices.items():
+        if value is None or not math.isfinite(value) or value <= 0:
+            return f'Invalid {arg.replace("_", " ")}: {value}'
+    return None
+
+
+class OrderTemplate:
+    """
+    Pre-validated payload skeleton for one single-leg order type.
+    
+    The constant part of the payload is encoded to JSON once, so building an
+    order at submission time only formats the prices, the instruction, the
+    quantity and the symbol into the skeleton.
+    """
+    
+    def __init__(self, order_type: str, label: str, fields: Dict[str, Any],
+                 prices: List[Tuple[str, str, bool]] = (), record_extras: Dict[str, str] = None,
+                 dollar_price: str = None):
+        """
+        Args:
+            order_type: Order type recorded in the order history (e.g. "stop_limit")
+            label: Human-readable order type for logs (e.g. "stop-limit")
+            fields: Constant payload fields (orderType, session, duration, ...)
+            prices: (payload field, argument name, send as string) per price argument
+            record_extras: Extra record field -> argument name (e.g. market "price")
+            dollar_price: Argument used to compute dollar_amount, if any
+        """
+        self.order_type = order_type
+        self.label = label
+        self.fields = dict(fields, orderStrategyType="SINGLE")
+        self.prices = tuple(prices)
+        self.record_extras = record_extras or {}
+        self.dollar_price = dollar_price
+        self.required = tuple(arg for _, arg, _ in self.prices)
+        # Skeleton with {} slots for the prices, instruction, quantity and JSON-encoded symbol
+        head = json.dumps(self.fields)[:-1].replace("{", "{{").replace("}", "}}")
+        slots = "".join(f', "{field}": "{{}}"' if as_string else f', "{field}": {{}}'
+                        for field, _, as_string in self.prices)
+        self._body_format = (head + slots + ', "orderLegCollection": [{{"instruction": "{}", "quantity": {}, '
+                             '"instrument": {{"symbol": {}, "assetType": "EQUITY"}}}}]}}')
+    
+    def validate(self, action_type: str, shares, prices: Dict[str, Any]) -> Optional[str]:
+        """Return the rejection reason, or None if the order is valid"""
+        if action_type not in _ORDER_ACTION_SET:
+            return f'Invalid action type: {action_type}. Must be one of {ORDER_ACTIONS}'
+        return validate_quantities(shares, {arg: prices.get(arg) for arg in self.required})
+    
+    def body(self, action_type: str, symbol: str, shares, prices: Dict[str, Any]) -> bytes:
+        """Encoded JSON payload (inputs must have passed validate)"""
+        return self._body_format.format(*[prices[arg] for arg in self.required],
+                                        action_type, shares, json.dumps(symbol)).encode()
+    
+    def payload(self, action_type: str, symbol: str, shares, prices: Dict[str, Any]) -> Dict[str, Any]:
+        """Payload as a dict in Schwab API format (same content as body)"""
+        payload = dict(self.fields)
+        for field, arg, as_string in self.prices:
+            payload[field] = str(prices[arg]) if as_string else prices[arg]
+        payload["orderLegCollection"] = [
+            {
+                "instruction": action_type,
+                "quantity": shares,
+                "instrument": {
+                    "symbol": symbol,
+                    "assetType": "EQUITY"
+                }
+            }
+        ]
+        return payload
+    
+    def record(self, action_type: str, symbol: str, shares, prices: Dict[str, Any]) -> Dict[str, Any]:
+        """Order history record fields"""
+        record = {
+            'symbol': symbol,
+            'action_type': action_type,
+            'order_type': self.order_type,
+            'shares': shares
+        }
+        for arg in self.required:
+            record[arg] = prices[arg]
+        for field, arg in self.record_extras.items():
+            record[field] = prices.get(arg)
+        if self.dollar_price is not None:
+            price = prices.get(self.dollar_price)
+            record['dollar_amount'] = shares * price if price is not None else None
+        return record
+    
+    def describe(self, prices: Dict[str, Any]) -> str:
+        """Price part of the log message"""
+        if self.order_type == "market":
+            price = prices.get("current_price")
+            return f" at ${price:.2f}" if price is not None else " at market price"
+        if self.order_type == "trailing_stop":
+            return f" with ${prices['stop_price_offset']:.2f} offset"
+        if self.order_type == "stop_limit":
+            return f" stop @ ${prices['stop_price']:.2f}, limit @ ${prices['limit_price']:.2f}"
+        return f" @ ${prices[self.required[0]]:.2f}"
+
+
+# Payload skeletons aligned with the Schwab API documentation
+ORDER_TEMPLATES = {
+    "market": OrderTemplate(
+        "market", "market",
+        {"orderType": "MARKET", "session": "NORMAL", "duration": "DAY"},
+        record_extras={"price": "current_price", "fill_price": "current_price"},
+        dollar_price="current_price"
+    ),
+    "limit": OrderTemplate(
+        "limit", "limit",
+        # SEAMLESS for after hours; GTC keeps the order active until filled or cancelled
+        {"orderType": "LIMIT", "session": "SEAMLESS", "duration": "GOOD_TILL_CANCEL"},
+        prices=[("price", "limit_price", True)],  # Price must be a string in API
+        dollar_price="limit_price"
+    ),
+    "stop": OrderTemplate(
+        "stop", "stop",
+        {"orderType": "STOP", "session": "NORMAL", "duration": "DAY"},
+        prices=[("stopPrice", "stop_price", True)]
+    ),
+    "stop_limit": OrderTemplate(
+        "stop_limit", "stop-limit",
+        {"orderType": "STOP_LIMIT", "session": "NORMAL", "duration": "DAY"},
+        prices=[("price", "limit_price", True), ("stopPrice", "stop_price", True)]
+    ),
+    "trailing_stop": OrderTemplate(
+        "trailing_stop", "trailing stop",
+        {"orderType": "TRAILING_STOP", "session": "NORMAL", "duration": "DAY",
+         "stopPriceLinkBasis": "BID", "stopPriceLinkType": "VALUE"},
+        prices=[("stopPriceOffset", "stop_price_offset", False)]
+    ),
+}
@@ -0,0 +1,474 @@
+#paper_broker.py
+
+"""
+In-process paper-trading broker with the OrderHandler method surface.
+
+PaperBroker accepts the same calls as OrderHandler (place_market_order,
+place_limit_order, place_stop_order, place_stop_limit_order,
+place_trailing_stop_order, cancel_order, replace_order, get_all_orders,
+get_order_status, get_order_history_df) and validates and builds orders with
+the same templates, but keeps the orders in memory and fills them against
+bars instead of sending them to Schwab. Bars come from historical_data CSVs
+(replay()) or from the streaming replay (on_stream_bar as the on_bar callback
+of StreamIngestionService).
+
+Fill model, per bar and in submission order:
+    market          the bar open
+    limit           the open if it is already through the limit, else the
+                    limit price if the bar's range reaches it
+    stop            the open if it gapped through the stop, else the stop price
+    stop-limit      triggers like a stop, then fills like a limit order
+                    (in the same bar if the price allows, else on later bars)
+    trailing stop   the stop trails the best open since the order became active
+                    by the offset and then fills like a stop
+Market, stop and trailing-stop fills are moved against the order by
+slippage_bps (stop-limit fills never past the limit). With participation set,
+each bar fills at most that fraction of the bar volume, so large orders fill
+partially over several bars. An order is only eligible on bars that start
+more than latency_ms after it was entered, and every API call can sleep
+api_latency seconds to emulate the round trip.
+
+Usage:
+    broker = PaperBroker(slippage_bps=2, participation=0.01)
+    broker.replay(load_replay_bars(), on_bar=strategy)
+"""
+
+import itertools
+import math
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(__file__))
+from order_journal import OrderJournal, ORDER_JOURNAL_CAPACITY
+from order_templates import ORDER_TEMPLATES
+from fill_tracker import TERMINAL_STATUSES
+
+PAPER_ACCOUNT_HASH = "PAPER"
+BUY_INSTRUCTIONS = frozenset({"BUY", "BUY_TO_COVER"})
+
+# Order spec "order_type" -> PaperBroker method used by place_orders_batch
+PAPER_ORDER_METHODS = {
+    "market": "place_market_order",
+    "limit": "place_limit_order",
+    "stop": "place_stop_order",
+    "stop_limit": "place_stop_limit_order",
+    "trailing_stop": "place_trailing_stop_order",
+}
+
+
+def _parse_api_time(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _format_api_time(moment: datetime) -> str:
+    return moment.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+class PaperOrder:
+    __slots__ = ("order_id", "payload", "symbol", "instruction", "side", "order_type", "quantity", "filled",
+                 "price", "stop_price", "stop_offset", "trail_mark", "triggered", "status", "entered",
+                 "active_after", "close_time", "executions")
+
+    def __init__(self, order_id: str, payload: Dict[str, Any], entered: datetime, active_after: float):
+        leg = payload["orderLegCollection"][0]
+        self.order_id = order_id
+        self.payload = payload
+        self.symbol = leg["instrument"]["symbol"]
+        self.instruction = leg["instruction"]
+        self.side = 1 if self.instruction in BUY_INSTRUCTIONS else -1
+        self.order_type = payload["orderType"]
+        self.quantity = leg["quantity"]
+        self.filled = 0
+        self.price = float(payload["price"]) if "price" in payload else None
+        self.stop_price = float(payload["stopPrice"]) if "stopPrice" in payload else None
+        self.stop_offset = float(payload["stopPriceOffset"]) if "stopPriceOffset" in payload else None
+        self.trail_mark = None
+        self.triggered = False
+        self.status = "WORKING"
+        self.entered = entered
+        self.active_after = active_after
+        self.close_time = None
+        self.executions = []
+
+    @property
+    def remaining(self):
+        return self.quantity - self.filled
+
+    def average_price(self):
+        if not self.filled:
+            return None
+        return sum(quantity * price for quantity, price, _ in self.executions) / self.filled
+
+    def to_api(self) -> Dict[str, Any]:
+        """The order in Schwab order format"""
+        order = dict(self.payload)
+        if self.order_type == "TRAILING_STOP" and self.stop_price is not None:
+            order["stopPrice"] = round(self.stop_price, 4)
+        order.update({
+            "orderId": int(self.order_id),
+            "accountNumber": PAPER_ACCOUNT_HASH,
+            "status": self.status,
+            "quantity": self.quantity,
+            "filledQuantity": self.filled,
+            "remainingQuantity": self.remaining,
+            "enteredTime": _format_api_time(self.entered),
+            "closeTime": _format_api_time(self.close_time) if self.close_time else None,
+        })
+        if self.executions:
+            order["orderActivityCollection"] = [
+                {"activityType": "EXECUTION", "executionType": "FILL", "quantity": quantity,
+                 "executionLegs": [{"quantity": quantity, "price": price, "time": _format_api_time(moment)}]}
+                for quantity, price, moment in self.executions
+            ]
+        return order
+
+
+class PaperBroker:
+    def __init__(self, latency_ms=0, slippage_bps=0.0, participation=None, api_latency=0.0,
+                 starting_cash=100000.0, journal_capacity=ORDER_JOURNAL_CAPACITY, journal_path=None):
+        """
+        Initialize the paper broker.
+
+        Args:
+            latency_ms (float): Simulated time between entering an order and the
+                first bar it can fill on (bars must start strictly later).
+            slippage_bps (float): Adverse slippage on market, stop and trailing-stop
+                fills, in basis points.
+            participation (float): Maximum fraction of each bar's volume one order
+                can fill (None fills the whole order at once).
+            api_latency (float): Wall-clock seconds every API call sleeps.
+            starting_cash (float): Cash balance before any fills.
+            journal_capacity (int): Orders kept in memory by the order journal.
+            journal_path (str): SQLite file for the order journal (None = memory only).
+        """
+        self.latency_ms = latency_ms
+        self.slippage_bps = slippage_bps
+        self.participation = participation
+        self.api_latency = api_latency
+        self.account_number = PAPER_ACCOUNT_HASH
+        self.order_history = OrderJournal(capacity=journal_capacity, spill_path=journal_path)
+
+        self.cash = starting_cash
+        self.positions: Dict[str, int] = {}
+        self.clock: Optional[int] = None
+        self.fills = 0
+        self.bars_processed = 0
+
+        self.orders: Dict[str, PaperOrder] = {}
+        self._working: Dict[str, Dict[str, PaperOrder]] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.RLock()
+
+    def _api_call(self):
+        if self.api_latency:
+            time.sleep(self.api_latency)
+
+    def _now(self) -> datetime:
+        """Current simulated time (wall-clock time before the first bar)"""
+        if self.clock is None:
+            return datetime.now()
+        return datetime.fromtimestamp(self.clock / 1000)
+
+    # Order entry
+
+    def place_market_order(self, action_type: str, symbol: str, shares: int,
+                           current_price: float = None, timestamp: datetime = None) -> Dict:
+        """Paper version of OrderHandler.place_market_order (fills at the next bar open)."""
+        return self._place_order("market", action_type, symbol, shares, timestamp, current_price=current_price)
+
+    def place_limit_order(self, action_type: str, symbol: str, shares: int,
+                          limit_price: float, timestamp: datetime = None) -> Dict:
+        """Paper version of OrderHandler.place_limit_order."""
+        return self._place_order("limit", action_type, symbol, shares, timestamp, limit_price=limit_price)
+
+    def place_stop_order(self, action_type: str, symbol: str, shares: int,
+                         stop_price: float, timestamp: datetime = None) -> Dict:
+        """Paper version of OrderHandler.place_stop_order."""
+        return self._place_order("stop", action_type, symbol, shares, timestamp, stop_price=stop_price)
+
+    def place_stop_limit_order(self, action_type: str, symbol: str, shares: int,
+                               stop_price: float, limit_price: float, timestamp: datetime = None) -> Dict:
+        """Paper version of OrderHandler.place_stop_limit_order."""
+        return self._place_order("stop_limit", action_type, symbol, shares, timestamp,
+                                 stop_price=stop_price, limit_price=limit_price)
+
+    def place_trailing_stop_order(self, action_type: str, symbol: str, shares: int,
+                                  stop_price_offset: float, timestamp: datetime = None) -> Dict:
+        """Paper version of OrderHandler.place_trailing_stop_order."""
+        return self._place_order("trailing_stop", action_type, symbol, shares, timestamp,
+                                 stop_price_offset=stop_price_offset)
+
+    def place_orders_batch(self, orders: List[Dict[str, Any]], max_workers: int = None) -> List[Dict]:
+        """
+        Paper version of OrderHandler.place_orders_batch (orders are entered in
+        sequence; max_workers is accepted for compatibility).
+        """
+        results = []
+        for spec in orders:
+            spec = dict(spec)
+            order_type = spec.pop("order_type", None)
+            start = time.perf_counter()
+            if order_type not in PAPER_ORDER_METHODS:
+                result = {
+                    'status': 'rejected',
+                    'reason': f'Invalid order type: {order_type}. Must be one of {list(PAPER_ORDER_METHODS)}',
+                    'timestamp': self._now()
+                }
+            else:
+                try:
+                    result = getattr(self, PAPER_ORDER_METHODS[order_type])(**spec)
+                except TypeError as e:
+                    result = {'status': 'rejected', 'reason': str(e), 'timestamp': self._now()}
+            results.append(dict(result, latency_ms=(time.perf_counter() - start) * 1000))
+        return results
+
+    def _place_order(self, order_type: str, action_type: str, symbol: str, shares: int,
+                     timestamp: datetime = None, **prices) -> Dict:
+        if timestamp is None:
+            timestamp = self._now()
+
+        template = ORDER_TEMPLATES[order_type]
+        reason = template.validate(action_type, shares, prices)
+        if reason is not None:
+            return {'status': 'rejected', 'reason': reason, 'timestamp': timestamp}
+
+        start = time.perf_counter()
+        self._api_call()
+        order = self._enter(template.payload(action_type, symbol, shares, prices), timestamp)
+        record = dict(template.record(action_type, symbol, shares, prices),
+                      timestamp=timestamp, order_id=order.order_id, status='submitted')
+        self.order_history.append(record)
+        return dict(record, latency_ms=(time.perf_counter() - start) * 1000)
+
+    def _enter(self, payload: Dict[str, Any], timestamp: datetime) -> PaperOrder:
+        active_after = self.clock + self.latency_ms if self.clock is not None else -math.inf
+        with self._lock:
+            order = PaperOrder(str(next(self._ids)), payload, timestamp, active_after)
+            self.orders[order.order_id] = order
+            self._working.setdefault(order.symbol, {})[order.order_id] = order
+        return order
+
+    # Order management
+
+    def get_order_status(self, order_id: str) -> Dict[str, Any]:
+        self._api_call()
+        order = self.orders.get(str(order_id))
+        if order is None:
+            return {"error": "Failed to get order status: 404, Order not found"}
+        with self._lock:
+            return order.to_api()
+
+    def get_all_orders(self, from_entered_time: str = None, to_entered_time: str = None,
+                       max_results: int = 3000, status: str = None) -> List[Dict[str, Any]]:
+        """Orders in Schwab order format, optionally filtered like OrderHandler.get_all_orders."""
+        self._api_call()
+        start = _parse_api_time(from_entered_time) if from_entered_time else None
+        end = _parse_api_time(to_entered_time) if to_entered_time else None
+        with self._lock:
+            if status == "WORKING":
+                candidates = [order for working in self._working.values() for order in working.values()]
+            else:
+                candidates = list(self.orders.values())
+            result = []
+            for order in candidates:
+                if status and order.status != status:
+                    continue
+                entered = order.entered.astimezone(timezone.utc)
+                if (start and entered < start) or (end and entered > end):
+                    continue
+                result.append(order.to_api())
+                if len(result) >= max_results:
+                    break
+        return result
+
+    def cancel_order(self, order_id: str) -> Dict[str, Any]:
+        self._api_call()
+        with self._lock:
+            order = self.orders.get(str(order_id))
+            if order is None or order.status in TERMINAL_STATUSES:
+                return {"error": f"Failed to cancel order: 404, Order {order_id} is not open"}
+            self._close(order, "CANCELED")
+        return {"status": "SUCCESS", "message": "Order cancelled successfully"}
+
+    def replace_order(self, order_id: str, new_order_payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Replace an open order; the old order becomes REPLACED and a new order id is returned."""
+        self._api_call()
+        with self._lock:
+            order = self.orders.get(str(order_id))
+            if order is None or order.status in TERMINAL_STATUSES:
+                return {"error": f"Failed to replace order: 404, Order {order_id} is not open"}
+            try:
+                new_order = self._enter(new_order_payload, self._now())
+            except (KeyError, IndexError, TypeError, ValueError) as e:
+                return {"error": f"Failed to replace order: 400, Invalid order payload ({e})"}
+            self._close(order, "REPLACED")
+
+        self.order_history.append({
+            'timestamp': new_order.entered,
+            'symbol': new_order.symbol,
+            'action_type': new_order.instruction,
+            'order_type': new_order.order_type.lower(),
+            'shares': new_order.quantity,
+            'limit_price': new_order.price,
+            'stop_price': new_order.stop_price,
+            'order_id': new_order.order_id,
+            'status': 'submitted',
+            'replaces': str(order_id)
+        })
+        return {"status": "SUCCESS", "message": "Order replaced successfully", "order_id": new_order.order_id}
+
+    def get_order_history_df(self) -> pd.DataFrame:
+        return self.order_history.to_frame()
+
+    def _close(self, order: PaperOrder, status: str):
+        order.status = status
+        order.close_time = self._now()
+        self._working.get(order.symbol, {}).pop(order.order_id, None)
+        self.order_history.update(order.order_id, status=status, filled_quantity=order.filled,
+                                  remaining_quantity=order.remaining, fill_price=order.average_price())
+
+    # Bar processing
+
+    def replay(self, bars: pd.DataFrame, on_bar: Callable = None):
+        """
+        Fill working orders against bars in time order.
+
+        Args:
+            bars (pd.DataFrame): Bars from replay_server.load_replay_bars.
+            on_bar (callable): Called as on_bar(broker, bar) after each bar is
+                processed, where the strategy can place or cancel orders.
+        """
+        columns = [bars[column].to_numpy() for column in ("symbol", "datetime", "open", "high", "low", "close", "volume")]
+        for symbol, timestamp, open_, high, low, close, volume in zip(*columns):
+            bar = {"symbol": symbol, "datetime": int(timestamp), "open": float(open_), "high": float(high),
+                   "low": float(low), "close": float(close), "volume": 0 if pd.isna(volume) else int(volume)}
+            self.process_bar(bar)
+            if on_bar is not None:
+                on_bar(self, bar)
+
+    def on_stream_bar(self, state, bar: Dict[str, Any]):
+        """on_bar callback for StreamIngestionService."""
+        self.process_bar(bar)
+
+    def process_bar(self, bar: Dict[str, Any]) -> int:
+        """
+        Advance the clock to the bar and fill the bar symbol's eligible working orders.
+
+        Args:
+            bar (dict): symbol, datetime (epoch ms), open, high, low, close, volume.
+
+        Returns:
+            int: Executions in this bar.
+        """
+        timestamp = bar["datetime"]
+        with self._lock:
+            self.clock = timestamp if self.clock is None else max(self.clock, timestamp)
+            self.bars_processed += 1
+            working = self._working.get(bar["symbol"])
+            if not working:
+                return 0
+
+            budget = None
+            if self.participation is not None:
+                budget = int((bar.get("volume") or 0) * self.participation)
+
+            executions = 0
+            for order in list(working.values()):
+                if timestamp <= order.active_after:
+                    continue
+                price = self._fill_price(order, bar)
+                if price is None:
+                    continue
+                quantity = order.remaining if budget is None else min(order.remaining, budget)
+                if quantity <= 0:
+                    continue
+                self._execute(order, quantity, price, timestamp)
+                executions += 1
+            return executions
+
+    def _fill_price(self, order: PaperOrder, bar: Dict[str, Any]) -> Optional[float]:
+        """Execution price of the order in this bar, or None if it does not fill"""
+        buy = order.side > 0
+        open_ = bar["open"]
+
+        if order.order_type == "MARKET":
+            return self._slip(open_, order.side)
+
+        if order.order_type == "LIMIT":
+            return self._limit_fill(buy, order.price, bar)
+
+        if order.order_type == "TRAILING_STOP":
+            # Trail the best open seen while active; intrabar extremes only move the stop for later bars
+            if order.trail_mark is None:
+                order.trail_mark = open_
+            else:
+                order.trail_mark = min(order.trail_mark, open_) if buy else max(order.trail_mark, open_)
+            order.stop_price = order.trail_mark + order.stop_offset if buy else order.trail_mark - order.stop_offset
+            price = self._stop_trigger(buy, order.stop_price, bar)
+            if price is None:
+                order.trail_mark = min(order.trail_mark, bar["low"]) if buy else max(order.trail_mark, bar["high"])
+                return None
+            return self._slip(price, order.side)
+
+        if order.order_type == "STOP":
+            price = self._stop_trigger(buy, order.stop_price, bar)
+            return None if price is None else self._slip(price, order.side)
+
+        if order.order_type == "STOP_LIMIT":
+            if not order.triggered:
+                price = self._stop_trigger(buy, order.stop_price, bar)
+                if price is None:
+                    return None
+                order.triggered = True
+                price = self._slip(price, order.side)
+                if (price <= order.price) if buy else (price >= order.price):
+                    return price
+            return self._limit_fill(buy, order.price, bar)
+
+        return None
+
+    def _slip(self, price: float, side: int) -> float:
+        return price * (1 + side * self.slippage_bps / 10000) if self.slippage_bps else price
+
+    @staticmethod
+    def _limit_fill(buy: bool, limit: float, bar: Dict[str, Any]) -> Optional[float]:
+        if buy:
+            if bar["open"] <= limit:
+                return bar["open"]
+            return limit if bar["low"] <= limit else None
+        if bar["open"] >= limit:
+            return bar["open"]
+        return limit if bar["high"] >= limit else None
+
+    @staticmethod
+    def _stop_trigger(buy: bool, stop: float, bar: Dict[str, Any]) -> Optional[float]:
+        if buy:
+            if bar["open"] >= stop:
+                return bar["open"]
+            return stop if bar["high"] >= stop else None
+        if bar["open"] <= stop:
+            return bar["open"]
+        return stop if bar["low"] <= stop else None
+
+    def _execute(self, order: PaperOrder, quantity: int, price: float, timestamp: int):
+        moment = datetime.fromtimestamp(timestamp / 1000)
+        order.filled += quantity
+        order.executions.append((quantity, price, moment))
+        self.positions[order.symbol] = self.positions.get(order.symbol, 0) + order.side * quantity
+        self.cash -= order.side * quantity * price
+        self.fills += 1
+        if order.remaining == 0:
+            self._close(order, "FILLED")
+        else:
+            self.order_history.update(order.order_id, status="WORKING", filled_quantity=order.filled,
+                                      remaining_quantity=order.remaining, fill_price=order.average_price())
+
+    def equity(self, prices: Dict[str, float]) -> float:
+        """Cash plus positions marked at the given prices."""
+        return self.cash + sum(shares * prices.get(symbol, 0.0) for symbol, shares in self.positions.items())
@@ -0,0 +1,54 @@
+#rate_limiter.py
+
+"""
+Thread-safe token-bucket rate limiter for Schwab API requests.
+
+The market data endpoints allow roughly 120 requests per minute per app, so
+the default bucket refills at 2 requests/second with a small burst allowance.
+"""
+
+import threading
+import time
+
+SCHWAB_REQUESTS_PER_SECOND = 2.0
+SCHWAB_BURST = 5
+
+
+class TokenBucket:
+    def __init__(self, rate=SCHWAB_REQUESTS_PER_SECOND, capacity=SCHWAB_BURST):
+        """
+        Initialize the token bucket.
+
+        Args:
+            rate (float): Tokens added per second.
+            capacity (int): Maximum burst size.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def reserve(self, tokens=1):
+        """
+        Take tokens now and return how long the caller must wait before using them.
+
+        Returns:
+            float: Seconds to wait (0 if tokens were available).
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens=1):
+        """Block until `tokens` requests may be sent."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
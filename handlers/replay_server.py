@@ -0,0 +1,205 @@
+#replay_server.py
+
+"""
+Local replay server that streams historical bars as a live market feed.
+
+Plays back historical_data/*.csv files over a persistent TCP connection as
+newline-delimited JSON, the same message flow stream_ingestion.py consumes
+from a live feed. Each bar is replayed as a short path of quote ticks (open,
+then low/high in the order the close implies, then close) followed by the
+completed bar, so intraday threshold breaches can fire before the bar closes.
+
+Protocol (one JSON object per line):
+    client -> server  {"command": "SUBS", "symbols": ["AAPL", "MSFT"]}
+    server -> client  {"type": "quote", "symbol": "AAPL", "datetime": 1661119200000, "last": 167.1}
+    server -> client  {"type": "bar", "symbol": "AAPL", "datetime": ..., "open": ..., "high": ...,
+                       "low": ..., "close": ..., "volume": ...}
+    server -> client  {"type": "end"}
+
+Every client gets its own playback, starting when it subscribes.
+
+Usage:
+    python handlers/replay_server.py --speed 86400        # one trading day per second
+    python handlers/replay_server.py --speed 0 --port 8765  # as fast as possible
+"""
+
+import argparse
+import asyncio
+import glob
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+REPLAY_COLUMNS = ["datetime", "open", "high", "low", "close", "volume"]
+# Resolved against the repo root so scripts work from any working directory
+DEFAULT_REPLAY_GLOB = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                   "historical_data", "*.csv")
+
+
+def load_replay_bars(paths=DEFAULT_REPLAY_GLOB) -> pd.DataFrame:
+    """
+    Load bars from CSV files into one frame sorted by time.
+
+    The symbol comes from a `symbol` column when present, otherwise from the
+    file name prefix (e.g. AAPL_overnight_hold_backtest.csv -> AAPL).
+
+    Args:
+        paths: A glob pattern or a list of CSV paths.
+
+    Returns:
+        pd.DataFrame: symbol, datetime (epoch ms), open, high, low, close, volume.
+
+    Raises:
+        FileNotFoundError: If the pattern or list matches no files.
+    """
+    if isinstance(paths, str):
+        pattern, paths = paths, sorted(glob.glob(paths))
+        if not paths:
+            raise FileNotFoundError(f"No CSV files match {pattern}")
+    elif not paths:
+        raise FileNotFoundError("No CSV files given to replay")
+
+    frames = []
+    for path in paths:
+        df = pd.read_csv(path)
+        if "symbol" not in df.columns:
+            df["symbol"] = os.path.basename(path).split("_")[0].upper()
+        frames.append(df[["symbol"] + REPLAY_COLUMNS])
+
+    bars = pd.concat(frames, ignore_index=True).dropna(subset=["open", "high", "low", "close"])
+    timestamps = bars["datetime"]
+    if not pd.api.types.is_integer_dtype(timestamps):
+        timestamps = pd.to_datetime(timestamps).astype("datetime64[ns]").astype(np.int64) // 1_000_000
+    bars["datetime"] = timestamps.astype(np.int64)
+    return bars.sort_values(["datetime", "symbol"], kind="stable").reset_index(drop=True)
+
+
+def _bar_events(bar):
+    """Quote ticks along the bar's price path, then the completed bar."""
+    if bar.close >= bar.open:
+        path = (bar.open, bar.low, bar.high, bar.close)
+    else:
+        path = (bar.open, bar.high, bar.low, bar.close)
+
+    events = [{"type": "quote", "symbol": bar.symbol, "datetime": bar.datetime, "last": float(price)}
+              for price in path]
+    events.append({"type": "bar", "symbol": bar.symbol, "datetime": bar.datetime,
+                   "open": float(bar.open), "high": float(bar.high), "low": float(bar.low),
+                   "close": float(bar.close), "volume": int(bar.volume) if pd.notna(bar.volume) else 0})
+    return events
+
+
+class ReplayServer:
+    def __init__(self, bars: pd.DataFrame, speed=0.0, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """
+        Initialize the replay server.
+
+        Args:
+            bars (pd.DataFrame): Bars from load_replay_bars.
+            speed (float): Replay speed as a multiple of real time (86400 plays
+                one day of bar time per second). 0 replays as fast as possible.
+            host (str): Interface to listen on.
+            port (int): Port to listen on (0 picks a free port).
+        """
+        self.speed = speed
+        self.host = host
+        self.port = port
+        self._server = None
+
+        # Encode every event once; clients share the encoded lines
+        self._times = []
+        self._lines = []
+        self._symbols = []
+        for bar in bars.itertuples(index=False):
+            self._times.append(bar.datetime)
+            self._symbols.append(bar.symbol)
+            self._lines.append(b"".join(json.dumps(event).encode() + b"\n" for event in _bar_events(bar)))
+
+    async def start(self):
+        """Start listening; returns once the socket is bound."""
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle_client(self, reader, writer):
+        try:
+            request = json.loads(await reader.readline() or b"{}")
+            symbols = {symbol.upper() for symbol in request.get("symbols") or []}
+            await self._replay(writer, symbols)
+            writer.write(b'{"type": "end"}\n')
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _replay(self, writer, symbols):
+        start_wall = time.monotonic()
+        start_bar = self._times[0] if self._times else 0
+        pending = []
+
+        for bar_time, symbol, lines in zip(self._times, self._symbols, self._lines):
+            if symbols and symbol not in symbols:
+                continue
+
+            if self.speed > 0:
+                due = start_wall + (bar_time - start_bar) / 1000 / self.speed
+                delay = due - time.monotonic()
+                if delay > 0:
+                    if pending:
+                        writer.write(b"".join(pending))
+                        pending = []
+                    await writer.drain()
+                    await asyncio.sleep(delay)
+
+            pending.append(lines)
+            if len(pending) >= 256:
+                writer.write(b"".join(pending))
+                pending = []
+                await writer.drain()
+
+        if pending:
+            writer.write(b"".join(pending))
+        await writer.drain()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay historical_data CSVs as a streaming market feed")
+    parser.add_argument('--files', type=str, default=DEFAULT_REPLAY_GLOB, help='Glob of CSV files to replay')
+    parser.add_argument('--speed', type=float, default=0.0,
+                        help='Multiple of real time (86400 = one day per second, 0 = as fast as possible)')
+    parser.add_argument('--host', type=str, default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    try:
+        bars = load_replay_bars(args.files)
+    except FileNotFoundError as e:
+        parser.error(str(e))
+    server = ReplayServer(bars, speed=args.speed, host=args.host, port=args.port)
+    print(f"Replaying {len(bars)} bars for {bars['symbol'].nunique()} symbols on {args.host}:{args.port} "
+          f"(speed={args.speed or 'max'})")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
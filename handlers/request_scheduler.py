@@ -0,0 +1,310 @@
+#request_scheduler.py
+
+"""
+Central non-blocking request scheduler for Schwab API calls.
+
+Requests are queued with a ready time and sent by a small pool of worker
+threads. A throttled (429) or failed (5xx, connection error) request is put
+back on the queue with a delay instead of sleeping inside the request, so
+the workers keep serving other queued requests while it backs off.
+
+Backoff is tracked per endpoint:
+- Retry-After is honored when the server sends it.
+- Otherwise jittered exponential backoff is used.
+- While an endpoint is backing off, its queued requests wait and requests
+  to other endpoints proceed.
+
+An optional TokenBucket paces all requests the same way, by deferring
+rather than sleeping.
+"""
+
+import heapq
+import itertools
+import random
+import threading
+import time
+from concurrent.futures import Future
+from email.utils import parsedate_to_datetime
+
+import requests
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BASE_DELAY = 1.0
+DEFAULT_MAX_DELAY = 60.0
+
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header.
+
+    Args:
+        value (str): Delay in seconds or an HTTP date.
+
+    Returns:
+        float: Seconds to wait, or None if the header is missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class _EndpointState:
+    def __init__(self):
+        self.failures = 0
+        self.blocked_until = 0.0
+        self.retries = 0
+        self.throttled = 0
+
+
+class _Job:
+    def __init__(self, endpoint, send, args, kwargs):
+        self.endpoint = endpoint
+        self.send = send
+        self.args = args
+        self.kwargs = kwargs
+        self.future = Future()
+        self.attempts = 0
+        self.reserved = False
+        self.queued_at = time.monotonic()
+
+
+class RequestScheduler:
+    def __init__(self, workers=DEFAULT_WORKERS, rate_limiter=None, max_retries=DEFAULT_MAX_RETRIES,
+                 base_delay=DEFAULT_BASE_DELAY, max_delay=DEFAULT_MAX_DELAY, retry_statuses=RETRY_STATUSES,
+                 rng=None):
+        """
+        Initialize the scheduler. Worker threads start on the first submit.
+
+        Args:
+            workers (int): Number of requests sent concurrently.
+            rate_limiter (TokenBucket): Optional limiter shared by all endpoints.
+            max_retries (int): Retries per request before the last response
+                (or error) is returned to the caller.
+            base_delay (float): First backoff delay in seconds.
+            max_delay (float): Cap for the backoff delay in seconds.
+            retry_statuses (tuple): HTTP status codes that are retried.
+            rng (random.Random): Source of backoff jitter.
+        """
+        self.workers = workers
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = frozenset(retry_statuses)
+        self.rng = rng if rng is not None else random.Random()
+
+        self._queue = []  # heap of (ready_at, sequence, job)
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._endpoints = {}
+        self._threads = []
+        self._closed = False
+
+        self._in_flight = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._sends = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def submit(self, endpoint, send, *args, **kwargs) -> Future:
+        """
+        Queue a request.
+
+        Args:
+            endpoint (str): Backoff key, e.g. "pricehistory" or "quotes".
+            send (callable): Sends the request and returns a requests.Response,
+                e.g. http_client.get.
+            *args, **kwargs: Passed to send.
+
+        Returns:
+            Future: Resolves to the final response. Retryable statuses are
+                only returned once retries are exhausted.
+        """
+        job = _Job(endpoint, send, args, kwargs)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("RequestScheduler is closed")
+            if not self._threads:
+                self._start_workers()
+            self._submitted += 1
+            self._endpoints.setdefault(endpoint, _EndpointState())
+            self._push(job, job.queued_at)
+        return job.future
+
+    def request(self, endpoint, send, *args, **kwargs):
+        """Submit a request and wait for its response."""
+        return self.submit(endpoint, send, *args, **kwargs).result()
+
+    def close(self, wait=True):
+        """Stop the workers and cancel requests that have not been sent."""
+        with self._condition:
+            self._closed = True
+            pending, self._queue = self._queue, []
+            self._condition.notify_all()
+        for _, _, job in pending:
+            job.future.cancel()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def metrics(self):
+        """
+        Snapshot of scheduler metrics.
+
+        Returns:
+            dict: Queue depth, in-flight count, request counters, queue wait
+                times in seconds and per-endpoint retry/throttle counts.
+        """
+        now = time.monotonic()
+        with self._condition:
+            return {
+                "queue_depth": len(self._queue),
+                "in_flight": self._in_flight,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "retries": sum(state.retries for state in self._endpoints.values()),
+                "throttled": sum(state.throttled for state in self._endpoints.values()),
+                "avg_wait_s": self._total_wait / self._sends if self._sends else 0.0,
+                "max_wait_s": self._max_wait,
+                "endpoints": {
+                    endpoint: {
+                        "retries": state.retries,
+                        "throttled": state.throttled,
+                        "backoff_remaining_s": max(0.0, state.blocked_until - now),
+                    }
+                    for endpoint, state in self._endpoints.items()
+                },
+            }
+
+    def _start_workers(self):
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"RequestScheduler-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _push(self, job, ready_at):
+        # Caller holds the condition
+        job.queued_at = time.monotonic()
+        heapq.heappush(self._queue, (ready_at, next(self._sequence), job))
+        self._condition.notify()
+
+    def _defer(self, job, ready_at):
+        with self._condition:
+            if self._closed:
+                job.future.cancel()
+                return
+            self._push(job, ready_at)
+
+    def _next_job(self):
+        """Wait for the next job whose ready time has passed (None once closed)."""
+        with self._condition:
+            while True:
+                if self._closed:
+                    return None
+                now = time.monotonic()
+                if self._queue and self._queue[0][0] <= now:
+                    return heapq.heappop(self._queue)[2]
+                timeout = self._queue[0][0] - now if self._queue else None
+                self._condition.wait(timeout)
+
+    def _worker(self):
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            if job.future.cancelled():
+                continue
+            self._dispatch(job)
+
+    def _backoff_delay(self, state, response):
+        """Retry-After if given, else capped exponential backoff with jitter."""
+        retry_after = parse_retry_after(response.headers.get("Retry-After")) if response is not None else None
+        if retry_after is not None:
+            return retry_after
+        cap = min(self.max_delay, self.base_delay * 2 ** (state.failures - 1))
+        return cap / 2 + self.rng.uniform(0, cap / 2)
+
+    def _dispatch(self, job):
+        now = time.monotonic()
+        with self._condition:
+            state = self._endpoints[job.endpoint]
+            blocked_until = state.blocked_until
+
+        # Endpoint is backing off: requeue without sending
+        if blocked_until > now:
+            self._defer(job, blocked_until)
+            return
+
+        # Rate limit: take a token now, send once it is due
+        if self.rate_limiter is not None and not job.reserved:
+            job.reserved = True
+            wait = self.rate_limiter.reserve()
+            if wait > 0:
+                self._defer(job, now + wait)
+                return
+        job.reserved = False
+
+        with self._condition:
+            wait = now - job.queued_at
+            self._sends += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+            self._in_flight += 1
+
+        response, error = None, None
+        try:
+            response = job.send(*job.args, **job.kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            error = e
+        except Exception as e:
+            with self._condition:
+                self._in_flight -= 1
+                self._failed += 1
+            job.future.set_exception(e)
+            return
+
+        job.attempts += 1
+        retryable = error is not None or response.status_code in self.retry_statuses
+
+        with self._condition:
+            self._in_flight -= 1
+            if retryable:
+                state.failures += 1
+                if response is not None and response.status_code == 429:
+                    state.throttled += 1
+            else:
+                state.failures = 0
+
+            if retryable and job.attempts <= self.max_retries:
+                state.retries += 1
+                delay = self._backoff_delay(state, response)
+                ready_at = time.monotonic() + delay
+                # Hold back the whole endpoint, not just this request
+                state.blocked_until = max(state.blocked_until, ready_at)
+                if not self._closed:
+                    self._push(job, ready_at)
+                    return
+                job.future.cancel()
+                return
+
+            if error is not None:
+                self._failed += 1
+            else:
+                self._completed += 1
+
+        if error is not None:
+            job.future.set_exception(error)
+        else:
+            job.future.set_result(response)
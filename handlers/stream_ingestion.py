@@ -0,0 +1,249 @@
+#stream_ingestion.py
+
+"""
+Streaming quote/bar ingestion with per-symbol intraday state.
+
+StreamIngestionService keeps one persistent connection to a newline-delimited
+JSON market feed (see replay_server.py for the protocol) and reconnects with
+backoff if it drops. Every message updates an in-memory SymbolState. The
+threshold breach check, low <= prev_close * (1 - threshold_pct / 100), runs
+on every quote tick, so a breach fires intraday as soon as the price trades
+through the threshold instead of after the daily bar completes.
+
+Usage:
+    python handlers/replay_server.py --speed 0 &
+    python handlers/stream_ingestion.py AAPL MSFT --threshold 68=0.8 --threshold 95=2.0
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+from typing import Callable, Dict, Optional
+
+sys.path.append(os.path.dirname(__file__))
+from replay_server import DEFAULT_HOST, DEFAULT_PORT
+
+
+class SymbolState:
+    def __init__(self, symbol, threshold_pcts=None, prev_close=None):
+        """
+        Rolling intraday state for one symbol.
+
+        Args:
+            symbol (str): The stock symbol.
+            threshold_pcts (dict): Threshold label -> gap percentage below
+                prev_close, e.g. {68: 0.8, 95: 2.0}.
+            prev_close (float): Previous session close, if known at start.
+        """
+        self.symbol = symbol
+        self.threshold_pcts = dict(threshold_pcts or {})
+        self.prev_close = prev_close
+        self.threshold_prices = {}
+        self.breached = set()
+        self.last = None
+        self.session_open = None
+        self.session_high = -math.inf
+        self.session_low = math.inf
+        self.updated_at = None
+        self._reset_thresholds()
+
+    def _reset_thresholds(self):
+        self.breached = set()
+        if self.prev_close is None:
+            self.threshold_prices = {}
+            return
+        self.threshold_prices = {label: self.prev_close * (1 - pct / 100)
+                                 for label, pct in self.threshold_pcts.items()}
+
+    def set_thresholds(self, threshold_pcts):
+        """Replace the threshold percentages and recompute the current threshold prices."""
+        self.threshold_pcts = dict(threshold_pcts)
+        breached = self.breached
+        self._reset_thresholds()
+        self.breached = breached & set(self.threshold_prices)
+
+    def update_price(self, price, timestamp):
+        """
+        Apply a trade/quote price.
+
+        Returns:
+            list: Threshold labels newly breached by this price.
+        """
+        if self.session_open is None:
+            self.session_open = price
+        self.last = price
+        self.session_high = max(self.session_high, price)
+        self.session_low = min(self.session_low, price)
+        self.updated_at = timestamp
+
+        fired = [label for label, level in self.threshold_prices.items()
+                 if label not in self.breached and self.session_low <= level]
+        self.breached.update(fired)
+        return fired
+
+    def close_bar(self, bar):
+        """
+        Apply a completed bar and roll over to the next session.
+
+        Returns:
+            list: Threshold labels breached by the bar's low that no tick reported.
+        """
+        fired = self.update_price(bar["low"], bar["datetime"])
+        self.prev_close = bar["close"]
+        self.last = bar["close"]
+        self.session_open = None
+        self.session_high = -math.inf
+        self.session_low = math.inf
+        self._reset_thresholds()
+        return fired
+
+
+class StreamIngestionService:
+    def __init__(self, symbols, host=DEFAULT_HOST, port=DEFAULT_PORT, thresholds=None,
+                 on_breach: Optional[Callable] = None, on_bar: Optional[Callable] = None,
+                 reconnect_delay=1.0, max_reconnect_delay=30.0):
+        """
+        Initialize the ingestion service.
+
+        Args:
+            symbols (list): Symbols to subscribe to.
+            host (str): Feed host.
+            port (int): Feed port.
+            thresholds (dict): Threshold percentages for every symbol
+                ({label: pct}), or per symbol ({symbol: {label: pct}}).
+            on_breach (callable): Called as on_breach(state, label, price, timestamp)
+                when a threshold is breached.
+            on_bar (callable): Called as on_bar(state, bar) after each completed bar.
+            reconnect_delay (float): First reconnect delay in seconds.
+            max_reconnect_delay (float): Cap for the reconnect delay in seconds.
+        """
+        self.symbols = [symbol.upper() for symbol in symbols]
+        self.host = host
+        self.port = port
+        self.on_breach = on_breach
+        self.on_bar = on_bar
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+
+        thresholds = thresholds or {}
+        per_symbol = all(isinstance(value, dict) for value in thresholds.values()) and bool(thresholds)
+        self.states: Dict[str, SymbolState] = {
+            symbol: SymbolState(symbol, thresholds.get(symbol, {}) if per_symbol else thresholds)
+            for symbol in self.symbols
+        }
+
+        self.messages = 0
+        self.breaches = 0
+        self.reconnects = 0
+        self._stopped = False
+
+    def stop(self):
+        self._stopped = True
+
+    async def run(self, reconnect=True):
+        """
+        Consume the feed until it ends or stop() is called.
+
+        Args:
+            reconnect (bool): Reconnect with exponential backoff when the
+                connection drops before the feed ends.
+        """
+        delay = self.reconnect_delay
+        while not self._stopped:
+            try:
+                reader, writer = await asyncio.open_connection(self.host, self.port)
+            except OSError as e:
+                if not reconnect:
+                    raise
+                print(f"ERROR: [StreamIngestionService] Connection failed: {e}, retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+                continue
+
+            delay = self.reconnect_delay
+            try:
+                writer.write(json.dumps({"command": "SUBS", "symbols": self.symbols}).encode() + b"\n")
+                await writer.drain()
+                if await self._consume(reader):
+                    return
+            except (ConnectionError, asyncio.IncompleteReadError) as e:
+                print(f"ERROR: [StreamIngestionService] Connection lost: {e}")
+            finally:
+                writer.close()
+
+            if not reconnect:
+                return
+            self.reconnects += 1
+
+    async def _consume(self, reader):
+        """Process messages; returns True once the feed sends its end marker."""
+        while not self._stopped:
+            line = await reader.readline()
+            if not line:
+                return False
+            message = json.loads(line)
+            self.messages += 1
+            if message["type"] == "end":
+                return True
+            self.handle_message(message)
+        return True
+
+    def handle_message(self, message):
+        """Update symbol state from one feed message and fire callbacks."""
+        state = self.states.get(message.get("symbol"))
+        if state is None:
+            return
+
+        if message["type"] == "quote":
+            price = message["last"]
+            fired = state.update_price(price, message["datetime"])
+        elif message["type"] == "bar":
+            price = message["low"]
+            fired = state.close_bar(message)
+        else:
+            return
+
+        for label in fired:
+            self.breaches += 1
+            if self.on_breach is not None:
+                self.on_breach(state, label, price, message["datetime"])
+
+        if message["type"] == "bar" and self.on_bar is not None:
+            self.on_bar(state, message)
+
+
+def _parse_threshold(value):
+    label, pct = value.split("=")
+    return (int(label) if label.isdigit() else label), float(pct)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Consume a streaming market feed and report threshold breaches")
+    parser.add_argument('symbols', nargs='+', help='Symbols to subscribe to')
+    parser.add_argument('--host', type=str, default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--threshold', type=_parse_threshold, action='append', default=[],
+                        help='Threshold as LABEL=PCT below prev close, e.g. 95=2.0 (repeatable)')
+    parser.add_argument('--quiet', action='store_true', help='Only print the final summary')
+    args = parser.parse_args()
+
+    def report(state, label, price, timestamp):
+        if not args.quiet:
+            print(f"{time.strftime('%Y-%m-%d', time.gmtime(timestamp / 1000))} {state.symbol} "
+                  f"breached {label}: {price:.2f} <= {state.threshold_prices[label]:.2f}")
+
+    service = StreamIngestionService(args.symbols, host=args.host, port=args.port,
+                                     thresholds=dict(args.threshold), on_breach=report)
+    start = time.perf_counter()
+    asyncio.run(service.run(reconnect=False))
+    elapsed = time.perf_counter() - start
+    print(f"\n{service.messages} messages, {service.breaches} breaches in {elapsed:.2f}s "
+          f"({service.messages / elapsed:,.0f} msg/s)")
+
+
+if __name__ == "__main__":
+    main()
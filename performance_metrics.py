@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Vectorized Performance Metrics - Sample Implementation
+
+Trade and equity-curve statistics shared by the analyzer and the visualizer.
+Inputs are per-bar arrays: pnl holds the realized PnL on bars that closed a
+trade (NaN or 0 elsewhere, unless an explicit trade mask is given) and
+equity the account value after each bar.
+Every metric is a reduction over the last axis, so a 2-D array of shape
+(n_curves, n_bars) - e.g. one row per parameter set of a sweep - is
+evaluated in the same NumPy calls as a single curve.
+
+Metrics:
+- trades: count, winners, losers, win rate, average/largest win and loss
+- profit factor: gross profit / gross loss
+- drawdown: deepest drop below the running peak, in dollars and % of that peak
+- Sharpe / Sortino: annualized from per-bar equity returns
+- exposure: % of bars with an open position
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional
+
+TRADING_DAYS_PER_YEAR = 252
+# Bars per block of curves; keeps the per-bar temporaries cache-resident
+BLOCK_ELEMENTS = 1 << 16
+
+
+def infer_periods_per_year(timestamps) -> float:
+    """
+    Bars per year for annualizing Sharpe/Sortino
+
+    Args:
+        timestamps: Bar timestamps (anything pd.to_datetime accepts)
+
+    Returns:
+        TRADING_DAYS_PER_YEAR times the median number of bars per trading day
+    """
+    dates = pd.to_datetime(pd.Series(timestamps)).dt.normalize()
+    if dates.empty:
+        return float(TRADING_DAYS_PER_YEAR)
+    return float(TRADING_DAYS_PER_YEAR * dates.value_counts().median())
+
+
+def drawdown(equity: np.ndarray):
+    """
+    Running peak and drawdown along the last axis
+
+    NaN bars are skipped by the running peak and stay NaN in the drawdown.
+
+    Returns:
+        (running_peak, drawdown, drawdown_pct): drawdown is equity minus the
+        running peak (<= 0), drawdown_pct the same as a percent of that peak
+    """
+    equity = np.asarray(equity, dtype=float)
+    running_peak = np.fmax.accumulate(equity, axis=-1)
+    dd = equity - running_peak
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dd_pct = dd / running_peak * 100
+    return running_peak, dd, dd_pct
+
+
+def performance_metrics(pnl: np.ndarray, equity: np.ndarray,
+                        in_position: Optional[np.ndarray] = None,
+                        initial_capital=None,
+                        periods_per_year: float = TRADING_DAYS_PER_YEAR,
+                        is_trade: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """
+    Trade, drawdown and risk-adjusted metrics for one or many equity curves
+
+    Args:
+        pnl: Per-bar realized PnL, shape (n_bars,) or (n_curves, n_bars);
+            bars where it is NaN or 0 are not trades unless is_trade says so
+        equity: Account value after each bar, same shape as pnl
+        in_position: Boolean mask of bars with an open position (exposure is
+            NaN without it)
+        initial_capital: Starting capital, scalar or one per curve; inferred
+            as the first equity value minus the first bar's PnL when omitted
+        periods_per_year: Bars per year used to annualize Sharpe/Sortino
+        is_trade: Boolean mask of bars that closed a trade, e.g. to count
+            breakeven (0 PnL) exits; defaults to finite, non-zero pnl
+
+    Returns:
+        Dictionary of metrics; each value is a scalar for 1-D input or an
+        array of shape (n_curves,) for 2-D input
+    """
+    pnl = np.asarray(pnl, dtype=float)
+    equity = np.asarray(equity, dtype=float)
+    if pnl.shape != equity.shape:
+        raise ValueError(f"pnl and equity must have the same shape, got {pnl.shape} and {equity.shape}")
+    if pnl.ndim == 1:
+        metrics = _block_metrics(pnl, equity, in_position, initial_capital, periods_per_year, is_trade)
+        return {key: value.item() for key, value in metrics.items()}
+
+    # Curves are evaluated a block of rows at a time
+    n_curves, n_bars = pnl.shape
+    step = max(1, BLOCK_ELEMENTS // max(n_bars, 1))
+    if initial_capital is not None:
+        initial_capital = np.broadcast_to(np.asarray(initial_capital, dtype=float), (n_curves,))
+    blocks = [
+        _block_metrics(pnl[start:start + step], equity[start:start + step],
+                       None if in_position is None else in_position[start:start + step],
+                       None if initial_capital is None else initial_capital[start:start + step],
+                       periods_per_year,
+                       None if is_trade is None else is_trade[start:start + step])
+        for start in range(0, n_curves, step)
+    ]
+    return {key: np.concatenate([block[key] for block in blocks]) for key in blocks[0]}
+
+
+def _block_metrics(pnl: np.ndarray, equity: np.ndarray, in_position, initial_capital,
+                   periods_per_year: float, is_trade=None) -> Dict[str, np.ndarray]:
+    """performance_metrics for one block of curves (no chunking, arrays out)"""
+    if is_trade is None:
+        is_trade = np.isfinite(pnl) & (pnl != 0)
+    else:
+        is_trade = np.asarray(is_trade, dtype=bool) & np.isfinite(pnl)
+    trade_pnl = np.where(is_trade, pnl, 0.0)
+    wins = trade_pnl > 0
+    losses = trade_pnl < 0
+
+    total_trades = is_trade.sum(axis=-1)
+    winning_trades = wins.sum(axis=-1)
+    losing_trades = losses.sum(axis=-1)
+    total_pnl = trade_pnl.sum(axis=-1)
+    gross_profit = np.where(wins, trade_pnl, 0.0).sum(axis=-1)
+    gross_loss = np.where(losses, -trade_pnl, 0.0).sum(axis=-1)
+
+    has_trades = total_trades > 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        win_rate = np.where(has_trades, winning_trades / total_trades * 100, 0.0)
+        avg_pnl = np.where(has_trades, total_pnl / total_trades, 0.0)
+        profit_factor = np.where(gross_loss > 0, gross_profit / gross_loss,
+                                 np.where(has_trades, np.inf, np.nan))
+    max_win = np.where(has_trades, np.where(is_trade, pnl, -np.inf).max(axis=-1), np.nan)
+    max_loss = np.where(has_trades, np.where(is_trade, pnl, np.inf).min(axis=-1), np.nan)
+
+    # Drawdown against the running peak
+    _, dd, dd_pct = drawdown(equity)
+    valid = np.isfinite(equity)
+    any_valid = valid.any(axis=-1)
+    max_drawdown = np.where(any_valid, np.fmin.reduce(dd, axis=-1), 0.0)
+    max_drawdown_pct = np.where(any_valid, np.fmin.reduce(dd_pct, axis=-1), 0.0)
+
+    # Capital at both ends of the curve
+    if initial_capital is None:
+        initial_capital = equity[..., 0] - trade_pnl[..., 0]
+    initial_capital = np.broadcast_to(np.asarray(initial_capital, dtype=float), total_pnl.shape)
+    last_valid = equity.shape[-1] - 1 - np.argmax(valid[..., ::-1], axis=-1)
+    final_capital = np.where(any_valid,
+                             np.take_along_axis(equity, last_valid[..., None], axis=-1)[..., 0],
+                             initial_capital + total_pnl)
+
+    # Per-bar returns; NaN bars are left out of the moments
+    returns = np.diff(equity, axis=-1) / equity[..., :-1]
+    n_returns = np.isfinite(returns).sum(axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_return = np.nansum(returns, axis=-1) / n_returns
+        deviation = np.where(np.isfinite(returns), returns - mean_return[..., None], 0.0)
+        volatility = np.sqrt((deviation ** 2).sum(axis=-1) / (n_returns - 1))
+        downside = np.sqrt((np.minimum(np.nan_to_num(returns), 0.0) ** 2).sum(axis=-1) / n_returns)
+        scale = np.sqrt(periods_per_year)
+        sharpe_ratio = np.where(volatility > 0, mean_return / volatility * scale, np.nan)
+        sortino_ratio = np.where(downside > 0, mean_return / downside * scale, np.nan)
+        roi = (final_capital - initial_capital) / initial_capital * 100
+
+    if in_position is None:
+        exposure = np.full(total_pnl.shape, np.nan)
+    else:
+        exposure = np.asarray(in_position, dtype=bool).mean(axis=-1) * 100
+
+    return {
+        'total_trades': total_trades,
+        'winning_trades': winning_trades,
+        'losing_trades': losing_trades,
+        'win_rate': win_rate,
+        'total_pnl': total_pnl,
+        'avg_pnl': avg_pnl,
+        'max_win': max_win,
+        'max_loss': max_loss,
+        'initial_capital': initial_capital,
+        'final_capital': final_capital,
+        'roi': roi,
+        'max_drawdown': max_drawdown,
+        'max_drawdown_pct': max_drawdown_pct,
+        'profit_factor': profit_factor,
+        'gross_profit': gross_profit,
+        'gross_loss': gross_loss,
+        'sharpe_ratio': sharpe_ratio,
+        'sortino_ratio': sortino_ratio,
+        'exposure': exposure
+    }
@@ -27,14 +27,31 @@ import seaborn as sns
 import os
 import time
 import argparse
+import bisect
 import logging
 import warnings
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional, Tuple, Union
 from dataclasses import dataclass
 from scipy import stats
 import json
 
+from sample_bootstrap import SampleBootstrapEngine, BOOTSTRAP_METHODS
+from performance_metrics import performance_metrics
+
+try:
+    from sortedcontainers import SortedList
+except ImportError:  # Optional dependency - fall back to a bisect-backed list
+    SortedList = None
+
+try:
+    from numba import njit
+except ImportError:  # Optional dependency - the NumPy state machine is used instead
+    njit = None
+
 # Suppress warnings for cleaner output
 warnings.filterwarnings('ignore')
 
@@ -59,92 +76,359 @@ class SampleAnalysisConfig:
     transaction_cost: float = 0.001  # 0.1% transaction cost
     min_sample_size: int = 30
     significance_level: float = 0.05
+    mc_batch_memory_mb: float = 64.0  # Memory budget per permutation batch
+    bootstrap_method: str = 'percentile'  # percentile, bca or block
+    bootstrap_block_size: int = 5  # Block length for the block bootstrap
+    bootstrap_confidence: float = 0.95
+    random_seed: Optional[int] = None  # Root seed for per-symbol RNG streams
     
     def __post_init__(self):
         if self.confidence_levels is None:
             self.confidence_levels = [0.68, 0.90, 0.95]  # Sample confidence levels
 
+GAP_DISTRIBUTIONS = ('normal', 'student_t')
+
 class SampleDataHandler:
     """Sample data handler - replace with your own data source"""
     
-    def __init__(self):
+    # Generated locally, so there is no remote API to throttle between symbols
+    is_local = True
+    
+    def __init__(self, seed: int = 42):
+        """
+        Args:
+            seed: Base seed; each symbol derives its own stream from it
+        """
         logger.info("Initializing sample data handler")
+        self.seed = seed
+        
+    def _symbol_rng(self, symbol: str, seed: Optional[int] = None) -> np.random.Generator:
+        """Reproducible per-symbol generator (explicit seed wins over the base seed)"""
+        if seed is not None:
+            return np.random.default_rng(seed)
+        return np.random.default_rng([self.seed, zlib.crc32(symbol.encode())])
+    
+    def _sample_timestamps(self, days: int, freq: str) -> Tuple[pd.DatetimeIndex, np.ndarray]:
+        """
+        Bar timestamps and a mask of bars that open a new session
+        
+        Daily (or coarser) frequencies span the calendar like before; intraday
+        frequencies fill 09:30-16:00 on business days.
+        """
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=days)
         
-    def fetch_sample_data(self, symbol: str, days: int = 500) -> pd.DataFrame:
+        try:
+            intraday = pd.Timedelta(freq) < pd.Timedelta(days=1)
+        except ValueError:
+            intraday = False
+        
+        if not intraday:
+            dates = pd.date_range(start=start_date, end=end_date, freq=freq)
+            return dates, np.ones(len(dates), dtype=bool)
+        
+        sessions = pd.bdate_range(start=start_date.date(), end=end_date.date())
+        offsets = pd.timedelta_range(start='9h30min', end='15h59min', freq=freq)
+        dates = pd.DatetimeIndex((sessions.values[:, None] + offsets.values[None, :]).ravel())
+        session_open = np.tile(np.arange(len(offsets)) == 0, len(sessions))
+        return dates, session_open
+    
+    def fetch_sample_data(self, symbol: str, days: int = 500, freq: str = 'D',
+                          drift: float = 0.0005, volatility: float = 0.02,
+                          gap_std: float = 0.005, gap_distribution: str = 'normal',
+                          gap_df: float = 3.0, range_volatility: float = 0.01,
+                          base_price: float = 100.0, seed: Optional[int] = None) -> pd.DataFrame:
         """
         Generate sample OHLCV data for demonstration purposes
         Replace this with your actual data fetching logic
         
         Args:
             symbol: Stock symbol
-            days: Number of days of sample data
+            days: Number of calendar days of sample data
+            freq: Bar frequency ('D', or intraday such as '5min')
+            drift: Mean return per bar
+            volatility: Return standard deviation per bar
+            gap_std: Standard deviation of the gap at each session open
+            gap_distribution: 'normal' or 'student_t' (fat-tailed gaps)
+            gap_df: Degrees of freedom for student_t gaps
+            range_volatility: Scale of the high/low range around the close
+            base_price: Starting price
+            seed: Explicit seed (defaults to one derived from the symbol)
             
         Returns:
             DataFrame with sample OHLCV data
         """
         logger.info(f"Generating sample data for {symbol}")
         
-        # Generate sample dates
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days)
-        dates = pd.date_range(start=start_date, end=end_date, freq='D')
-        
-        # Generate sample price data with realistic patterns
-        np.random.seed(42)  # For reproducible sample data
-        
-        # Start with a base price
-        base_price = 100.0
-        prices = [base_price]
-        
-        # Generate realistic price movements
-        for i in range(1, len(dates)):
-            # Add some trend and volatility
-            daily_return = np.random.normal(0.0005, 0.02)  # ~0.05% daily return, 2% volatility
-            new_price = prices[-1] * (1 + daily_return)
-            prices.append(max(new_price, 1.0))  # Ensure price stays positive
-        
-        # Create OHLC from close prices
-        df_data = []
-        for i, (date, close) in enumerate(zip(dates, prices)):
-            # Generate realistic OHLC from close price
-            volatility = abs(np.random.normal(0, 0.01))  # Daily volatility
-            
-            high = close * (1 + volatility * np.random.uniform(0, 1))
-            low = close * (1 - volatility * np.random.uniform(0, 1))
-            
-            if i == 0:
-                open_price = close
-            else:
-                # Add overnight gap
-                gap = np.random.normal(0, 0.005)  # Small overnight gaps
-                open_price = prices[i-1] * (1 + gap)
-            
-            # Ensure OHLC relationships are valid
-            high = max(high, open_price, close)
-            low = min(low, open_price, close)
+        if gap_distribution not in GAP_DISTRIBUTIONS:
+            raise ValueError(f"Invalid gap distribution: {gap_distribution}. Must be one of {GAP_DISTRIBUTIONS}")
+        
+        dates, session_open = self._sample_timestamps(days, freq)
+        n_bars = len(dates)
+        rng = self._symbol_rng(symbol, seed)
+        
+        # Close prices as a cumulative product of returns
+        returns = rng.normal(drift, volatility, n_bars)
+        returns[0] = 0.0
+        close = np.maximum(base_price * np.cumprod(1 + returns), 1.0)  # Ensure price stays positive
+        
+        # Opens gap away from the previous close at each session open
+        if gap_distribution == 'student_t':
+            gaps = rng.standard_t(gap_df, n_bars) * gap_std * np.sqrt((gap_df - 2) / gap_df)
+        else:
+            gaps = rng.normal(0, gap_std, n_bars)
+        gaps = np.where(session_open, gaps, 0.0)
+        open_price = np.empty(n_bars)
+        open_price[0] = close[0]
+        open_price[1:] = close[:-1] * (1 + gaps[1:])
+        
+        # High/low around the close, then enforce valid OHLC relationships
+        bar_range = np.abs(rng.normal(0, range_volatility, n_bars))
+        high = close * (1 + bar_range * rng.uniform(0, 1, n_bars))
+        low = close * (1 - bar_range * rng.uniform(0, 1, n_bars))
+        high = np.maximum.reduce([high, open_price, close])
+        low = np.minimum.reduce([low, open_price, close])
+        
+        volume = rng.uniform(100000, 1000000, n_bars).astype(np.int64)  # Sample volume
+        
+        df = pd.DataFrame({
+            'datetime': dates,
+            'open': np.round(open_price, 2),
+            'high': np.round(high, 2),
+            'low': np.round(low, 2),
+            'close': np.round(close, 2),
+            'volume': volume
+        })
+        
+        logger.info(f"Generated {len(df)} bars of sample data for {symbol}")
+        return df
+    
+    def fetch_sample_panel(self, symbols: List[str], **kwargs) -> pd.DataFrame:
+        """
+        Generate sample data for many symbols as one long-format DataFrame
+        
+        Every symbol uses its own seed stream, so a symbol's bars are the same
+        whether it is generated alone or as part of a panel.
+        
+        Args:
+            symbols: Stock symbols
+            **kwargs: Generator parameters passed to fetch_sample_data
             
-            volume = int(np.random.uniform(100000, 1000000))  # Sample volume
+        Returns:
+            DataFrame with a symbol column followed by OHLCV columns
+        """
+        frames = [self.fetch_sample_data(symbol, **kwargs) for symbol in symbols]
+        if not frames:
+            return pd.DataFrame()
+        
+        panel = pd.concat(frames, ignore_index=True)
+        panel.insert(0, 'symbol', np.repeat(symbols, [len(frame) for frame in frames]))
+        return panel
+
+class _BisectSortedList:
+    """Minimal sorted list used when sortedcontainers is not installed"""
+    
+    def __init__(self):
+        self._values = []
+        
+    def add(self, value: float):
+        bisect.insort(self._values, value)
+        
+    def remove(self, value: float):
+        del self._values[bisect.bisect_left(self._values, value)]
+        
+    def __len__(self) -> int:
+        return len(self._values)
+    
+    def __getitem__(self, index: int) -> float:
+        return self._values[index]
+
+class SampleRollingQuantileEngine:
+    """
+    Incremental expanding/rolling quantile engine
+    
+    Keeps observations in a sorted container so each update costs O(log n)
+    and each quantile lookup is an index into the sorted values, instead of
+    re-sorting the full history for every bar.
+    """
+    
+    def __init__(self, window: Optional[int] = None):
+        """
+        Args:
+            window: Number of most recent observations to keep (None = expanding)
+        """
+        self.window = window
+        self._sorted = SortedList() if SortedList is not None else _BisectSortedList()
+        self._recent = deque()
+        
+    def update(self, value: float):
+        """Add a new observation, ignoring NaN values like Series.dropna()"""
+        if np.isnan(value):
+            return
+        
+        self._sorted.add(value)
+        
+        if self.window is not None:
+            self._recent.append(value)
+            if len(self._recent) > self.window:
+                self._sorted.remove(self._recent.popleft())
+    
+    def __len__(self) -> int:
+        return len(self._sorted)
+    
+    def observations(self) -> List[float]:
+        """Current observations, oldest first for a rolling window"""
+        return list(self._recent) if self.window is not None else list(self._sorted)
+    
+    def quantile(self, q: float) -> float:
+        """
+        Quantile of the current observations
+        
+        Uses the same linear interpolation as pandas/numpy so results match
+        Series.quantile(q) on the same values.
+        """
+        n = len(self._sorted)
+        if n == 0:
+            return np.nan
+        
+        position = (n - 1) * q
+        lower = int(np.floor(position))
+        upper = min(lower + 1, n - 1)
+        gamma = position - lower
+        
+        lower_value = self._sorted[lower]
+        diff = self._sorted[upper] - lower_value
+        if gamma >= 0.5:
+            return self._sorted[upper] - diff * (1 - gamma)
+        return lower_value + diff * gamma
+
+class LiveThresholdState:
+    """
+    Incremental per-symbol threshold state for live decisions
+    
+    Holds prev_close, the gap distribution and the threshold prices for the
+    next bar. Each completed bar is one O(log n) update instead of re-running
+    calculate_basic_metrics and the thresholds over the whole history. The
+    prices equal the apply_sample_thresholds values for the bar after the
+    last one applied. The state can be snapshotted to JSON, so a restart
+    resumes without replaying price history.
+    """
+    
+    def __init__(self, symbol: str, config: SampleAnalysisConfig, min_periods: int = 30,
+                 window: Optional[int] = None):
+        """
+        Args:
+            symbol: Stock symbol
+            config: Analysis configuration (confidence levels, min sample size)
+            min_periods: First bar that receives a threshold
+            window: Rolling window of gap observations (None = expanding)
+        """
+        self.symbol = symbol
+        self.config = config
+        self.min_periods = min_periods
+        self.engine = SampleRollingQuantileEngine(window)
+        self.prev_close = np.nan
+        self.n_bars = 0
+        self.threshold_pcts: Dict[str, float] = {}
+        self.threshold_prices: Dict[str, float] = {}
+    
+    @classmethod
+    def from_history(cls, symbol: str, df: pd.DataFrame, config: SampleAnalysisConfig,
+                     min_periods: int = 30, window: Optional[int] = None) -> 'LiveThresholdState':
+        """Build the state from historical bars (open/close columns, sorted by datetime)"""
+        state = cls(symbol, config, min_periods, window)
+        for open_price, close_price in zip(df['open'].to_numpy(dtype=float), df['close'].to_numpy(dtype=float)):
+            state.update(open_price, close_price, refresh=False)
+        state._refresh_thresholds()
+        return state
+    
+    def update(self, open_price: float, close_price: float, refresh: bool = True) -> Dict[str, float]:
+        """
+        Apply one completed bar
+        
+        Args:
+            open_price: Bar open
+            close_price: Bar close
+            refresh: Recompute threshold prices (skip while bulk loading)
             
-            df_data.append({
-                'datetime': date,
-                'open': round(open_price, 2),
-                'high': round(high, 2),
-                'low': round(low, 2),
-                'close': round(close, 2),
-                'volume': volume
-            })
+        Returns:
+            Threshold prices for the next bar
+        """
+        gap = (open_price - self.prev_close) / self.prev_close
+        self.engine.update(gap)
+        self.prev_close = close_price
+        self.n_bars += 1
+        if refresh:
+            self._refresh_thresholds()
+        return self.threshold_prices
+    
+    def _refresh_thresholds(self):
+        self.threshold_pcts = {}
+        self.threshold_prices = {}
+        if self.n_bars < self.min_periods or len(self.engine) < self.config.min_sample_size:
+            return
         
-        df = pd.DataFrame(df_data)
-        df = df.sort_values('datetime').reset_index(drop=True)
+        for conf_level in self.config.confidence_levels:
+            key = f'sample_threshold_{int(conf_level * 100)}'
+            threshold = max(abs(self.engine.quantile(1 - conf_level)) * 100, 0.5)  # Min 0.5%
+            self.threshold_pcts[key] = threshold
+            self.threshold_prices[key] = self.prev_close * (1 - threshold / 100)
+    
+    def signals(self, low: float) -> Dict[str, int]:
+        """Breach signals for the current bar's low (sample_signal_XX semantics)"""
+        return {key.replace('threshold', 'signal'): int(low <= price)
+                for key, price in self.threshold_prices.items()}
+    
+    def save(self, path: str):
+        """Atomically write a JSON snapshot of the state"""
+        snapshot = {
+            'symbol': self.symbol,
+            'confidence_levels': list(self.config.confidence_levels),
+            'min_sample_size': self.config.min_sample_size,
+            'min_periods': self.min_periods,
+            'window': self.engine.window,
+            'prev_close': None if np.isnan(self.prev_close) else self.prev_close,
+            'n_bars': self.n_bars,
+            'gaps': self.engine.observations(),
+        }
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, path)
+    
+    @classmethod
+    def load(cls, path: str, config: Optional[SampleAnalysisConfig] = None) -> 'LiveThresholdState':
+        """
+        Restore a snapshot written by save()
         
-        logger.info(f"Generated {len(df)} days of sample data for {symbol}")
-        return df
+        Args:
+            path: Snapshot file
+            config: Configuration to use (default: one with the snapshot's
+                confidence levels and min sample size)
+        """
+        with open(path, 'r') as f:
+            snapshot = json.load(f)
+        
+        if config is None:
+            config = SampleAnalysisConfig(confidence_levels=snapshot['confidence_levels'],
+                                          min_sample_size=snapshot['min_sample_size'])
+        state = cls(snapshot['symbol'], config, snapshot['min_periods'], snapshot['window'])
+        for gap in snapshot['gaps']:
+            state.engine.update(gap)
+        state.prev_close = np.nan if snapshot['prev_close'] is None else snapshot['prev_close']
+        state.n_bars = snapshot['n_bars']
+        state._refresh_thresholds()
+        return state
 
 class SampleStatisticalAnalyzer:
     """Sample statistical analysis engine - replace with your methodology"""
     
-    def __init__(self, config: SampleAnalysisConfig):
+    def __init__(self, config: SampleAnalysisConfig, rng: Optional[np.random.Generator] = None):
         self.config = config
+        self.rng = rng if rng is not None else np.random.default_rng()
         
     def calculate_basic_metrics(self, df: pd.DataFrame) -> pd.DataFrame:
         """Calculate basic price metrics - sample implementation"""
@@ -190,40 +474,65 @@ class SampleStatisticalAnalyzer:
         
         return thresholds
     
+    def calculate_rolling_thresholds(self, df: pd.DataFrame, min_periods: int = 30,
+                                     window: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Calculate point-in-time thresholds for every row in a single pass
+        
+        Row i only sees overnight gaps from rows before it, so the values match
+        calculate_sample_thresholds(df.iloc[:i]) without re-sorting the history.
+        
+        Args:
+            df: DataFrame with an overnight_gap column
+            min_periods: First row that receives a threshold
+            window: Rolling window of gap observations (None = expanding)
+            
+        Returns:
+            Dictionary of threshold percentage arrays (NaN where unavailable)
+        """
+        n = len(df)
+        thresholds = {
+            f'sample_threshold_{int(conf_level * 100)}': np.full(n, np.nan)
+            for conf_level in self.config.confidence_levels
+        }
+        
+        if 'overnight_gap' not in df.columns:
+            return thresholds
+        
+        overnight_gaps = df['overnight_gap'].to_numpy(dtype=float)
+        engine = SampleRollingQuantileEngine(window)
+        
+        for i in range(n):
+            if i >= min_periods and len(engine) >= self.config.min_sample_size:
+                for conf_level in self.config.confidence_levels:
+                    conf_pct = int(conf_level * 100)
+                    threshold = abs(engine.quantile(1 - conf_level)) * 100
+                    thresholds[f'sample_threshold_{conf_pct}'][i] = max(threshold, 0.5)  # Min 0.5%
+            
+            engine.update(overnight_gaps[i])
+        
+        return thresholds
+    
     def apply_sample_thresholds(self, df: pd.DataFrame) -> pd.DataFrame:
         """Apply sample thresholds - replace with your methodology"""
         result = df.copy()
         
-        # Initialize sample threshold columns
-        for conf_level in self.config.confidence_levels:
-            conf_pct = int(conf_level * 100)
-            result[f'sample_threshold_{conf_pct}'] = np.nan
-            result[f'sample_signal_{conf_pct}'] = 0
-        
         # Sample threshold application logic
         min_periods = 30
+        thresholds = self.calculate_rolling_thresholds(result, min_periods=min_periods)
         
-        for i in range(min_periods, len(result)):
-            historical_data = result.iloc[:i]
-            thresholds = self.calculate_sample_thresholds(historical_data)
-            
-            prev_close = result.iloc[i]['prev_close']
-            current_low = result.iloc[i]['low']
+        prev_close = result['prev_close'].to_numpy(dtype=float)
+        current_low = result['low'].to_numpy(dtype=float)
+        valid_rows = ~np.isnan(prev_close) & ~np.isnan(current_low)
+        
+        # Whole-column threshold prices and breach signals (NaN never breaches)
+        for conf_level in self.config.confidence_levels:
+            conf_pct = int(conf_level * 100)
+            threshold_pct = thresholds[f'sample_threshold_{conf_pct}']
+            threshold_price = np.where(valid_rows, prev_close * (1 - threshold_pct / 100), np.nan)
             
-            if pd.notna(prev_close) and pd.notna(current_low):
-                for conf_level in self.config.confidence_levels:
-                    conf_pct = int(conf_level * 100)
-                    threshold_key = f'sample_threshold_{conf_pct}'
-                    
-                    if threshold_key in thresholds:
-                        threshold_pct = thresholds[threshold_key]
-                        threshold_price = prev_close * (1 - threshold_pct / 100)
-                        
-                        result.iloc[i, result.columns.get_loc(f'sample_threshold_{conf_pct}')] = threshold_price
-                        
-                        # Sample signal generation
-                        if current_low <= threshold_price:
-                            result.iloc[i, result.columns.get_loc(f'sample_signal_{conf_pct}')] = 1
+            result[f'sample_threshold_{conf_pct}'] = threshold_price
+            result[f'sample_signal_{conf_pct}'] = (current_low <= threshold_price).astype(int)
         
         return result
     
@@ -244,14 +553,12 @@ class SampleStatisticalAnalyzer:
         actual_correlation = valid_data['overnight_gap'].corr(valid_data['recovery_indicator'])
         
         # Monte Carlo simulation
-        null_correlations = []
-        for _ in range(self.config.n_monte_carlo):
-            shuffled_recovery = np.random.permutation(valid_data['recovery_indicator'].values)
-            null_corr = np.corrcoef(valid_data['overnight_gap'].values, shuffled_recovery)[0, 1]
-            if not np.isnan(null_corr):
-                null_correlations.append(null_corr)
-        
-        null_correlations = np.array(null_correlations)
+        null_correlations = self._permutation_null_correlations(
+            valid_data['overnight_gap'].to_numpy(dtype=float),
+            valid_data['recovery_indicator'].to_numpy(dtype=float),
+            self.config.n_monte_carlo
+        )
+        
         p_value = np.mean(np.abs(null_correlations) >= np.abs(actual_correlation))
         
         results['sample_test'] = {
@@ -266,78 +573,304 @@ class SampleStatisticalAnalyzer:
         }
         
         return results
+    
+    def sample_bootstrap_analysis(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Bootstrap confidence intervals for the sample recovery statistics
+        
+        Recovery rate, mean recovery magnitude and per-threshold effectiveness
+        are all evaluated from the same n_bootstrap resamples.
+        """
+        valid_data = df[df['prev_close'].notna() & df['recovery_indicator'].notna()]
+        if len(valid_data) < self.config.min_sample_size:
+            return {}
+        
+        recovered = valid_data['recovery_indicator'].to_numpy(dtype=float)
+        ones = np.ones(len(valid_data))
+        recovery_magnitude = ((valid_data['high'] - valid_data['prev_close']) /
+                              valid_data['prev_close'] * 100).to_numpy(dtype=float)
+        
+        statistics = {
+            'recovery_rate': (recovered, ones),
+            # Mean magnitude over recovery days only
+            'recovery_magnitude': (recovery_magnitude * recovered, recovered)
+        }
+        
+        for conf_level in self.config.confidence_levels:
+            conf_pct = int(conf_level * 100)
+            signal_col = f'sample_signal_{conf_pct}'
+            if signal_col in valid_data.columns:
+                breached = valid_data[signal_col].to_numpy(dtype=float)
+                # Non-recovery rate after a breach minus the rate expected by chance
+                statistics[f'effectiveness_{conf_pct}'] = (
+                    breached * (1 - recovered) - breached * (1 - conf_level), breached
+                )
+        
+        engine = SampleBootstrapEngine(
+            n_bootstrap=self.config.n_bootstrap,
+            confidence_level=self.config.bootstrap_confidence,
+            method=self.config.bootstrap_method,
+            block_size=self.config.bootstrap_block_size,
+            rng=self.rng
+        )
+        intervals = engine.confidence_intervals(statistics)
+        
+        magnitude = intervals['recovery_magnitude']
+        results = {
+            'method': self.config.bootstrap_method,
+            'n_bootstrap': self.config.n_bootstrap,
+            'recovery_rate_ci': intervals['recovery_rate'],
+            'recovery_details': {
+                'avg_recovery_magnitude': magnitude['statistic'],
+                'recovery_magnitude_ci_lower': magnitude['ci_lower'],
+                'recovery_magnitude_ci_upper': magnitude['ci_upper']
+            },
+            'threshold_effectiveness': {}
+        }
+        
+        for conf_level in self.config.confidence_levels:
+            key = f'effectiveness_{int(conf_level * 100)}'
+            if key in intervals:
+                results['threshold_effectiveness'][f'{int(conf_level * 100)}%'] = intervals[key]
+        
+        return results
+    
+    def _permutation_null_correlations(self, x: np.ndarray, y: np.ndarray,
+                                       n_permutations: int) -> np.ndarray:
+        """
+        Correlations of x with n_permutations shuffles of y, computed in batches
+        
+        Shuffling y leaves its mean and norm unchanged, so each batch is a
+        (B, n) matrix of permuted centered y values and all B null correlations
+        come from one matrix-vector product. B is sized to mc_batch_memory_mb.
+        """
+        x_centered = x - x.mean()
+        y_centered = y - y.mean()
+        denominator = np.sqrt(x_centered @ x_centered) * np.sqrt(y_centered @ y_centered)
+        
+        if denominator == 0 or np.isnan(denominator):
+            return np.array([])  # Correlation undefined for constant series
+        
+        n = len(y_centered)
+        batch_size = max(1, int(self.config.mc_batch_memory_mb * 1024 ** 2 // (n * 8)))
+        null_correlations = np.empty(n_permutations)
+        
+        for start in range(0, n_permutations, batch_size):
+            stop = min(start + batch_size, n_permutations)
+            permuted = self.rng.permuted(np.tile(y_centered, (stop - start, 1)), axis=1)
+            null_correlations[start:stop] = permuted @ x_centered
+        
+        return null_correlations / denominator
+
+# Integer codes used by the position state machine
+SIGNAL_LABELS = np.array([None, 'ENTRY', 'EXIT'], dtype=object)
+POSITION_LABELS = np.array([None, 'OPEN', 'CLOSED'], dtype=object)
+
+def _position_state_machine_loop(entry_signal: np.ndarray, high: np.ndarray, close: np.ndarray,
+                                 profit_target: float, shares: int):
+    """
+    Per-bar position state machine over plain arrays
+    
+    Compiled with Numba when it is installed. Returns signal codes, position
+    codes (see SIGNAL_LABELS / POSITION_LABELS) and per-bar PnL.
+    """
+    n = len(high)
+    signal_codes = np.zeros(n, dtype=np.int8)
+    position_codes = np.zeros(n, dtype=np.int8)
+    pnl = np.full(n, np.nan)
+    
+    in_position = False
+    entry_price = 0.0
+    
+    for i in range(n):
+        if not in_position:
+            if entry_signal[i]:
+                entry_price = close[i]
+                in_position = True
+                signal_codes[i] = 1
+                position_codes[i] = 1
+        elif high[i] >= entry_price * profit_target:
+            pnl[i] = (high[i] - entry_price) * shares
+            in_position = False
+            signal_codes[i] = 2
+            position_codes[i] = 2
+        else:
+            position_codes[i] = 1
+    
+    return signal_codes, position_codes, pnl
+
+_position_state_machine_jit = njit(cache=True)(_position_state_machine_loop) if njit is not None else None
+
+def _first_index_at_or_above(values: np.ndarray, level: float, start: int, chunk: int = 64) -> int:
+    """Index of the first value >= level at or after start, or -1 if there is none"""
+    n = len(values)
+    
+    while start < n:
+        stop = min(start + chunk, n)
+        hits = np.flatnonzero(values[start:stop] >= level)
+        if len(hits) > 0:
+            return start + int(hits[0])
+        start = stop
+        chunk *= 2  # Long holds are scanned in growing vectorized chunks
+    
+    return -1
+
+def _position_state_machine_numpy(entry_signal: np.ndarray, high: np.ndarray, close: np.ndarray,
+                                  profit_target: float, shares: int):
+    """
+    Pure-NumPy position state machine
+    
+    Jumps from trade to trade instead of walking every bar: the next entry is
+    found with searchsorted over the signal indices and the exit with a
+    vectorized scan for the first high at or above the target.
+    """
+    n = len(high)
+    signal_codes = np.zeros(n, dtype=np.int8)
+    position_codes = np.zeros(n, dtype=np.int8)
+    pnl = np.full(n, np.nan)
+    
+    entry_candidates = np.flatnonzero(entry_signal)
+    start = 0
+    
+    while True:
+        k = np.searchsorted(entry_candidates, start)
+        if k == len(entry_candidates):
+            break
+        
+        entry_idx = entry_candidates[k]
+        entry_price = close[entry_idx]
+        exit_idx = _first_index_at_or_above(high, entry_price * profit_target, entry_idx + 1)
+        
+        signal_codes[entry_idx] = 1
+        if exit_idx < 0:
+            position_codes[entry_idx:] = 1
+            break
+        
+        position_codes[entry_idx:exit_idx] = 1
+        position_codes[exit_idx] = 2
+        signal_codes[exit_idx] = 2
+        pnl[exit_idx] = (high[exit_idx] - entry_price) * shares
+        start = exit_idx + 1
+    
+    return signal_codes, position_codes, pnl
+
+def run_position_state_machine(entry_signal: np.ndarray, high: np.ndarray, close: np.ndarray,
+                               profit_target: float = 1.01, shares: int = 100,
+                               use_jit: bool = True):
+    """
+    Run the sample position state machine
+    
+    Args:
+        entry_signal: Boolean entry signal per bar
+        high: High prices
+        close: Close prices (entry fills at the signal bar's close)
+        profit_target: Exit when high >= entry_price * profit_target
+        shares: Sample position size
+        use_jit: Use the Numba kernel when available
+        
+    Returns:
+        Tuple of (signal_codes, position_codes, pnl) arrays
+    """
+    entry_signal = np.ascontiguousarray(entry_signal, dtype=np.bool_)
+    high = np.ascontiguousarray(high, dtype=np.float64)
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    
+    if use_jit and _position_state_machine_jit is not None:
+        return _position_state_machine_jit(entry_signal, high, close, profit_target, shares)
+    return _position_state_machine_numpy(entry_signal, high, close, profit_target, shares)
 
 class SampleTradingEngine:
     """Sample trading engine - replace with your strategy"""
     
-    def __init__(self, initial_capital: float = 10000):
+    def __init__(self, initial_capital: float = 10000, use_jit: bool = True):
         self.initial_capital = initial_capital
+        self.use_jit = use_jit
         
     def generate_sample_signals(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Generate sample trading signals - replace with your logic
         
-        This is a simplified example for demonstration purposes
+        This is a simplified example for demonstration purposes: enter at the
+        close on sample_signal_95 and exit at a 1% profit target on the high.
         """
         result = df.copy()
+        n = len(result)
+        
+        # Sample entry condition (replace with your logic)
+        if 'sample_signal_95' in result.columns:
+            entry_signal = (result['sample_signal_95'] == 1).to_numpy()
+        else:
+            entry_signal = np.zeros(n, dtype=bool)
         
-        # Initialize trading columns
-        result['sample_signal'] = None
-        result['sample_position'] = None
-        result['sample_pnl'] = np.nan
-        result['sample_equity'] = self.initial_capital
+        signal_codes, position_codes, pnl = run_position_state_machine(
+            entry_signal,
+            result['high'].to_numpy(dtype=float),
+            result['close'].to_numpy(dtype=float),
+            profit_target=1.01,  # Sample: Exit at 1% profit
+            shares=100,  # Sample position size
+            use_jit=self.use_jit
+        )
         
-        # Sample signal generation logic
-        current_equity = self.initial_capital
-        position = None
+        # Running equity accumulated in bar order
+        realized = np.concatenate(([float(self.initial_capital)], np.nan_to_num(pnl)))
         
-        for i in range(len(result)):
-            current_row = result.iloc[i]
-            
-            # Sample entry condition (replace with your logic)
-            if position is None and 'sample_signal_95' in result.columns:
-                if current_row.get('sample_signal_95', 0) == 1:
-                    # Sample entry logic
-                    entry_price = current_row['close']
-                    position = {
-                        'entry_price': entry_price,
-                        'entry_date': current_row['datetime'],
-                        'shares': 100  # Sample position size
-                    }
-                    result.iloc[i, result.columns.get_loc('sample_signal')] = 'ENTRY'
-                    result.iloc[i, result.columns.get_loc('sample_position')] = 'OPEN'
-            
-            elif position is not None:
-                # Sample exit condition (replace with your logic)
-                current_price = current_row['high']
-                entry_price = position['entry_price']
-                
-                # Sample: Exit at 1% profit
-                if current_price >= entry_price * 1.01:
-                    # Calculate sample PnL
-                    pnl = (current_price - entry_price) * position['shares']
-                    current_equity += pnl
-                    
-                    result.iloc[i, result.columns.get_loc('sample_signal')] = 'EXIT'
-                    result.iloc[i, result.columns.get_loc('sample_position')] = 'CLOSED'
-                    result.iloc[i, result.columns.get_loc('sample_pnl')] = pnl
-                    
-                    position = None
-                else:
-                    result.iloc[i, result.columns.get_loc('sample_position')] = 'OPEN'
-            
-            result.iloc[i, result.columns.get_loc('sample_equity')] = current_equity
+        result['sample_signal'] = SIGNAL_LABELS[signal_codes]
+        result['sample_position'] = POSITION_LABELS[position_codes]
+        result['sample_pnl'] = pnl
+        result['sample_equity'] = np.add.accumulate(realized)[1:]
         
         return result
 
 class SampleOvernightAnalyzer:
     """Main sample analyzer class"""
     
-    def __init__(self, config: SampleAnalysisConfig = None):
+    def __init__(self, config: SampleAnalysisConfig = None, rng: Optional[np.random.Generator] = None):
         self.config = config or SampleAnalysisConfig()
         self.data_handler = SampleDataHandler()
-        self.analyzer = SampleStatisticalAnalyzer(self.config)
+        self.analyzer = SampleStatisticalAnalyzer(self.config, rng)
         self.trading_engine = SampleTradingEngine()
+    
+    def analyze_symbols(self, symbols: List[str], workers: int = 1) -> Dict[str, Dict[str, Any]]:
+        """
+        Analyze several symbols, optionally in a process pool
+        
+        Each symbol gets its own RNG stream spawned from config.random_seed,
+        so results do not depend on the number of workers or their scheduling.
+        
+        Args:
+            symbols: Stock symbols to analyze
+            workers: Number of worker processes (1 = analyze in this process)
+            
+        Returns:
+            Dictionary of symbol -> analysis results for successful symbols
+        """
+        seed_sequences = np.random.SeedSequence(self.config.random_seed).spawn(len(symbols))
+        results = {}
+        
+        if workers <= 1:
+            for symbol, seed_sequence in zip(symbols, seed_sequences):
+                self.analyzer.rng = np.random.default_rng(seed_sequence)
+                result = self.analyze_symbol(symbol)
+                if result:
+                    results[symbol] = result
+                if not self.data_handler.is_local:
+                    time.sleep(0.5)  # Small delay between remote requests
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(_analyze_symbol_task, self.config, symbol, seed_sequence)
+                    for symbol, seed_sequence in zip(symbols, seed_sequences)
+                ]
+                # Collect in submission order so the summary is stable
+                for future in futures:
+                    symbol, result = future.result()
+                    if result:
+                        results[symbol] = result
+        
+        if results:
+            self._save_comparative_summary(results)
+        
+        return results
         
     def analyze_symbol(self, symbol: str) -> Dict[str, Any]:
         """
@@ -371,6 +904,9 @@ class SampleOvernightAnalyzer:
             # Perform sample Monte Carlo validation
             mc_results = self.analyzer.sample_monte_carlo_validation(df)
             
+            # Bootstrap confidence intervals
+            bootstrap_results = self.analyzer.sample_bootstrap_analysis(df)
+            
             # Calculate sample performance metrics
             performance = self._calculate_sample_performance(df, symbol)
             
@@ -389,6 +925,7 @@ class SampleOvernightAnalyzer:
                     'recovery_rate': df['recovery_indicator'].mean()
                 },
                 'monte_carlo_validation': mc_results,
+                'bootstrap_confidence_intervals': bootstrap_results,
                 'sample_performance': performance
             }
             
@@ -406,24 +943,16 @@ class SampleOvernightAnalyzer:
     
     def _calculate_sample_performance(self, df: pd.DataFrame, symbol: str) -> Dict[str, Any]:
         """Calculate sample performance metrics"""
-        trades = df[df['sample_pnl'].notna()]
-        
-        if len(trades) == 0:
-            return {'total_trades': 0, 'total_pnl': 0}
-        
-        total_trades = len(trades)
-        total_pnl = trades['sample_pnl'].sum()
-        winning_trades = len(trades[trades['sample_pnl'] > 0])
-        win_rate = (winning_trades / total_trades) * 100 if total_trades > 0 else 0
-        
-        return {
-            'symbol': symbol,
-            'total_trades': total_trades,
-            'winning_trades': winning_trades,
-            'win_rate': win_rate,
-            'total_pnl': total_pnl,
-            'final_equity': df['sample_equity'].iloc[-1] if len(df) > 0 else 0
-        }
+        # Every recorded exit is a trade, including breakeven (0 PnL) ones
+        performance = performance_metrics(
+            df['sample_pnl'].to_numpy(dtype=float),
+            df['sample_equity'].to_numpy(dtype=float),
+            in_position=(df['sample_position'] == 'OPEN').to_numpy(),
+            initial_capital=self.trading_engine.initial_capital,
+            is_trade=df['sample_pnl'].notna().to_numpy()
+        )
+        performance['final_equity'] = performance['final_capital']
+        return {'symbol': symbol, **performance}
     
     def _print_sample_summary(self, results: Dict[str, Any]):
         """Print sample analysis summary"""
@@ -448,6 +977,17 @@ class SampleOvernightAnalyzer:
         print(f"  P-value: {mc['overall_assessment']['min_p_value']:.4f}")
         print(f"  Significant: {mc['overall_assessment']['significant']}")
         
+        # Bootstrap results
+        bootstrap = results.get('bootstrap_confidence_intervals')
+        if bootstrap:
+            rate_ci = bootstrap['recovery_rate_ci']
+            details = bootstrap['recovery_details']
+            print(f"\nSample Bootstrap Confidence Intervals ({bootstrap['method']}):")
+            print(f"  Recovery Rate: {rate_ci['statistic']:.3f} "
+                  f"[{rate_ci['ci_lower']:.3f}, {rate_ci['ci_upper']:.3f}]")
+            print(f"  Recovery Magnitude: {details['avg_recovery_magnitude']:.3f}% "
+                  f"[{details['recovery_magnitude_ci_lower']:.3f}, {details['recovery_magnitude_ci_upper']:.3f}]")
+        
         # Performance
         perf = results['sample_performance']
         print(f"\nSample Trading Performance:")
@@ -455,6 +995,18 @@ class SampleOvernightAnalyzer:
         print(f"  Win Rate: {perf['win_rate']:.1f}%")
         print(f"  Total PnL: ${perf['total_pnl']:.2f}")
         print(f"  Final Equity: ${perf['final_equity']:.2f}")
+        print(f"  Max Drawdown: ${perf['max_drawdown']:.2f} ({perf['max_drawdown_pct']:.2f}%)")
+        profit_factor = perf['profit_factor']
+        if np.isnan(profit_factor):
+            print(f"  Profit Factor: n/a (no trades)")
+        elif np.isinf(profit_factor):
+            print(f"  Profit Factor: inf (no losing trades)")
+        else:
+            print(f"  Profit Factor: {profit_factor:.2f}")
+        sharpe = f"{perf['sharpe_ratio']:.2f}" if np.isfinite(perf['sharpe_ratio']) else "n/a (flat equity)"
+        sortino = f"{perf['sortino_ratio']:.2f}" if np.isfinite(perf['sortino_ratio']) else "n/a (no losing bars)"
+        print(f"  Sharpe / Sortino: {sharpe} / {sortino}")
+        print(f"  Exposure: {perf['exposure']:.1f}%")
         
         print(f"\n{'='*60}")
         print("NOTE: This is sample data and analysis for demonstration purposes.")
@@ -472,13 +1024,47 @@ class SampleOvernightAnalyzer:
             json_results = self._prepare_for_json(results.copy())
             
             with open(filename, 'w') as f:
-                json.dump(json_results, f, indent=2, default=str)
+                json.dump(json_results, f, indent=2, default=str, allow_nan=False)
             
             logger.info(f"Sample results saved to {filename}")
             
         except Exception as e:
             logger.error(f"Error saving sample results: {e}")
     
+    def _save_comparative_summary(self, results: Dict[str, Dict[str, Any]]):
+        """Save one summary row per symbol to sample_results/comparative_summary.csv"""
+        rows = []
+        for symbol, result in results.items():
+            stats = result['sample_statistics']
+            mc = result['monte_carlo_validation'].get('overall_assessment', {})
+            perf = result['sample_performance']
+            rows.append({
+                'Symbol': symbol,
+                'Observations': result['data_period']['n_observations'],
+                'Recovery_Rate': stats['recovery_rate'],
+                'Volatility': stats['volatility'],
+                'Avg_Overnight_Gap': stats['avg_overnight_gap'],
+                'MC_P_Value': mc.get('min_p_value'),
+                'Statistically_Significant': mc.get('significant'),
+                'Total_Trades': perf.get('total_trades', 0),
+                'Win_Rate': perf.get('win_rate', 0),
+                'Total_PnL': perf.get('total_pnl', 0),
+                'Final_Equity': perf.get('final_equity'),
+                'Max_Drawdown_Pct': perf.get('max_drawdown_pct'),
+                'Profit_Factor': perf.get('profit_factor'),
+                'Sharpe_Ratio': perf.get('sharpe_ratio'),
+                'Sortino_Ratio': perf.get('sortino_ratio'),
+                'Exposure': perf.get('exposure')
+            })
+        
+        try:
+            os.makedirs('sample_results', exist_ok=True)
+            filename = 'sample_results/comparative_summary.csv'
+            pd.DataFrame(rows).to_csv(filename, index=False)
+            logger.info(f"Comparative summary saved to {filename}")
+        except Exception as e:
+            logger.error(f"Error saving comparative summary: {e}")
+    
     def _prepare_for_json(self, obj):
         """Prepare object for JSON serialization"""
         if isinstance(obj, dict):
@@ -488,14 +1074,21 @@ class SampleOvernightAnalyzer:
         elif isinstance(obj, (pd.Timestamp, datetime)):
             return obj.isoformat()
         elif isinstance(obj, np.ndarray):
-            return obj.tolist()
-        elif isinstance(obj, (np.integer, np.floating)):
-            return float(obj)
+            return self._prepare_for_json(obj.tolist())
+        elif isinstance(obj, (float, np.integer, np.floating)):
+            # NaN/inf (e.g. profit factor with no losing trades) are not valid JSON
+            return float(obj) if np.isfinite(obj) else None
         elif pd.isna(obj):
             return None
         else:
             return obj
 
+def _analyze_symbol_task(config: SampleAnalysisConfig, symbol: str,
+                         seed_sequence: np.random.SeedSequence) -> Tuple[str, Dict[str, Any]]:
+    """Process-pool entry point: analyze one symbol with its own RNG stream"""
+    analyzer = SampleOvernightAnalyzer(config, rng=np.random.default_rng(seed_sequence))
+    return symbol, analyzer.analyze_symbol(symbol)
+
 def main():
     """Main function for sample analysis"""
     parser = argparse.ArgumentParser(
@@ -506,13 +1099,21 @@ def main():
                        help='Number of bootstrap samples')
     parser.add_argument('--monte-carlo-samples', type=int, default=500, 
                        help='Number of Monte Carlo samples')
+    parser.add_argument('--bootstrap-method', choices=BOOTSTRAP_METHODS, default='percentile',
+                       help='Bootstrap confidence interval method')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Number of worker processes for multi-symbol analysis')
+    parser.add_argument('--seed', type=int, default=None,
+                       help='Root random seed for reproducible per-symbol results')
     
     args = parser.parse_args()
     
     # Create sample configuration
     config = SampleAnalysisConfig(
         n_bootstrap=args.bootstrap_samples,
-        n_monte_carlo=args.monte_carlo_samples
+        n_monte_carlo=args.monte_carlo_samples,
+        bootstrap_method=args.bootstrap_method,
+        random_seed=args.seed
     )
     
     # Initialize sample analyzer
@@ -526,12 +1127,7 @@ def main():
         print("Replace data sources and methodology with your actual implementation.")
         print("=" * 50)
         
-        results = {}
-        for symbol in args.symbols:
-            result = analyzer.analyze_symbol(symbol)
-            if result:
-                results[symbol] = result
-            time.sleep(0.5)  # Small delay between symbols
+        results = analyzer.analyze_symbols(args.symbols, workers=args.workers)
         
         if results:
             print(f"\nSample analysis completed for {len(results)} symbols")
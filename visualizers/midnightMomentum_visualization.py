@@ -8,16 +8,130 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
-from matplotlib.patches import Rectangle
+from matplotlib.collections import LineCollection, PolyCollection
 from datetime import datetime
 import argparse
+import glob
+import hashlib
+import json
 import os
-from matplotlib.patches import Rectangle
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from performance_metrics import drawdown, infer_periods_per_year, performance_metrics
+
+DOWNSAMPLE_METHODS = ('minmax', 'lttb')
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets: indices of n_out points that keep the visual shape of (x, y).
+    
+    The first and last points are always kept; every bucket in between
+    contributes the point forming the largest triangle with the previously
+    selected point and the average of the next bucket.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    picked = np.empty(n_out, dtype=np.int64)
+    picked[0], picked[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_lo = edges[i + 1]
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_lo:next_hi].mean()
+        avg_y = y[next_lo:next_hi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        picked[i + 1] = a
+    return picked
+
+
+def minmax_indices(y, n_out):
+    """Indices of the minimum and maximum of each of n_out / 2 equal buckets, plus both ends"""
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    n_buckets = max(1, n_out // 2)
+    size = -(-n // n_buckets)
+    padded = np.full(size * n_buckets, np.nan)
+    padded[:n] = y
+    buckets = padded.reshape(n_buckets, size)
+    filled = ~np.isnan(buckets).all(axis=1)
+    rows = np.flatnonzero(filled)
+    offsets = rows * size
+    lows = offsets + np.nanargmin(buckets[filled], axis=1)
+    highs = offsets + np.nanargmax(buckets[filled], axis=1)
+    return np.unique(np.concatenate([[0, n - 1], lows, highs]))
+
+
+def downsample_indices(x, y, n_out, method='minmax', keep=None):
+    """
+    Row positions to plot for a series reduced to about n_out points.
+    
+    NaN rows are dropped (as the unsampled plots do). The global minimum and
+    maximum and every row flagged in keep are always included, so extremes
+    such as drawdown troughs survive either method.
+    
+    Args:
+        x (np.ndarray): Float x values (e.g. epoch nanoseconds)
+        y (np.ndarray): Series values
+        n_out (int): Target number of points
+        method (str): 'minmax' (bucket envelope) or 'lttb'
+        keep (np.ndarray): Boolean mask of rows that must be kept
+    """
+    valid = np.flatnonzero(~np.isnan(y))
+    if len(valid) > n_out:
+        values = y[valid]
+        if method == 'lttb':
+            picked = lttb_indices(x[valid], values, n_out)
+            picked = np.union1d(picked, [np.argmin(values), np.argmax(values)])
+        else:
+            picked = minmax_indices(values, n_out)
+        positions = valid[picked]
+    else:
+        positions = valid
+    if keep is not None:
+        positions = np.union1d(positions, np.intersect1d(np.flatnonzero(keep), valid))
+    return positions
+
+
+def aggregate_ohlc(df, n_out):
+    """Merge consecutive bars into n_out candles (first open, max high, min low, last close)"""
+    n = len(df)
+    if n <= n_out:
+        return df
+    bucket = np.arange(n) * n_out // n
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:] - 1, n - 1]
+    return pd.DataFrame({
+        'datetime': df['datetime'].to_numpy()[starts],
+        'open': df['open'].to_numpy(dtype=float)[starts],
+        'high': np.fmax.reduceat(df['high'].to_numpy(dtype=float), starts),
+        'low': np.fmin.reduceat(df['low'].to_numpy(dtype=float), starts),
+        'close': df['close'].to_numpy(dtype=float)[ends],
+    })
+
 
 class MidnightMomentumVisualizer:
-    def __init__(self, csv_file_path):
-        """Initialize the visualizer with backtest results"""
+    def __init__(self, csv_file_path, downsample=None):
+        """
+        Initialize the visualizer with backtest results
+        
+        Args:
+            csv_file_path: Backtest results CSV
+            downsample: None to plot every row, or 'minmax' / 'lttb' to reduce the
+                price, gap and equity series to about 2x the panel's pixel width
+        """
+        if downsample not in (None,) + DOWNSAMPLE_METHODS:
+            raise ValueError(f"downsample must be None or one of {DOWNSAMPLE_METHODS}")
         self.csv_file_path = csv_file_path
+        self.downsample = downsample
+        self.render_dpi = None
         self.df = None
         self.load_data()
         
@@ -81,113 +195,106 @@ class MidnightMomentumVisualizer:
 
     def calculate_performance_metrics(self):
         """Calculate key performance metrics"""
-        # Filter for completed trades
-        trades = self.df[self.df['pnl'].notna() & (self.df['pnl'] != 0)]
-        
-        if len(trades) == 0:
+        pnl = self.df['pnl'].to_numpy(dtype=float)
+        if not (np.isfinite(pnl) & (pnl != 0)).any():
             return {}
         
-        # Basic metrics
-        total_trades = len(trades)
-        winning_trades = len(trades[trades['pnl'] > 0])
-        losing_trades = len(trades[trades['pnl'] < 0])
-        win_rate = (winning_trades / total_trades) * 100 if total_trades > 0 else 0
-        
-        # PnL metrics
-        total_pnl = trades['pnl'].sum()
-        avg_pnl = trades['pnl'].mean()
-        max_win = trades['pnl'].max()
-        max_loss = trades['pnl'].min()
-        
-        # Account metrics
-        initial_capital = 25000.0
-        final_capital = initial_capital + total_pnl
-        roi = (total_pnl / initial_capital) * 100
-        
-        # Drawdown calculation
-        equity_curve = self.df['current_equity'].dropna()
-        if len(equity_curve) > 0:
-            running_max = equity_curve.expanding().max()
-            drawdown = equity_curve - running_max
-            max_drawdown = drawdown.min()
-            max_drawdown_pct = (max_drawdown / initial_capital) * 100
-        else:
-            max_drawdown = 0
-            max_drawdown_pct = 0
-        
-        # Profit factor
-        gross_profit = trades[trades['pnl'] > 0]['pnl'].sum()
-        gross_loss = abs(trades[trades['pnl'] < 0]['pnl'].sum())
-        profit_factor = gross_profit / gross_loss if gross_loss != 0 else float('inf')
-        
-        return {
-            'total_trades': total_trades,
-            'winning_trades': winning_trades,
-            'losing_trades': losing_trades,
-            'win_rate': win_rate,
-            'total_pnl': total_pnl,
-            'avg_pnl': avg_pnl,
-            'max_win': max_win,
-            'max_loss': max_loss,
-            'initial_capital': initial_capital,
-            'final_capital': final_capital,
-            'roi': roi,
-            'max_drawdown': max_drawdown,
-            'max_drawdown_pct': max_drawdown_pct,
-            'profit_factor': profit_factor,
-            'gross_profit': gross_profit,
-            'gross_loss': gross_loss
-        }
-    
-    def create_candlestick_chart(self, ax):
+        in_position = None
+        if 'position_status' in self.df.columns:
+            in_position = (self.df['position_status'] == 'OPEN').to_numpy()
+        
+        # Starting capital comes from the equity column itself
+        return performance_metrics(
+            pnl, self.df['current_equity'].to_numpy(dtype=float),
+            in_position=in_position,
+            initial_capital=self.initial_capital(),
+            periods_per_year=infer_periods_per_year(self.df['datetime'])
+        )
+    
+    def initial_capital(self):
+        """Account value before the first bar: first equity value less that bar's PnL"""
+        equity = self.df['current_equity'].dropna()
+        if equity.empty:
+            return np.nan
+        first_pnl = self.df.at[equity.index[0], 'pnl']
+        return float(equity.iloc[0] - (0.0 if pd.isna(first_pnl) else first_pnl))
+    
+    def target_points(self, ax):
+        """About 2x the axes width in pixels at the output DPI"""
+        fig = ax.figure
+        dpi = self.render_dpi or fig.dpi
+        return max(16, int(2 * ax.get_position().width * fig.get_figwidth() * dpi))
+    
+    def sample_rows(self, ax, series, keep=None):
+        """
+        Row positions of series to plot on ax: every non-NaN row, or a
+        downsampled subset when downsampling is enabled.
+        """
+        y = series.to_numpy(dtype=float)
+        if not self.downsample:
+            return np.flatnonzero(~np.isnan(y))
+        x = self.df['datetime'].to_numpy().astype(np.int64).astype(float)
+        return downsample_indices(x, y, self.target_points(ax), self.downsample, keep)
+    
+    def create_candlestick_chart(self, ax, df=None):
         """Create candlestick chart with OHLC data"""
+        df = self.df if df is None else df
         # Calculate candle width based on time interval
-        if len(self.df) > 1:
-            time_diff = (self.df['datetime'].iloc[1] - self.df['datetime'].iloc[0]).total_seconds() / 86400  # in days
+        if len(df) > 1:
+            time_diff = (df['datetime'].iloc[1] - df['datetime'].iloc[0]).total_seconds() / 86400  # in days
         else:
             time_diff = 1.0  # Default to 1 day
         candle_width = time_diff * 0.8  # 80% of the time interval
         
-        # Create candlesticks
-        for i, row in self.df.iterrows():
-            date = mdates.date2num(row['datetime'])
-            open_price = row['open']
-            high_price = row['high']
-            low_price = row['low']
-            close_price = row['close']
-            
-            # Determine candle color
-            if close_price >= open_price:
-                # Green/bullish candle
-                color = 'green'
-                body_bottom = open_price
-                body_top = close_price
-            else:
-                # Red/bearish candle
-                color = 'red'
-                body_bottom = close_price
-                body_top = open_price
-            
-            # Draw the wick (high-low line)
-            ax.plot([date, date], [low_price, high_price], color='black', linewidth=0.8, alpha=0.8)
-            
-            # Draw the body (rectangle)
-            body_height = abs(close_price - open_price)
-            if body_height > 0:
-                rect = Rectangle((date - candle_width/2, body_bottom), candle_width, body_height,
-                               facecolor=color, edgecolor='black', alpha=0.8, linewidth=0.5)
-                ax.add_patch(rect)
-            else:
-                # Doji candle (open == close)
-                ax.plot([date - candle_width/2, date + candle_width/2], [close_price, close_price], 
-                       color='black', linewidth=1)
-        
+        ohlc = df[['open', 'high', 'low', 'close']].to_numpy(dtype=float)
+        valid = ~np.isnan(ohlc).any(axis=1)
+        dates = mdates.date2num(df.loc[valid, 'datetime'])
+        open_price, high_price, low_price, close_price = ohlc[valid].T
+        if len(dates) == 0:
+            return ax
+        
+        # Wicks (high-low lines), one LineCollection for all candles
+        wicks = np.empty((len(dates), 2, 2))
+        wicks[:, :, 0] = dates[:, None]
+        wicks[:, 0, 1] = low_price
+        wicks[:, 1, 1] = high_price
+        ax.add_collection(LineCollection(wicks, colors='black', linewidths=0.8, alpha=0.8), autolim=False)
+        
+        # Bodies, one PolyCollection: green/bullish if close >= open, else red/bearish
+        body_bottom = np.minimum(open_price, close_price)
+        body_top = np.maximum(open_price, close_price)
+        left = dates - candle_width / 2
+        right = dates + candle_width / 2
+        has_body = body_top > body_bottom
+        bodies = np.stack([
+            np.column_stack([left, body_bottom]),
+            np.column_stack([left, body_top]),
+            np.column_stack([right, body_top]),
+            np.column_stack([right, body_bottom]),
+        ], axis=1)[has_body]
+        colors = np.where(close_price >= open_price, 'green', 'red')[has_body]
+        ax.add_collection(PolyCollection(bodies, facecolors=colors, edgecolors='black', alpha=0.8, linewidths=0.5),
+                          autolim=False)
+        
+        # Doji candles (open == close) as a horizontal tick
+        doji = ~has_body
+        if doji.any():
+            ticks = np.stack([np.column_stack([left[doji], close_price[doji]]),
+                              np.column_stack([right[doji], close_price[doji]])], axis=1)
+            ax.add_collection(LineCollection(ticks, colors='black', linewidths=1), autolim=False)
+        
+        # Data limits from the candle extremes instead of scanning every path
+        ax.update_datalim([(left.min(), low_price.min()), (right.max(), high_price.max())])
+        ax.autoscale_view()
         return ax
     
     def create_price_chart(self, ax):
         """Create the main price chart with candlesticks and thresholds"""
-        # Create candlestick chart
-        self.create_candlestick_chart(ax)
+        # Create candlestick chart; when downsampling, merge bars so each candle is a few pixels wide
+        candles = self.df
+        if self.downsample:
+            candles = aggregate_ohlc(self.df, max(1, self.target_points(ax) // 6))
+        self.create_candlestick_chart(ax, candles)
         
         # Plot threshold lines (downside risk levels)
         threshold_colors = ['blue', 'green', 'orange', 'red']
@@ -196,10 +303,10 @@ class MidnightMomentumVisualizer:
         for i, level in enumerate(threshold_levels):
             threshold_col = f'threshold_{level}'
             if threshold_col in self.df.columns:
-                valid_threshold = self.df[threshold_col].notna()
-                if valid_threshold.any():
-                    ax.plot(self.df.loc[valid_threshold, 'datetime'], 
-                           self.df.loc[valid_threshold, threshold_col], 
+                rows = self.sample_rows(ax, self.df[threshold_col])
+                if len(rows) > 0:
+                    ax.plot(self.df['datetime'].iloc[rows], 
+                           self.df[threshold_col].iloc[rows], 
                            label=f'{level}% Risk Level', 
                            color=threshold_colors[i], 
                            linewidth=1.5, 
@@ -210,10 +317,10 @@ class MidnightMomentumVisualizer:
         for i, level in enumerate(threshold_levels):
             upside_threshold_col = f'upside_threshold_{level}'
             if upside_threshold_col in self.df.columns:
-                valid_upside_threshold = self.df[upside_threshold_col].notna()
-                if valid_upside_threshold.any():
-                    ax.plot(self.df.loc[valid_upside_threshold, 'datetime'], 
-                           self.df.loc[valid_upside_threshold, upside_threshold_col], 
+                rows = self.sample_rows(ax, self.df[upside_threshold_col])
+                if len(rows) > 0:
+                    ax.plot(self.df['datetime'].iloc[rows], 
+                           self.df[upside_threshold_col].iloc[rows], 
                            label=f'{level}% Profit Target', 
                            color=threshold_colors[i], 
                            linewidth=2, 
@@ -273,11 +380,12 @@ class MidnightMomentumVisualizer:
             ax.axis('off')
             return
         
-        valid_gap = self.df['overnight_gap'].notna()
+        rows = self.sample_rows(ax, self.df['overnight_gap'])
+        sampled = self.df.iloc[rows]
+        datetime_data = sampled['datetime']
         
-        if valid_gap.any():
-            gap_data = self.df.loc[valid_gap, 'overnight_gap'] * 100  # Convert to percentage
-            datetime_data = self.df.loc[valid_gap, 'datetime']
+        if len(rows) > 0:
+            gap_data = sampled['overnight_gap'] * 100  # Convert to percentage
             
             # Plot overnight gap line
             ax.plot(datetime_data, gap_data, color='purple', linewidth=1, alpha=0.8, label='Overnight Gap')
@@ -291,16 +399,17 @@ class MidnightMomentumVisualizer:
             # Add zero line
             ax.axhline(y=0, color='black', linestyle='--', alpha=0.5)
             
-            # Highlight recovery patterns
+            # Highlight recovery patterns; per-day markers come from every row, like the breach markers
             if 'high_above_prev_close' in self.df.columns:
-                recovery_points = self.df[self.df['high_above_prev_close'] == 1]
+                days = self.df[self.df['overnight_gap'].notna()]
+                recovery_points = days[days['high_above_prev_close'] == 1]
                 if not recovery_points.empty:
                     recovery_gaps = recovery_points['overnight_gap'] * 100
                     ax.scatter(recovery_points['datetime'], recovery_gaps, 
                               color='lime', marker='o', s=40, alpha=0.7, zorder=5, 
                               label='Recovery Day')
                 
-                non_recovery_points = self.df[self.df['high_above_prev_close'] == 0]
+                non_recovery_points = days[days['high_above_prev_close'] == 0]
                 if not non_recovery_points.empty:
                     non_recovery_gaps = non_recovery_points['overnight_gap'] * 100
                     ax.scatter(non_recovery_points['datetime'], non_recovery_gaps, 
@@ -354,23 +463,32 @@ class MidnightMomentumVisualizer:
     def create_equity_curve(self, ax):
         """Create equity curve chart"""
         equity_data = self.df['current_equity'].dropna()
+        datetime_data = self.df.loc[equity_data.index, 'datetime']
         
         if len(equity_data) > 0:
-            datetime_data = self.df.loc[equity_data.index, 'datetime']
+            # Drawdown from the full series; the deepest trough is always plotted
+            running_max, equity_drawdown, _ = drawdown(equity_data.to_numpy())
+            running_max = pd.Series(running_max, index=equity_data.index)
+            equity_drawdown = pd.Series(equity_drawdown, index=equity_data.index)
+            trough = self.df['current_equity'].index.isin([equity_drawdown.idxmin()])
+            rows = self.sample_rows(ax, self.df['current_equity'], keep=trough)
+            index = self.df.index[rows]
+            equity_data = equity_data.loc[index]
+            running_max = running_max.loc[index]
+            equity_drawdown = equity_drawdown.loc[index]
+            datetime_data = self.df.loc[index, 'datetime']
             
             # Plot equity curve
             ax.plot(datetime_data, equity_data, color='darkblue', linewidth=2, label='Portfolio Value')
             
             # Add starting capital line
-            ax.axhline(y=25000, color='gray', linestyle='--', alpha=0.7, label='Starting Capital')
+            ax.axhline(y=self.initial_capital(), color='gray', linestyle='--', alpha=0.7, label='Starting Capital')
             
             # Highlight drawdown periods
-            running_max = equity_data.expanding().max()
-            drawdown = equity_data - running_max
             
             # Fill drawdown areas
             ax.fill_between(datetime_data, equity_data, running_max, 
-                           where=(drawdown < 0), color='red', alpha=0.2, label='Drawdown')
+                           where=(equity_drawdown < 0), color='red', alpha=0.2, label='Drawdown')
             
             # Mark trade points
             trade_points = self.df[self.df['pnl'].notna() & (self.df['pnl'] != 0)]
@@ -426,9 +544,10 @@ Initial Capital: ${metrics['initial_capital']:,.0f}
 Final Capital: ${metrics['final_capital']:,.0f}
 ROI: {metrics['roi']:.2f}%
 
-Max Drawdown: ${metrics['max_drawdown']:.2f}
-Max Drawdown %: {metrics['max_drawdown_pct']:.2f}%
+Max Drawdown: ${metrics['max_drawdown']:.2f} ({metrics['max_drawdown_pct']:.2f}%)
 Profit Factor: {metrics['profit_factor']:.2f}
+Sharpe / Sortino: {metrics['sharpe_ratio']:.2f} / {metrics['sortino_ratio']:.2f}
+Exposure: {metrics['exposure']:.1f}%
 
 Gross Profit: ${metrics['gross_profit']:.2f}
 Gross Loss: ${metrics['gross_loss']:.2f}
@@ -536,8 +655,9 @@ Gross Loss: ${metrics['gross_loss']:.2f}
         ax.legend(fontsize=9)
         ax.grid(True, alpha=0.3, axis='y')
     
-    def create_comprehensive_visualization(self, save_path=None):
+    def create_comprehensive_visualization(self, save_path=None, dpi=300):
         """Create comprehensive visualization with all charts"""
+        self.render_dpi = dpi if save_path else None
         # Set up the figure with subplots
         fig = plt.figure(figsize=(20, 18))
         
@@ -582,15 +702,16 @@ Gross Loss: ${metrics['gross_loss']:.2f}
         
         # Save or show
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
+            fig.savefig(save_path, dpi=dpi, bbox_inches='tight')
             print(f"Visualization saved to: {save_path}")
         else:
             plt.show()
         
         return fig
     
-    def create_simple_chart(self, save_path=None):
+    def create_simple_chart(self, save_path=None, dpi=300):
         """Create a simpler chart focusing on price and signals"""
+        self.render_dpi = dpi if save_path else None
         fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(15, 12), height_ratios=[3, 1, 1])
         
         # Price chart
@@ -609,13 +730,114 @@ Gross Loss: ${metrics['gross_loss']:.2f}
         plt.tight_layout()
         
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
+            fig.savefig(save_path, dpi=dpi, bbox_inches='tight')
             print(f"Simple chart saved to: {save_path}")
         else:
             plt.show()
         
         return fig
 
+CHART_KINDS = ('simple', 'comprehensive')
+CHART_MANIFEST = '.chart_hashes.json'
+
+
+def resolve_csv_paths(source):
+    """CSV files for a file path, directory or glob pattern"""
+    if os.path.isdir(source):
+        return sorted(glob.glob(os.path.join(source, '*.csv')))
+    if os.path.isfile(source):
+        return [source]
+    return sorted(glob.glob(source))
+
+
+def chart_paths(csv_path, output_dir):
+    """Output PNG per chart kind, e.g. charts/AAPL_overnight_hold_simple.png"""
+    symbol = os.path.basename(csv_path).split('_')[0]
+    return {kind: os.path.join(output_dir, f'{symbol}_overnight_hold_{kind}.png') for kind in CHART_KINDS}
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def render_charts(csv_path, output_dir, dpi=300, downsample=None):
+    """Render the simple and comprehensive charts for one CSV (runs in a worker process)"""
+    plt.switch_backend('Agg')
+    visualizer = MidnightMomentumVisualizer(csv_path, downsample=downsample)
+    paths = chart_paths(csv_path, output_dir)
+    plt.close(visualizer.create_simple_chart(save_path=paths['simple'], dpi=dpi))
+    plt.close(visualizer.create_comprehensive_visualization(save_path=paths['comprehensive'], dpi=dpi))
+    return list(paths.values())
+
+
+def render_batch(csv_paths, output_dir='charts', dpi=300, workers=None, force=False, downsample=None):
+    """
+    Render charts for many CSVs in a process pool, skipping unchanged inputs.
+    
+    A CSV is skipped when both of its charts exist and were rendered from a
+    file with the same SHA-256 and with the same DPI and downsampling, as recorded in
+    output_dir/.chart_hashes.json.
+    
+    Returns:
+        dict: Lists of 'rendered', 'skipped' and 'failed' CSV paths
+    
+    Raises:
+        ValueError: If two CSVs map to the same chart files (same symbol prefix)
+    """
+    # Two workers writing the same PNGs would overwrite each other and their manifest entries
+    owners = {}
+    for csv_path in csv_paths:
+        for path in chart_paths(csv_path, output_dir).values():
+            owners.setdefault(path, []).append(csv_path)
+    collisions = {path: sources for path, sources in owners.items() if len(sources) > 1}
+    if collisions:
+        path, sources = next(iter(collisions.items()))
+        raise ValueError(f"{len(sources)} CSV files would write {path}: {', '.join(sources)}. "
+                         f"Render them into separate output directories.")
+    
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, CHART_MANIFEST)
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    
+    result = {'rendered': [], 'skipped': [], 'failed': []}
+    pending = {}
+    for csv_path in csv_paths:
+        entry = {'sha256': file_sha256(csv_path), 'dpi': dpi, 'downsample': downsample}
+        outputs = chart_paths(csv_path, output_dir).values()
+        if not force and all(manifest.get(os.path.basename(path)) == entry and os.path.exists(path) for path in outputs):
+            result['skipped'].append(csv_path)
+        else:
+            pending[csv_path] = entry
+    
+    if pending:
+        # Workers render with the headless Agg backend; no display is needed
+        plt.switch_backend('Agg')
+        with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(pending))) as executor:
+            futures = {executor.submit(render_charts, csv_path, output_dir, dpi, downsample): csv_path for csv_path in pending}
+            for future in as_completed(futures):
+                csv_path = futures[future]
+                try:
+                    for path in future.result():
+                        manifest[os.path.basename(path)] = pending[csv_path]
+                    result['rendered'].append(csv_path)
+                except Exception as e:
+                    print(f"❌ Error creating charts for {csv_path}: {str(e)}")
+                    result['failed'].append(csv_path)
+        
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+    
+    return result
+
+
 def main():
     """Main function"""
     parser = argparse.ArgumentParser(
@@ -631,13 +853,17 @@ Examples:
   
   # Save to file
   python3 overnightHold_visualization.py historical_data/AAPL_overnight_hold_backtest_with_thresholds_20250805_133631.csv --save charts/aapl_overnight_analysis.png
+  
+  # Batch: simple and comprehensive charts for every CSV in a directory (or glob) into charts/
+  python3 visualizers/midnightMomentum_visualization.py historical_data --workers 4
+  python3 visualizers/midnightMomentum_visualization.py "historical_data/*_thresholds.csv" --force
         """
     )
     
     parser.add_argument(
         'csv_file',
         type=str,
-        help='Path to the backtest results CSV file'
+        help='Path to the backtest results CSV file, or a directory / glob of CSV files for batch mode'
     )
     
     parser.add_argument(
@@ -659,9 +885,51 @@ Examples:
         help='DPI for saved images (default: 300)'
     )
     
+    parser.add_argument(
+        '--downsample',
+        choices=DOWNSAMPLE_METHODS,
+        default=None,
+        help='Reduce price, gap and equity series to ~2x the panel pixel width (minmax envelope or LTTB)'
+    )
+    
+    parser.add_argument(
+        '--output-dir',
+        type=str,
+        default='charts',
+        help='Batch mode: directory for the rendered charts (default: charts)'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Batch mode: worker processes (default: CPU count)'
+    )
+    
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Batch mode: re-render charts even if their CSV is unchanged'
+    )
+    
     # Parse arguments
     args = parser.parse_args()
     
+    # Batch mode for a directory, a glob or several files
+    if not os.path.isfile(args.csv_file):
+        csv_paths = resolve_csv_paths(args.csv_file)
+        if csv_paths:
+            print(f"Rendering charts for {len(csv_paths)} files into {args.output_dir}/")
+            try:
+                result = render_batch(csv_paths, output_dir=args.output_dir, dpi=args.dpi,
+                                      workers=args.workers, force=args.force, downsample=args.downsample)
+            except ValueError as e:
+                print(f"❌ Error: {e}")
+                return
+            print(f"✅ Rendered {len(result['rendered'])}, skipped {len(result['skipped'])} unchanged, "
+                  f"failed {len(result['failed'])}")
+            return
+    
     # Check if file exists
     if not os.path.exists(args.csv_file):
         print(f"Error: File '{args.csv_file}' not found.")
@@ -674,7 +942,7 @@ Examples:
     
     try:
         # Create visualizer
-        visualizer = OvernightHoldVisualizer(args.csv_file)
+        visualizer = MidnightMomentumVisualizer(args.csv_file, downsample=args.downsample)
         
         # Create output directory if saving
         if args.save:
@@ -685,10 +953,10 @@ Examples:
         # Create visualization
         if args.simple:
             print("Creating simple visualization...")
-            fig = visualizer.create_simple_chart(save_path=args.save)
+            fig = visualizer.create_simple_chart(save_path=args.save, dpi=args.dpi)
         else:
             print("Creating comprehensive visualization...")
-            fig = visualizer.create_comprehensive_visualization(save_path=args.save)
+            fig = visualizer.create_comprehensive_visualization(save_path=args.save, dpi=args.dpi)
         
         if not args.save:
             print("Displaying interactive chart...")